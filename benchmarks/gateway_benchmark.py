@@ -0,0 +1,105 @@
+"""
+Compares the gateway profiles of the bot on a large synthetic guild: the
+members received at startup (the guild create event and, when the guild
+is chunked, the member chunks) and a stream of messages are fed to the
+discord.py state as the gateway would send them, reporting the time spent
+and the resident memory of each profile.
+Every profile runs in its own process so their memory does not mix.
+Usage: python benchmarks/gateway_benchmark.py [number_of_members] [number_of_messages]
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from gateway_profile import PROFILES, gateway_options
+
+GUILD_ID = 1
+CHANNEL_ID = 2
+# Discord sends up to 1000 members per chunk
+CHUNK_SIZE = 1000
+
+def member(user_id: int) -> dict:
+    return {
+        "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0",
+                 "global_name": f"User {user_id}", "avatar": None},
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+def guild_create(number_of_members: int) -> dict:
+    """Large guilds only come with the members in voice channels, none here"""
+    return {
+        "id": str(GUILD_ID), "name": "Community", "owner_id": "100", "large": True,
+        "member_count": number_of_members, "members": [], "presences": [], "voice_states": [],
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+        "channels": [{"id": str(CHANNEL_ID), "type": 0, "name": "general", "position": 0,
+                      "permission_overwrites": []}],
+        "emojis": [], "stickers": [], "features": [], "threads": [], "stage_instances": [],
+        "guild_scheduled_events": [],
+    }
+
+def message_create(message_id: int, author_id: int) -> dict:
+    return {
+        "id": str(message_id), "channel_id": str(CHANNEL_ID), "guild_id": str(GUILD_ID),
+        "author": member(author_id)["user"], "member": member(author_id),
+        "content": "gg wp", "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None,
+        "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+        "attachments": [], "embeds": [], "pinned": False, "type": 0,
+    }
+
+def run_profile(profile: str, number_of_members: int, number_of_messages: int):
+    import discord
+    from discord.state import ChunkRequest
+
+    client = discord.Client(**gateway_options(profile))
+    state = client._connection
+    loop = asyncio.new_event_loop()
+    start = time.perf_counter()
+    guild = state._add_guild_from_data(guild_create(number_of_members))
+    if state._guild_needs_chunking(guild):
+        # The request the bot sends at startup, answered by the chunks
+        request = ChunkRequest(GUILD_ID, loop, state._get_guild, cache=state.member_cache_flags.joined)
+        state._chunk_requests[request.nonce] = request
+        for first in range(0, number_of_members, CHUNK_SIZE):
+            state.parse_guild_members_chunk({
+                "guild_id": str(GUILD_ID),
+                "nonce": request.nonce,
+                "members": [member(1000 + i) for i in range(first, min(first + CHUNK_SIZE, number_of_members))],
+                "chunk_index": first // CHUNK_SIZE,
+                "chunk_count": (number_of_members + CHUNK_SIZE - 1) // CHUNK_SIZE,
+            })
+    startup = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(number_of_messages):
+        state.parse_message_create(message_create(10 ** 6 + i, 1000 + i % max(number_of_members, 1)))
+    messages = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    chunks = (number_of_members + CHUNK_SIZE - 1) // CHUNK_SIZE if state._chunk_guilds else 0
+    print(f"{profile:>8} {chunks:>7} {len(guild.members):>14} {len(state._messages or []):>15} "
+          f"{startup:>10.2f} {messages:>12.2f} {rss:>9.0f}")
+    loop.run_until_complete(client.close())
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--profile":
+        run_profile(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+    number_of_members = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    number_of_messages = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    print(f"{number_of_members} members, {number_of_messages} messages")
+    print(f"{'profile':>8} {'chunks':>7} {'cached members':>14} {'cached messages':>15} "
+          f"{'startup s':>10} {'messages s':>12} {'RSS MiB':>9}")
+    for profile in PROFILES:
+        subprocess.run([sys.executable, __file__, "--profile", profile, str(number_of_members), str(number_of_messages)],
+                       check=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compares building rows of the game table as plain dataclasses, slotted
+dataclasses, tuple-backed views and through a cursor row factory: rows
+per second and memory per row.
+Then compares the two ways of reading the games of the tournament summary:
+loading every game with its two teams and its maps as models, like the
+summary did before, and the single grouped query read into GameResult
+views that it uses now.
+Usage: python benchmarks/models_benchmark.py [number_of_rows] [number_of_games]
+"""
+import dataclasses
+import os
+from collections import namedtuple
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models.base import column_names, columns
+from models.game import Game
+from models.game_map import GameMap
+from models.team import Team
+from services.database import DatabaseManager
+from services.entity_cache import EntityCache
+from services.game_map_service import GameMapService
+from services.game_service import GameService
+from services.team_service import TeamService
+
+# The model as it was before being slotted
+PlainGame = dataclasses.make_dataclass(
+    "PlainGame", [(field.name, field.type, field) for field in dataclasses.fields(Game)])
+
+# Tuple-backed view of the same columns, like GameResult
+GameView = namedtuple("GameView", column_names(Game))
+
+GAME_TYPES = ("swiss_1", "swiss_2_high", "swiss_2_low", "swiss_3_high", "swiss_3_mid", "swiss_3_low",
+              "swiss_4_high", "swiss_4_low", "swiss_5")
+
+def create_database(number_of_rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE game ({', '.join(column_names(Game))})")
+    conn.executemany(
+        f"INSERT INTO game VALUES ({', '.join('?' for _ in column_names(Game))})",
+        [(i, 1, 2, 3, -1, "swiss_1", 4, 5, 6, 7, 8, -1, -1, 1) for i in range(number_of_rows)]
+    )
+    return conn
+
+def measure(name: str, conn: sqlite3.Connection, build):
+    query = f"SELECT {columns(Game)} FROM game"
+    start = time.perf_counter()
+    rows = build(conn.execute(query))
+    elapsed = time.perf_counter() - start
+    del rows
+    tracemalloc.start()
+    rows = build(conn.execute(query))
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>18} {len(rows) / elapsed:>12,.0f} {memory / len(rows):>10.0f}")
+
+def with_row_factory(cursor: sqlite3.Cursor) -> list:
+    """Rows built by the cursor itself, as a row factory of the connection would"""
+    cursor.row_factory = lambda _, row: Game(*row)
+    return cursor.fetchall()
+
+def create_tournament(path: str, number_of_games: int):
+    """A guild with 16 teams and best of three games, two maps played each"""
+    database = DatabaseManager(db_path=path)
+    conn = database.get_connection()
+    team_service = TeamService(conn)
+    team_ids = [team_service.create_team(Team(name=f"team_{i}", guild_id=1, discord_message_id=i)) for i in range(16)]
+    with conn:
+        for i in range(number_of_games):
+            team_one_id, team_two_id = team_ids[i % 16], team_ids[(i + 1) % 16]
+            game_id = conn.execute(
+                """
+                INSERT INTO game (guild_id, team_one_id, team_two_id, game_type, game_channel_id,
+                    admin_game_channel_id, voice_channel_team_one_id, voice_channel_team_two_id,
+                    public_game_message_id, admin_pick_veto_button_message_id, round_number)
+                VALUES (1, ?, ?, ?, 1, 2, 3, 4, 5, 6, ?)
+                """,
+                (team_one_id, team_two_id, GAME_TYPES[i % len(GAME_TYPES)], i % len(GAME_TYPES) + 1)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO game_map (game_id, team_id_winner, guild_id, game_number, map_name) VALUES (?, ?, 1, ?, ?)",
+                [(game_id, team_one_id, 1, "mirage"), (game_id, team_two_id, 2, "inferno"), (game_id, -1, 3, "nuke")]
+            )
+    return database
+
+def measure_summary(name: str, read, queries: int):
+    start = time.perf_counter()
+    games = read()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>30} {len(games):>7} {queries:>8} {elapsed * 1000:>9.1f}")
+
+def main():
+    number_of_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    number_of_games = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    conn = create_database(number_of_rows)
+    print(f"{number_of_rows} rows")
+    print(f"{'model':>18} {'rows/s':>12} {'bytes/row':>10}")
+    measure("plain dataclass", conn, lambda cursor: [PlainGame(*row) for row in cursor])
+    measure("slotted dataclass", conn, lambda cursor: [Game(*row) for row in cursor])
+    measure("row factory", conn, with_row_factory)
+    measure("tuple view", conn, lambda cursor: list(map(GameView._make, cursor)))
+    measure("raw tuple", conn, lambda cursor: cursor.fetchall())
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = create_tournament(os.path.join(directory, "tournament.db"), number_of_games)
+        # No caches, as the summary reads the database of another process in api mode
+        game_service = GameService(database.get_connection(), cache=EntityCache(enabled=False))
+        team_service = TeamService(database.get_connection(), cache=EntityCache(enabled=False))
+        game_map_service = GameMapService(database.get_connection(), cache=EntityCache(enabled=False))
+
+        def read_models() -> list:
+            games = []
+            for game in game_service.get_all_games(guild_id=1):
+                games.append((game, team_service.get_team_by_id(game.team_one_id),
+                              team_service.get_team_by_id(game.team_two_id),
+                              game_map_service.get_all_game_maps_by_game(guild_id=1, game_id=game.id)))
+            return games
+
+        print(f"\nTournament summary of {number_of_games} games")
+        print(f"{'read':>30} {'games':>7} {'queries':>8} {'ms':>9}")
+        measure_summary("games, teams and maps models", read_models, 1 + 3 * number_of_games)
+        measure_summary("grouped query, GameResult", lambda: game_service.get_game_results(guild_id=1), 1)
+
+if __name__ == "__main__":
+    main()
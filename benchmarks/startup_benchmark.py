@@ -0,0 +1,66 @@
+"""
+Measures the cold start of the bot: the import time of main, profiled with
+python -X importtime in a new process each run, and the database
+initialization on a new and on an existing database.
+Reports the modules imported by main taking the most time and checks that
+the modules loaded on first use are not imported at startup.
+Usage: python benchmarks/startup_benchmark.py [runs] [importtime_report_file]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from services.database import DatabaseManager
+
+# Modules main imports on first use only
+LAZY_MODULES = ("fastapi", "uvicorn", "PIL", "rcon")
+TOP_MODULES = 10
+
+def import_profile() -> list:
+    """(self us, cumulative us, depth, module) of every module imported by main"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=SRC, capture_output=True, text=True, check=True)
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        profile.append((int(own), int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2, module))
+    return profile, result.stderr
+
+def database_init(path: str) -> float:
+    start = time.perf_counter()
+    DatabaseManager(db_path=path)
+    return time.perf_counter() - start
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    totals = []
+    for _ in range(runs):
+        profile, report = import_profile()
+        totals.append(next(cumulative for _, cumulative, _, module in profile if module == "main") / 10 ** 6)
+    print(f"import main: {statistics.median(totals):.3f} s (median of {runs} runs), {len(profile)} modules")
+    # Modules imported by main itself, with everything they import
+    top = sorted((entry for entry in profile if entry[2] == 1), key=lambda entry: -entry[1])
+    print(f"{'module':>30} {'cumulative s':>13}")
+    for _, cumulative, _, module in top[:TOP_MODULES]:
+        print(f"{module:>30} {cumulative / 10 ** 6:>13.3f}")
+    imported = {module.split(".")[0] for _, _, _, module in profile}
+    for module in LAZY_MODULES:
+        print(f"{module:>30} {'imported at startup' if module in imported else 'loaded on first use'}")
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w", encoding="utf-8") as f:
+            f.write(report)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tournament.db")
+        print(f"database init: new {database_init(path) * 1000:.1f} ms, existing {database_init(path) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
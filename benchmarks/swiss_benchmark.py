@@ -0,0 +1,55 @@
+"""
+Simulates full swiss stages with random results for large brackets and
+reports the pairing time per round and the number of rematches.
+Usage: python benchmarks/swiss_benchmark.py [number_of_teams ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from formats import get_format
+from models.team import Team
+
+def simulate(number_of_teams: int, swiss_wins: int = 3):
+    tournament_format = get_format("major", swiss_wins=swiss_wins)
+    teams = [Team(id=i, name=f"Team{i}") for i in range(1, number_of_teams + 1)]
+    played = set()
+    rematches = 0
+    round_number = 0
+    pairing_times = []
+    while True:
+        alive = [team for team in teams if team.swiss_wins < swiss_wins and team.swiss_losses < swiss_wins]
+        if len(alive) == 0:
+            break
+        round_number += 1
+        start = time.perf_counter()
+        pairs = tournament_format.swiss_pairings(alive, played)
+        pairing_times.append(time.perf_counter() - start)
+        for team_one, team_two in pairs:
+            pair = frozenset((team_one.id, team_two.id))
+            if pair in played:
+                rematches += 1
+            played.add(pair)
+            winner, loser = random.sample([team_one, team_two], 2)
+            winner.swiss_wins += 1
+            loser.swiss_losses += 1
+    qualified = sum(1 for team in teams if team.swiss_wins >= swiss_wins)
+    return round_number, qualified, rematches, pairing_times
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [16, 32, 64, 128]
+    print(f"{'teams':>6} {'rounds':>6} {'qualified':>9} {'rematches':>9} {'max pairing ms':>14} {'total ms':>9}")
+    for size in sizes:
+        results = [simulate(size) for _ in range(20)]
+        for rounds, qualified, rematches, pairing_times in results:
+            assert qualified == size // 2, f"{qualified} qualified with {size} teams"
+        worst = max(max(result[3]) for result in results) * 1000
+        total = max(sum(result[3]) for result in results) * 1000
+        rematches = sum(result[2] for result in results)
+        print(f"{size:>6} {results[0][0]:>6} {results[0][1]:>9} {rematches:>9} {worst:>14.2f} {total:>9.2f}")
+
+if __name__ == "__main__":
+    main()
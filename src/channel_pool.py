@@ -0,0 +1,82 @@
+import asyncio
+from typing import Dict, Optional
+import discord
+
+# Hidden category where the voice channels of the finished games wait to be reused
+POOL_CATEGORY_NAME = "Channel pool"
+
+class ChannelPool:
+    """
+    Recycles the voice channels of the games of each guild. Channels of the
+    finished games are moved to a hidden category instead of being deleted,
+    and the next games take them from there instead of creating new ones,
+    so rounds do not hit the per guild channel creation limits.
+    Up to `size` channels are parked per guild, Discord allows 50 per category.
+    """
+    def __init__(self, size: int = 40):
+        self.size = size
+        # Channels taken from the pool whose move the gateway has not confirmed yet
+        self.claimed = set()
+        self.locks: Dict[int, asyncio.Lock] = {}
+        self.stats: Dict[int, Dict[str, int]] = {}
+
+    def _count(self, guild_id: int, key: str):
+        stats = self.stats.setdefault(guild_id, {"reused": 0, "created": 0, "parked": 0, "deleted": 0})
+        stats[key] += 1
+
+    async def _get_pool_category(self, guild: discord.Guild) -> discord.CategoryChannel:
+        """Pool category of a guild, created hidden to everyone the first time"""
+        lock = self.locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            pool_category = discord.utils.get(guild.categories, name=POOL_CATEGORY_NAME)
+            if pool_category is None:
+                overwrites = {guild.default_role: discord.PermissionOverwrite(view_channel=False, connect=False)}
+                pool_category = await guild.create_category(POOL_CATEGORY_NAME, overwrites=overwrites)
+            return pool_category
+
+    async def acquire_voice_channel(self, guild: discord.Guild, category: discord.CategoryChannel,
+                                    name: str, overwrites: dict) -> discord.VoiceChannel:
+        """
+        Moves a parked voice channel to a category with the given name and
+        permissions, creating a new one if the pool is empty.
+        A channel with the same name is preferred, as renames are rate limited
+        to two every ten minutes per channel.
+        """
+        pool_category = discord.utils.get(guild.categories, name=POOL_CATEGORY_NAME)
+        parked = [channel for channel in pool_category.voice_channels
+                  if channel.id not in self.claimed] if pool_category is not None else []
+        channel: Optional[discord.VoiceChannel] = next((channel for channel in parked if channel.name == name), None)
+        if channel is None and len(parked) > 0:
+            channel = parked[0]
+        if channel is None:
+            self._count(guild.id, "created")
+            return await category.create_voice_channel(name, overwrites=overwrites)
+
+        self.claimed.add(channel.id)
+        if channel.name == name:
+            await channel.edit(category=category, overwrites=overwrites)
+        else:
+            await channel.edit(name=name, category=category, overwrites=overwrites)
+        self._count(guild.id, "reused")
+        return channel
+
+    async def park(self, channel: discord.abc.GuildChannel):
+        """
+        Moves a voice channel to the pool, hidden with the permissions of the
+        pool category. Channels are deleted when the pool is full.
+        """
+        guild = channel.guild
+        pool_category = await self._get_pool_category(guild)
+        if channel.category_id == pool_category.id and channel.id not in self.claimed:
+            return
+        self.claimed.discard(channel.id)
+        if len(pool_category.channels) >= self.size:
+            await channel.delete()
+            self._count(guild.id, "deleted")
+            return
+        await channel.edit(category=pool_category, sync_permissions=True)
+        self._count(guild.id, "parked")
+
+    def take_report(self, guild_id: int) -> Dict[str, int]:
+        """Counts of a guild since the last report, resetting them"""
+        return self.stats.pop(guild_id, {"reused": 0, "created": 0, "parked": 0, "deleted": 0})
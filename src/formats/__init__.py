@@ -0,0 +1,17 @@
+"""
+Tournament formats, deciding how teams are paired on each round.
+"""
+
+from formats.major import MajorFormat
+
+FORMATS = {
+    MajorFormat.name: MajorFormat,
+}
+
+def get_format(name: str, **kwargs):
+    """Instantiate a tournament format by name"""
+    if name not in FORMATS:
+        raise ValueError(f"Unknown tournament format {name}, must be one of: {', '.join(FORMATS)}")
+    return FORMATS[name](**kwargs)
+
+__all__ = ['MajorFormat', 'FORMATS', 'get_format']
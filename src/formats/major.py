@@ -0,0 +1,207 @@
+import random
+import re
+from typing import List, Optional, Tuple
+
+# Names used by the 3 wins / 3 losses swiss stage, indexed by (round, wins, losses)
+SWISS_GAME_TYPES = {
+    (1, 0, 0): "swiss_1",
+    (2, 1, 0): "swiss_2_high",
+    (2, 0, 1): "swiss_2_low",
+    (3, 2, 0): "swiss_3_high",
+    (3, 1, 1): "swiss_3_mid",
+    (3, 0, 2): "swiss_3_low",
+    (4, 2, 1): "swiss_4_high",
+    (4, 1, 2): "swiss_4_low",
+    (5, 2, 2): "swiss_5",
+}
+
+SWISS_TITLES = {
+    "swiss_1": "Swiss round 1 (0 Wins, 0 Losses)",
+    "swiss_2_high": "Swiss round 2 high (1 Win, 0 Losses)",
+    "swiss_2_low": "Swiss round 2 low (0 Wins, 1 Loss)",
+    "swiss_3_high": "Swiss round 3 high (2 Wins, 0 Losses)",
+    "swiss_3_mid": "Swiss round 3 mid (1 Win, 1 Loss)",
+    "swiss_3_low": "Swiss round 3 low (0 Wins, 2 Losses)",
+    "swiss_4_high": "Swiss round 4 high (2 Wins, 1 Losses)",
+    "swiss_4_low": "Swiss round 4 low (1 Win, 2 Losses)",
+    "swiss_5": "Swiss round 5 (2 Wins, 2 Losses)",
+}
+
+PLAYOFF_CATEGORIES = {
+    "quarterfinal": "Quarterfinals",
+    "semifinal": "Semifinals",
+    "third_place": "Third Place",
+    "final": "Final",
+}
+
+PLAYOFF_TITLES = {
+    "quarterfinal": "Quarter-final",
+    "semifinal": "Semi-final",
+    "third_place": "Third place",
+    "final": "Final",
+}
+
+# Maximum number of tried pairs before giving up on avoiding rematches
+MAX_PAIRING_STEPS = 100000
+
+class MajorFormat:
+    """
+    Major-like tournament: a swiss stage where teams qualify with `swiss_wins`
+    wins or are eliminated with `swiss_wins` losses, followed by a single
+    elimination playoff with a third place game.
+    Works with any power of two number of teams.
+    """
+    name = "major"
+
+    def __init__(self, swiss_wins: int = 3):
+        self.swiss_wins = swiss_wins
+
+    def validate_number_of_teams(self, number_of_teams: int) -> Optional[str]:
+        """
+        Returns the reason why a tournament cannot be played with the given
+        number of teams, None if it can.
+        Every swiss group must have an even number of teams and the playoff
+        needs a power of two number of qualified teams.
+        """
+        minimum = 2 ** (2 * self.swiss_wins - 2)
+        if number_of_teams < minimum or number_of_teams & (number_of_teams - 1) != 0:
+            return f"The number of teams must be a power of two and at least {minimum}."
+        return None
+
+    def next_stage(self, current_round, teams_in_swiss: int) -> Optional[str]:
+        """
+        Stage of the next round given the current round state, None if the
+        current round is not finished or the tournament is over.
+        """
+        if current_round is None:
+            return "swiss"
+        if current_round.finished_games < current_round.total_games:
+            return None
+        if current_round.stage == "swiss":
+            return "swiss" if teams_in_swiss > 0 else "playoff"
+        if current_round.stage == "playoff":
+            # With two qualified teams the first playoff round is already the final
+            if current_round.total_games <= 1:
+                return None
+            return "final" if current_round.total_games == 2 else "playoff"
+        return None
+
+    def swiss_game_type(self, round_number: int, wins: int, losses: int) -> str:
+        """Game type of a swiss game between teams with the given record"""
+        if self.swiss_wins == 3 and (round_number, wins, losses) in SWISS_GAME_TYPES:
+            return SWISS_GAME_TYPES[(round_number, wins, losses)]
+        return f"swiss_{round_number}_{wins}_{losses}"
+
+    def swiss_record(self, game_type: str) -> Optional[Tuple[int, int, int]]:
+        """(round, wins, losses) of a swiss game type, None if it is not a swiss game"""
+        for record, name in SWISS_GAME_TYPES.items():
+            if name == game_type:
+                return record
+        match = re.fullmatch(r"swiss_(\d+)_(\d+)_(\d+)", game_type)
+        if match:
+            return tuple(int(value) for value in match.groups())
+        return None
+
+    def playoff_game_type(self, number_of_games: int) -> str:
+        """Game type of a playoff round with the given number of games"""
+        if number_of_games == 1:
+            return "final"
+        if number_of_games == 2:
+            return "semifinal"
+        if number_of_games == 4:
+            return "quarterfinal"
+        return f"round_of_{number_of_games * 2}"
+
+    def is_decider(self, game_type: str) -> bool:
+        """
+        Checks if a swiss game decides a qualification or an elimination.
+        Elimination games of teams without wins are not deciders.
+        """
+        record = self.swiss_record(game_type)
+        if record is None:
+            return False
+        _, wins, losses = record
+        return wins == self.swiss_wins - 1 or (losses == self.swiss_wins - 1 and wins > 0)
+
+    def category_name(self, game_type: str, round_number: int) -> str:
+        """Discord category where the games of a game type are created"""
+        if game_type.startswith("swiss_"):
+            return f"Swiss stage round {round_number}"
+        if game_type in PLAYOFF_CATEGORIES:
+            return PLAYOFF_CATEGORIES[game_type]
+        return f"Round of {game_type.replace('round_of_', '')}"
+
+    def title(self, game_type: str) -> str:
+        """Human readable name of a game type"""
+        if game_type in SWISS_TITLES:
+            return SWISS_TITLES[game_type]
+        record = self.swiss_record(game_type)
+        if record is not None:
+            round_number, wins, losses = record
+            return (f"Swiss round {round_number} ({wins} Win{'' if wins == 1 else 's'}, "
+                    f"{losses} Loss{'' if losses == 1 else 'es'})")
+        if game_type in PLAYOFF_TITLES:
+            return PLAYOFF_TITLES[game_type]
+        return f"Round of {game_type.replace('round_of_', '')}"
+
+    def swiss_pairings(self, teams: list, played: set) -> Optional[List[tuple]]:
+        """
+        Pairs the teams of a swiss round. Teams only face teams with the same
+        record, so every group keeps an even number of teams. Inside a group
+        teams are drawn randomly and each team is paired with the first team
+        it has not played yet, backtracking when a pairing would leave the
+        rest of the group without a valid opponent.
+        Rematches are only allowed if the group has no pairing without them.
+        Returns None if a group has an odd number of teams.
+        """
+        groups = {}
+        for team in teams:
+            groups.setdefault((-team.swiss_wins, team.swiss_losses), []).append(team)
+        pairs = []
+        for record in sorted(groups):
+            group = groups[record]
+            random.shuffle(group)
+            group_pairs = _match(group, played)
+            if group_pairs is None:
+                group_pairs = _match(group, set())
+            if group_pairs is None:
+                return None
+            pairs += group_pairs
+        return pairs
+
+def _match(teams: list, played: set) -> Optional[List[tuple]]:
+    """
+    Depth first search of a perfect matching of the teams without played
+    pairs, trying the opponents in order.
+    """
+    used = [False] * len(teams)
+    pairs = []
+    steps = 0
+
+    def solve(first: int) -> bool:
+        nonlocal steps
+        while first < len(teams) and used[first]:
+            first += 1
+        if first == len(teams):
+            return True
+        used[first] = True
+        for second in range(first + 1, len(teams)):
+            if used[second]:
+                continue
+            if frozenset((teams[first].id, teams[second].id)) in played:
+                continue
+            steps += 1
+            if steps > MAX_PAIRING_STEPS:
+                break
+            used[second] = True
+            pairs.append((teams[first], teams[second]))
+            if solve(first + 1):
+                return True
+            pairs.pop()
+            used[second] = False
+        used[first] = False
+        return False
+
+    if len(teams) % 2 == 1 or not solve(0):
+        return None
+    return pairs
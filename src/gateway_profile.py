@@ -0,0 +1,35 @@
+from typing import Optional
+import discord
+
+PROFILES = ("default", "lean")
+
+def gateway_options(profile: str = "default", max_messages: Optional[int] = None) -> dict:
+    """
+    Keyword arguments of the bot for a runtime profile.
+    "default" receives the member events, caches every member, requesting
+    all the members of each guild at startup, and keeps the last 1000
+    messages.
+    "lean" is meant for large community guilds. The bot never lists the
+    members of a guild: it reads the authors of the commands and the
+    interactions, whose roles come in the event, and fetches any other
+    member when needed. So the members intent is not requested, no member
+    is cached and guilds are not chunked, and no messages are kept.
+    `max_messages` overrides the number of messages kept, 0 keeping none.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown BOT_PROFILE {profile}, must be one of: {', '.join(PROFILES)}")
+    intents = discord.Intents.default()
+    # Prefix commands are parsed from the message content
+    intents.message_content = True
+    options = {"intents": intents}
+    if profile == "default":
+        intents.members = True
+        options["max_messages"] = 1000
+    else:
+        intents.members = False
+        options["member_cache_flags"] = discord.MemberCacheFlags.none()
+        options["chunk_guilds_at_startup"] = False
+        options["max_messages"] = None
+    if max_messages is not None:
+        options["max_messages"] = max_messages or None
+    return options
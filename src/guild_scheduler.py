@@ -0,0 +1,58 @@
+import asyncio
+from collections import deque
+from typing import Dict
+
+class GuildScheduler:
+    """
+    Runs the heavy jobs of the guilds (round creation, live games start...)
+    with at most `concurrency` jobs at the same time and one job per guild.
+    Guilds with queued jobs take turns, so a guild queueing many jobs does
+    not delay the jobs of the other guilds.
+    """
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+        self.queues: Dict[int, deque] = {}
+        self.turns = deque()
+        self.running = set()
+        self.tasks = set()
+
+    async def run(self, guild_id: int, coroutine):
+        """Queues a coroutine on the guild turn and waits for its result"""
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.setdefault(guild_id, deque())
+        queue.append((coroutine, future))
+        if len(queue) == 1 and guild_id not in self.running:
+            self.turns.append(guild_id)
+        self._dispatch()
+        return await future
+
+    def pending(self, guild_id: int) -> int:
+        """Number of queued jobs of a guild, not counting the running one"""
+        return len(self.queues.get(guild_id, ()))
+
+    def _dispatch(self):
+        """Starts the jobs of the next guilds while there are free slots"""
+        while len(self.running) < self.concurrency and self.turns:
+            guild_id = self.turns.popleft()
+            coroutine, future = self.queues[guild_id].popleft()
+            if len(self.queues[guild_id]) == 0:
+                del self.queues[guild_id]
+            self.running.add(guild_id)
+            task = asyncio.create_task(self._run(guild_id, coroutine, future))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, guild_id: int, coroutine, future: asyncio.Future):
+        """Runs a job and gives the turn to the next guild"""
+        try:
+            result = await coroutine
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            self.running.discard(guild_id)
+            if guild_id in self.queues:
+                self.turns.append(guild_id)
+            self._dispatch()
@@ -1,23 +1,21 @@
+import io
+import itertools
 import json
-from PIL import Image, ImageDraw, ImageFont
 import os
 import logging
 from logging.handlers import RotatingFileHandler
 import datetime
 from dotenv import load_dotenv
 import random
-from fastapi import FastAPI, Request
 import discord
+from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
 import re
 
 import asyncio
-from threading import Thread
-
-import requests
-import subprocess
-from rcon.source import rcon
+import time
+from collections import deque
 
 from services import DatabaseManager
 from models.team import Team
@@ -27,11 +25,13 @@ from models.category import Category
 from models.channel import Channel
 from models.player import Player
 from models.game import Game
-from models.veto import Veto
-from models.pick import Pick
+from models.map_action import MapAction
 from models.game_map import GameMap
 from models.summary import Summary
 from models.game_server import GameServer
+from models.tournament_round import TournamentRound
+from models.ipc_message import IpcMessage
+from models.outbox_message import OutboxMessage, PRIORITY_PLAYER, PRIORITY_NORMAL, PRIORITY_DIAGNOSTIC
 
 from services.team_service import TeamService
 from services.setting_service import SettingService
@@ -40,38 +40,118 @@ from services.category_service import CategoryService
 from services.channel_service import ChannelService
 from services.player_service import PlayerService
 from services.game_service import GameService
-from services.veto_service import VetoService
-from services.pick_service import PickService
+from services.map_action_service import MapActionService
 from services.game_map_service import GameMapService
 from services.summary_service import SummaryService
 from services.game_server_service import GameServerService
-import uvicorn
+from services.match_config_service import MatchConfigService
+from services.tournament_round_service import TournamentRoundService
+from services.standing_service import StandingService
+from services.ipc_message_service import IpcMessageService
+from services.outbox_service import OutboxService
+from services.result_service import ResultService
+from services.maintenance_service import MaintenanceService
+from services.entity_cache import EntityCache
+from services.game_versions import GameVersions
+from formats import get_format
+from guild_scheduler import GuildScheduler
+from channel_pool import ChannelPool
+from name_index import NameIndex
+from gateway_profile import gateway_options
+from roster import parse_roster, validate_roster, ROLES
 import uuid
 
 description = '''
-Bot for creating a Counter Strike Tournament with 16 teams,
+Bot for creating a Counter Strike Tournament with any power of two number of teams,
 swiss-round and knock-out stage.
 '''
 
 # Bot configuration
-intents = discord.Intents.default()
-intents.members = True
-intents.message_content = True
-bot = commands.Bot(
+def _parse_shard_ids(value: str):
+    """
+    Parses the shard ids run by this process, like "0-3,8", None to run all
+    """
+    if not value:
+        return None
+    shard_ids = []
+    for part in value.split(','):
+        first, _, last = part.partition('-')
+        shard_ids += range(int(first), int(last or first) + 1)
+    return shard_ids
+
+# Guilds are split in shards, one gateway connection each. A process can run
+# only some shards with SHARD_IDS, SHARD_COUNT being the total of all processes.
+# BOT_PROFILE="lean" does not cache members nor messages, for large community guilds.
+bot = commands.AutoShardedBot(
     command_prefix=os.environ.get("BOT_PREFIX", "!"),
     description=description,
-    intents=intents,
-    help_command=None
+    help_command=None,
+    shard_count=int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None,
+    shard_ids=_parse_shard_ids(os.environ.get("SHARD_IDS")),
+    **gateway_options(os.environ.get("BOT_PROFILE", "default"),
+                      max_messages=int(os.environ["MAX_MESSAGES"]) if os.environ.get("MAX_MESSAGES") else None)
 )
 
-# API for MatchZy events
-app = FastAPI()
+# API for MatchZy events. FastAPI and uvicorn, like Pillow and rcon, are
+# imported on first use so the bot connects without waiting for them.
+# The routes are registered here and added to the app by create_app.
+API_ROUTES = []
+
+def api_route(method: str, path: str):
+    """
+    Registers an api route, like the FastAPI app decorators
+    """
+    def decorator(endpoint):
+        API_ROUTES.append((method, path, endpoint))
+        return endpoint
+    return decorator
 
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user} (ID: {bot.user.id})')
+    print(f'Shards: {sorted(bot.shards)} of {bot.shard_count}, guilds: {len(bot.guilds)}')
     print('------')
 
+def _choices(names: list) -> list:
+    """Autocomplete choices of some names"""
+    return [app_commands.Choice(name=name, value=name) for name in names]
+
+async def _team_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return _choices(bot.name_index.search("team", interaction.guild_id, current))
+
+async def _player_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return _choices(bot.name_index.search("player", interaction.guild_id, current))
+
+async def _game_type_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return _choices(bot.name_index.search("game_type", interaction.guild_id, current))
+
+async def _map_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return _choices(bot.name_index.search_maps(current))
+
+async def _role_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return _choices([role for role in ROLES if role.startswith(current.lower())])
+
+async def _game_team_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return _choices([team for team in ("team1", "team2") if team.startswith(current.lower())])
+
+@bot.command()
+@discord.ext.commands.has_role("admin")
+async def sync_commands(ctx):
+    """
+    Registers the slash commands in this server, needed after they change.
+    Format: !sync_commands
+    """
+    if not ctx.channel.name == "admin":
+        await ctx.send("Must be executed from admin channel")
+        return
+    try:
+        bot.tree.copy_global_to(guild=ctx.guild)
+        synced = await bot.tree.sync(guild=ctx.guild)
+        await ctx.send(f"{len(synced)} slash commands synced.")
+    except Exception as e:
+        logging.error(f"Error during sync_commands command: {e}")
+        await ctx.send(f"❌ Error during sync_commands command: {e}")
+
 @bot.command()
 @discord.ext.commands.has_role("admin")
 async def help(ctx):
@@ -86,18 +166,26 @@ async def help(ctx):
         "• Send `!start` to create all necessary roles, categories and channels\n\n"
         "🎮 **CS2 Tournament Bot Help**\n\n"
         "⚠️ Please use the #admin channel for all admin commands!\n\n"
-        "• `!start` - Initialize server setup (roles, categories, channels)\n\n"
+        "• `!start` - Initialize server setup (roles, categories, channels)\n"
+        "• `!sync_commands` - Register the slash versions of the admin commands in the server\n\n"
         "• `!get_settings` - Get all settings for the server\n\n"
         "• `!create_team <team_name>` - Create a new team\n"
         "• `!add_player <team_name> <nickname> <steamid> <role>` - Add player to team\n"
         "  Roles can be: captain/coach/player\n"
         "• `!delete_team <team_name>` - Delete team\n"
+        "• `!import_roster` - Create the teams and players of an attached .csv or .json roster file\n"
         "• `!delete_player <nickname>` - Delete player\n\n"
         "• `!all_teams_created` - Lock teams and start tournament\n"
-        "• `!finish_round` - Complete current round and start next\n\n"
-        "• `!start_live_game` - Sends all the information to the CS2/matchzy server.\n\n"
+        "• `!finish_round` - Complete current round and start next\n"
+        "• `!standings` - Show the swiss stage standings\n"
+        "• `!cache_stats` - Show the hits and misses of the team, game and map caches\n"
+        "• `!outbox_stats` - Show the backlog and latency of the Discord updates\n"
+        "• `!db_maintenance` - Optimize the database, sweep orphan rows and free unused space\n"
+        "• `!db_backup` - Take an online backup of the database\n\n"
+        "• `!start_live_game` - Sends all the information to the CS2/matchzy server.\n"
+        "• `!start_live_games` - Starts all the not started games of the round at once.\n\n"
         "**Admin Testing:** - ONLY USE FOR TESTING.\n"
-        "• `!mock_teams` - Create mock teams until 16 teams\n"
+        "• `!mock_teams` - Create mock teams until NUMBER_OF_TEAMS teams\n"
         "• `!autovetoautoresults` - Auto veto and set results\n"
         "• `!delete_games <game_type>` - Delete all games from a round\n"
         "• `!im_all_teams_captain` - Make my user captain of all teams\n"
@@ -124,13 +212,14 @@ async def help(ctx):
     )
     await ctx.send(help_msg)
 
-@bot.command()
+@bot.hybrid_command()
 async def start(ctx):
     """
     Initialize the server setup.
     It creates all categories, channels and settings.
     Format: !start
     """
+    await ctx.defer()
     guild = ctx.guild
     try:
         # No matter if already started, but roles should not be created twice.
@@ -146,6 +235,9 @@ async def start(ctx):
         
         # If the admin server role don't exists, create it
         admin_role = await _create_server_role(ctx, "admin")
+        bot.server_role_service.upsert_server_roles([
+            ServerRole(guild_id=guild.id, role_name=admin_role.name, role_id=admin_role.id)
+        ])
 
         # Create categories and channels
         private_overwrites = {
@@ -212,41 +304,38 @@ async def start(ctx):
         await ctx.send(f"Error during start command: {str(e)}")
         logging.error(f"Error during start command: {e}", exc_info=True)
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
-async def executercon(ctx, *values: str):
+async def executercon(ctx, ip: str, *, command: str):
     """
     Executes rcon command into server
-    Format: !executercon <command>
+    Format: !executercon <ip> <command>
     - command: Multiple words (e.g., "changemap de_dust2)
     """
-    # Check if values are setted
+    await ctx.defer()
     if not ctx.channel.name == "admin":
         await ctx.send("Must be executed from admin channel")
         return
-    ip = values[0]
-    command = ' '.join(values[1:])
 
     game_server = bot.game_server_service.get_game_server_by_ip(ip=ip)
     if game_server is None:
         await ctx.send("Game server don't exists")
         return
     response = await _execute_rcon(game_server=game_server, command=command)
-    await ctx.send(response)
+    await _send_text(ctx, response)
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
-async def create_team(ctx, *name: str):
+async def create_team(ctx, *, name: str):
     """
     Create a new team
     Format: !create_team <team_name>
     - team_name: Single word (e.g., "Iberian_Soul)
     If it is a word separated by spaces, a '_' will be replaced
     """
-    # Join multiple words and replace spaces with underscore only if multiple words
-    name = " ".join(name)
-    if " " in name:
-        name = name.replace(" ", "_")
+    await ctx.defer()
+    # Replace spaces with underscore if multiple words
+    name = "_".join(name.split())
     if not ctx.channel.name == "admin":
         await ctx.send("Must be executed from admin channel")
         return
@@ -256,8 +345,9 @@ async def create_team(ctx, *name: str):
         logging.error(f"Error during create_team command: {e}")
         await ctx.send(f"❌ Error during create_team command: {e}")
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
+@app_commands.autocomplete(team_name=_team_autocomplete, role_name=_role_autocomplete)
 async def add_player(ctx, team_name: str, nickname: str, steamid: str, role_name:str):
     """
     Adds a player with nickname, SteamID (numbers only), and role to a team.
@@ -267,6 +357,7 @@ async def add_player(ctx, team_name: str, nickname: str, steamid: str, role_name
     - steamid: Numbers only (e.g., "123456789")
     - role_name: captain/player/coach
     """
+    await ctx.defer()
     
     if not ctx.channel.name == "admin":
         await ctx.send("Must be executed from admin channel")
@@ -278,14 +369,40 @@ async def add_player(ctx, team_name: str, nickname: str, steamid: str, role_name
         logging.error(f"Error during add_player command: {e}")
         await ctx.send(f"❌ Error during add_player command: {e}")
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
+async def import_roster(ctx, roster: discord.Attachment = None):
+    """
+    Creates the teams and players of an attached roster file at once.
+    Format: !import_roster, with a .csv or .json file attached
+    - CSV columns: team,nickname,steamid,role
+    - JSON: [{"name": "Iberian_Soul", "players": [{"nickname": "alex", "steamid": "76561198000984547", "role": "captain"}]}]
+    """
+    await ctx.defer()
+    if not ctx.channel.name == "admin":
+        await ctx.send("Must be executed from admin channel")
+        return
+    try:
+        if roster is None:
+            await ctx.send("❌ Attach one .csv or .json roster file.")
+            return
+        content = await roster.read()
+        report = await bot.guild_scheduler.run(ctx.guild.id, _import_roster(ctx, filename=roster.filename, content=content))
+        await _send_text(ctx, report)
+    except Exception as e:
+        logging.error(f"Error during import_roster command: {e}")
+        await ctx.send(f"❌ Error during import_roster command: {e}")
+
+@bot.hybrid_command()
+@discord.ext.commands.has_role("admin")
+@app_commands.autocomplete(nickname=_player_autocomplete)
 async def delete_player(ctx, nickname: str):
     """
     Deletes a player with nickname.
     Format: !delete_player <nickname>
     - nickname: Single word (e.g., "s1mple")
     """
+    await ctx.defer()
 
     if not ctx.channel.name == "admin":
         await ctx.send("Must be executed from admin channel")
@@ -296,18 +413,18 @@ async def delete_player(ctx, nickname: str):
         logging.error(f"Error during delete_player command: {e}")
         await ctx.send(f"❌ Error during delete_player command: {e}")
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
-async def delete_team(ctx, *name: str):
+@app_commands.autocomplete(name=_team_autocomplete)
+async def delete_team(ctx, *, name: str):
     """
     Delete a single team
     Format: !delete_team <team_name>
     - team_name Single word (e.g., "Iberian_Soul")
     """
-    # Join multiple words and replace spaces with underscore only if multiple words
-    name = " ".join(name)
-    if " " in name:
-        name = name.replace(" ", "_")
+    await ctx.defer()
+    # Replace spaces with underscore if multiple words
+    name = "_".join(name.split())
 
     
     if not ctx.channel.name == "admin":
@@ -320,13 +437,14 @@ async def delete_team(ctx, *name: str):
         logging.error(f"Error during delete_team command: {e}")
         await ctx.send(f"❌ Error during delete_team command: {e}")
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
 async def all_teams_created(ctx):
     """
     Starts the tournament once all teams are created
     Format: !all_teams_created
     """
+    await ctx.defer()
     guild = ctx.guild
     all_teams_created_setting = bot.setting_service.get_setting_by_name(
         setting_key="all_teams_created", guild_id=guild.id)
@@ -337,6 +455,11 @@ async def all_teams_created(ctx):
     if not ctx.channel.name == "admin":
         await ctx.send("Must be executed from admin channel")
         return
+    teams = bot.team_service.get_all_teams(guild_id=guild.id)
+    error = bot.tournament_format.validate_number_of_teams(len(teams))
+    if error is not None:
+        await ctx.send(f"❌ {error} There are {len(teams)} teams.")
+        return
     
     try:
         await _create_server_setting(ctx, key="all_teams_created", value="true")
@@ -346,14 +469,15 @@ async def all_teams_created(ctx):
         logging.error(f"Error during all_teams_created command: {e}")
         await ctx.send(f"❌ Error during all_teams_created command: {e}")
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
 async def mock_teams(ctx):
     """
-    Create mock teams until complete the all the 16 teams
+    Create mock teams until complete the all the NUMBER_OF_TEAMS teams
     NOTE: CAREFUL!! Use this only for testing
     Format: !mock_teams
     """
+    await ctx.defer()
     guild = ctx.guild
     
     if not ctx.channel.name == "admin":
@@ -361,83 +485,177 @@ async def mock_teams(ctx):
         return
         
     try:
+        teams_channel = bot.channel_service.get_channel_by_name(channel_name="teams", guild_id=guild.id)
+        discord_teams_channel = bot.get_channel(teams_channel.channel_id) if teams_channel is not None else None
+        if discord_teams_channel is None:
+            await ctx.send("There is no teams channel, please use !start")
+            return
         teams = bot.team_service.get_all_teams(guild_id=guild.id)
-        for i in range(1, (17 - len(teams))):
-            team_name = f"TeamX{i}"
-            await _create_team(ctx, name=team_name)
-            players = [
-                (f"{team_name}captain", "captain"),
-                (f"{team_name}player1", "player"),
-                (f"{team_name}player2", "player"),
-                (f"{team_name}player3", "player"),
-                (f"{team_name}player4", "player"),
-                (f"{team_name}coach", "coach")
-            ]
-        teams = bot.team_service.get_all_teams(guild_id=guild.id)
-        for team in teams:
-            team_name = team.name
-            logging.info(f"Creating {team_name} players:")
-            players = [
-                (f"{team_name}captain", "captain"),
-                (f"{team_name}player1", "player"),
-                (f"{team_name}player2", "player"),
-                (f"{team_name}player3", "player"),
-                (f"{team_name}player4", "player"),
-                (f"{team_name}coach", "coach")
-            ]
-            for nickname, role in players:
-                steamid = str(random.randint(100000, 999999))
-                await _add_player(ctx, team_name=team_name, nickname=nickname, role_name=role, steamid=steamid)           
+        team_names = [f"TeamX{i}" for i in range(1, (bot.NUMBER_OF_TEAMS + 1 - len(teams)))]
+        roster = [("captain", "captain"), ("player1", "player"), ("player2", "player"),
+                  ("player3", "player"), ("player4", "player"), ("coach", "coach")]
+        # Steamids are unique per guild, so they are drawn without repetition
+        steamids = iter(random.sample(range(100000, 999999), len(team_names) * len(roster)))
+        players = {
+            team_name: [Player(guild_id=guild.id, nickname=f"{team_name}{suffix}", steamid=str(next(steamids)),
+                               role_name=role_name)
+                        for suffix, role_name in roster]
+            for team_name in team_names
+        }
+        new_teams = await _provision_teams(ctx, discord_teams_channel, team_names=team_names, players=players)
+        await ctx.send(f"Created {len(new_teams)} mock teams with {len(new_teams) * len(roster)} players")
     except Exception as e:
         logging.error(f"Error during mock_teams command: {e}")
         await ctx.send(f"❌ Error during mock_teams command: {e}")
 
-@bot.command()
+@bot.hybrid_command(description="Creates the games of the next round once the current one is finished")
 @discord.ext.commands.has_role("admin")
 async def finish_round(ctx):
     """
     Checks if all matches from current round are finished and if true creates the new random games for the next round.
     Format: !finish_round
     """
+    await ctx.defer()
     if not ctx.channel.name == "admin":
         await ctx.send("Must be executed from admin channel")
         return
     else:
-        await _set_new_round(ctx)
+        opened_round = await _set_new_round(ctx)
+        if opened_round is None:
+            await ctx.send("❌ No round to open, the current round is not finished or the tournament is over.")
+            return
+        round_number, games = opened_round
+        await ctx.send(f"✅ Round {round_number} opened with {len(games)} games.")
+
+@bot.hybrid_command()
+@discord.ext.commands.has_role("admin")
+async def standings(ctx):
+    """
+    Shows the swiss stage standings.
+    Format: !standings
+    """
+    await ctx.defer()
+    try:
+        embed = await _standings_embed(guild_id=ctx.guild.id)
+        await ctx.send(embed=embed)
+    except Exception as e:
+        logging.error(f"Error during standings command: {e}")
+        await ctx.send(f"❌ Error during standings command: {e}")
+
+@bot.command()
+@discord.ext.commands.has_role("admin")
+async def cache_stats(ctx):
+    """
+    Shows the hits and misses of the entity caches.
+    Format: !cache_stats
+    """
+    try:
+        if not ctx.channel.name == "admin":
+            await ctx.send("Must be executed from admin channel")
+            return
+        lines = []
+        for name, cache in (("Teams", bot.team_service.cache), ("Games", bot.game_service.cache),
+                            ("Game maps", bot.game_map_service.cache)):
+            stats = cache.get_stats()
+            total = stats["hits"] + stats["misses"]
+            hit_rate = 100 * stats["hits"] / total if total else 0
+            lines.append(f"{name}: {stats['hits']} hits, {stats['misses']} misses ({hit_rate:.1f}%), "
+                         f"{stats['entities']} cached in {stats['guilds']} guilds")
+        await ctx.send("\n".join(lines))
+    except Exception as e:
+        logging.error(f"Error during cache_stats command: {e}")
+        await ctx.send(f"❌ Error during cache_stats command: {e}")
+
+@bot.command()
+@discord.ext.commands.has_role("admin")
+async def outbox_stats(ctx):
+    """
+    Shows the backlog and delivery latency of the Discord outbox.
+    Format: !outbox_stats
+    """
+    try:
+        if not ctx.channel.name == "admin":
+            await ctx.send("Must be executed from admin channel")
+            return
+        pending, oldest = bot.outbox_service.get_backlog()
+        statuses = bot.outbox_service.get_status_counts()
+        stats = bot.outbox_stats
+        lines = [f"Backlog: {pending} pending" + (f", oldest {time.time() - oldest:.1f}s ago" if oldest else ""),
+                 f"Since start: {stats['sent']} sent, {stats['batched']} batched, {stats['retried']} retried, "
+                 f"{stats['failed']} failed",
+                 f"Stored: {statuses.get('sent', 0)} sent, {statuses.get('superseded', 0)} coalesced, "
+                 f"{statuses.get('failed', 0)} failed"]
+        latencies = sorted(stats["latencies"])
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            lines.append(f"Latency of the last {len(latencies)}: p50 {p50:.2f}s, p95 {p95:.2f}s, max {latencies[-1]:.2f}s")
+        await ctx.send("\n".join(lines))
+    except Exception as e:
+        logging.error(f"Error during outbox_stats command: {e}")
+        await ctx.send(f"❌ Error during outbox_stats command: {e}")
+
+@bot.command()
+@discord.ext.commands.has_role("admin")
+async def db_maintenance(ctx):
+    """
+    Runs the database maintenance now.
+    Format: !db_maintenance
+    """
+    try:
+        if not ctx.channel.name == "admin":
+            await ctx.send("Must be executed from admin channel")
+            return
+        await ctx.send(await _run_database_maintenance())
+    except Exception as e:
+        logging.error(f"Error during db_maintenance command: {e}")
+        await ctx.send(f"❌ Error during db_maintenance command: {e}")
 
 @bot.command()
 @discord.ext.commands.has_role("admin")
+async def db_backup(ctx):
+    """
+    Takes an online backup of the database now.
+    Format: !db_backup
+    """
+    try:
+        if not ctx.channel.name == "admin":
+            await ctx.send("Must be executed from admin channel")
+            return
+        await ctx.send(await _run_database_backup())
+    except Exception as e:
+        logging.error(f"Error during db_backup command: {e}")
+        await ctx.send(f"❌ Error during db_backup command: {e}")
+
+@bot.hybrid_command()
+@discord.ext.commands.has_role("admin")
+@app_commands.autocomplete(game_type=_game_type_autocomplete)
 async def delete_games(ctx, game_type:str):
     """
     Delete all games from a round and its channels.
     Format: !delete_games <game_type>
         - game_type: Single word (e.g., "quarterfinals")
     """
+    await ctx.defer()
     try:
         if not ctx.channel.name == "admin":
             await ctx.send("Must be executed from admin channel")
             return
         else:
-            if game_type not in ["swiss_1", "swiss_2_high", "swiss_2_low", "swiss_3_high", "swiss_3_low", "swiss_3_mid", "quarterfinal", "semifinal", "final", "third_place"]:
-                await ctx.send("❌ Invalid game type name! Must be one of: swiss_1, swiss_2_high, swiss_2_low, swiss_3_high, swiss_3_low, swiss_3_mid, quarterfinal, semifinal, final, third_place")
-                return
             # Delete all games and channels from the specified round
             games = bot.game_service.get_games_by_type(game_type=game_type, guild_id=ctx.guild.id)
             if not games:
-                await ctx.send(f"No games found for {game_type}.")
+                game_types = bot.game_service.get_game_types(guild_id=ctx.guild.id)
+                await ctx.send(f"No games found for {game_type}. Game types are: {', '.join(game_types)}")
                 return  
+            rounds = {}
             for game in games:
-                public_channel = bot.get_channel(game.game_channel_id)
-                await public_channel.delete()
-                admin_channel = bot.get_channel(game.admin_game_channel_id)
-                await admin_channel.delete()
-                voice_channel_team_one = bot.get_channel(game.voice_channel_team_one_id)
-                await voice_channel_team_one.delete()
-                voice_channel_team_two = bot.get_channel(game.voice_channel_team_two_id)
-                await voice_channel_team_two.delete()
-                # Delete game from database
-                bot.game_service.delete_game_by_id(id=game.id)
-            await ctx.send(f"All games from {game_type} deleted successfully.")
+                rounds.setdefault(game.round_number, []).append(game)
+            lines = []
+            for round_number, round_games in sorted(rounds.items()):
+                lines.append(await _delete_round_games(ctx.guild.id, round_number, round_games))
+            _discard_staged_round(ctx.guild.id)
+            await ctx.send(f"All games from {game_type} deleted successfully.\n" + "\n".join(lines))
     except Exception as e:
         logging.error(f"Error during delete_games command: {e}")
         await ctx.send(f"❌ Error during delete_games command: {e}")
@@ -471,11 +689,12 @@ async def im_all_teams_captain(ctx):
         logging.error(f"Error during im_all_teams_captain command: {e}")
         await ctx.send(f"❌ Error during im_all_teams_captain command: {e}")
 
-@bot.command()
+@bot.hybrid_command(description="Registers a CS2 server")
 @discord.ext.commands.has_role("admin")
 async def create_game_server(ctx, ip:str, game_port:int, rcon_password:str, cstv_port:int):
     """
     """
+    await ctx.defer()
     try:
         if not ctx.channel.name == "admin":
             await ctx.send("Must be executed from admin channel")
@@ -489,11 +708,12 @@ async def create_game_server(ctx, ip:str, game_port:int, rcon_password:str, cstv
         logging.error(f"Error during create_game_server command: {e}")
         await ctx.send(f"❌ Error during create_game_server command: {e}")
 
-@bot.command()
+@bot.hybrid_command(description="Removes a CS2 server")
 @discord.ext.commands.has_role("admin")
 async def delete_game_server(ctx, ip:str):
     """
     """
+    await ctx.defer()
     try:
         if not ctx.channel.name == "admin":
             await ctx.send("Must be executed from admin channel")
@@ -508,25 +728,20 @@ async def delete_game_server(ctx, ip:str):
         await ctx.send(f"❌ Error during delete_game_server command: {e}")
 
 
-@bot.command()
+@bot.hybrid_command()
 @discord.ext.commands.has_role("admin")
 async def start_live_game(ctx):
     """
     Start the game. 
     Format: !start_start_live_game
     """
-    await ctx.send("Trying to start live game...")
-    channel_id = ctx.channel.id
+    await ctx.defer()
     # Get game based on admin game where channel has been created
-    game = bot.game_service.get_game_by_admin_game_channel_id(admin_game_channel_id=channel_id)
-    admin_game_channel = bot.get_channel(channel_id)
+    game = _get_game_by_admin_game_channel(ctx.channel.id)
     if game is None:
         await ctx.send("This must be sent from a admin game channel.")
         return
-
-    json = await _get_matchzy_values(game=game)
-    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
-    team_two = bot.team_service.get_team_by_id(game.team_two_id) 
+    await ctx.send("Trying to start live game...")
 
     game_server = bot.game_server_service.get_game_server_by_game_id(game_id=game.id)
     if game_server is not None:
@@ -542,145 +757,235 @@ async def start_live_game(ctx):
     bot.game_server_service.update_game_server(game_server)
 
     try:
-        # Save JSON to local file
-        os.makedirs('/usr/src/app/match_configs', exist_ok=True)
-        filename = f"/usr/src/app/match_configs/{game.id}.json"
-        with open(filename, 'w') as f:
-            f.write(json)
-        
-        file = discord.File(filename, filename=f"match_configs_game_{game.id}.json")
-        await admin_game_channel.send("Match config:", file=file)
-        rcons = {
-            "matchzy_loadmatch_url": f"matchzy_loadmatch_url \"{bot.WEBHOOK_BASE_URL}/match_configs/{game.id}.json\"",
-            "matchzy_remote_log_url": f"matchzy_remote_log_url \"{bot.WEBHOOK_BASE_URL}/match_logs/{game.id}\"",
-            "matchzy_demo_upload_url": f"matchzy_demo_upload_url \"{bot.WEBHOOK_BASE_URL}/match_demos/{game.id}\"",
-            "matchzy_minimum_ready_required": "matchzy_minimum_ready_required 1",
-            "matchzy_chat_prefix": "matchzy_chat_prefix [{Green}" + bot.TOURNAMENT_NAME + "{Default}]",
-            "matchzy_admin_chat_prefix": "matchzy_admin_chat_prefix [{Red}Admin{Default}]",
-            "matchzy_hostname_format": "matchzy_hostname_format \"\"",
-            "matchzy_knife_enabled_default": "matchzy_knife_enabled_default true",
-            "matchzy_kick_when_no_match_loaded": "matchzy_kick_when_no_match_loaded true",
-            "matchzy_enable_damage_report": "matchzy_enable_damage_report false",
-            "hostname": f"hostname \"{bot.TOURNAMENT_NAME}-{team_one.name}vs{team_two.name}-{game.game_type}\"",
-        }
-        for key, value in rcons.items():
-            logging.info(f"Executing rcon command `{value}`")
-            await ctx.send(f"Executing rcon command `{value}`")
-            response = await _execute_rcon(game_server=game_server, command=value)
-            if response is not None and response != "":
-                logging.info(response)
-        await ctx.send("✅ Match config saved and game started successfully, please players join the game:")
-        await ctx.send(f"connect {game_server.ip}:{game_server.game_port}")
-                
+        await _start_live_game(game=game, game_server=game_server, report=True)
+        _enqueue([
+            _outbox_send(game.guild_id, game.admin_game_channel_id,
+                         "✅ Match config saved and game started successfully, please players join the game:",
+                         priority=PRIORITY_PLAYER),
+            _outbox_send(game.guild_id, game.admin_game_channel_id,
+                         f"connect {game_server.ip}:{game_server.game_port}", priority=PRIORITY_PLAYER),
+        ])
     except Exception as e:
         logging.error(f"Error saving match config: {e}")
-        await ctx.send(f"❌ Error saving match config. Start manually the game on the server: {e}")
+        # Freed so !start_live_game can be run again
+        _release_game_server(game_server)
+        await ctx.send(f"❌ Error saving match config. Start manually the game on the server or run !start_live_game again: {e}")
 
-@bot.command()
+@bot.hybrid_command()
+@discord.ext.commands.has_role("admin")
+async def start_live_games(ctx):
+    """
+    Start all the not started games of the current round at once.
+    Format: !start_live_games
+    """
+    await ctx.defer()
+    if not ctx.channel.name == "admin":
+        await ctx.send("Must be executed from admin channel")
+        return
+    try:
+        await ctx.send("Trying to start all live games...")
+        report = await bot.guild_scheduler.run(ctx.guild.id, _start_live_games(guild_id=ctx.guild.id))
+        await _send_text(ctx, report)
+    except Exception as e:
+        logging.error(f"Error during start_live_games command: {e}")
+        await ctx.send(f"❌ Error during start_live_games command: {e}")
+
+@bot.hybrid_command(description="Sets the result of the current map of the game")
 @discord.ext.commands.has_role("admin")
 async def map_result(ctx, team1_score: int, team2_score: int):
     """
     Start the game. 
     Format: !map_result <team1_score> <team2_score>
     """
-    channel_id = ctx.channel.id
+    await ctx.defer()
     # Get game based on admin game where channel has been created
-    game = bot.game_service.get_game_by_admin_game_channel_id(admin_game_channel_id=channel_id)
+    game = _get_game_by_admin_game_channel(ctx.channel.id)
     if game is None:
         await ctx.send("This must be sent from a admin game channel.")
         return
-    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
-    team_two = bot.team_service.get_team_by_id(game.team_two_id)
-    team_number = 1 
-    team_winner = team_one
-    if team1_score == team2_score:
-        await ctx.send("A map cannot be draw.")
+    error = await _report_map_result(game, team1_score=team1_score, team2_score=team2_score)
+    if error is not None:
+        await ctx.send(error)
         return
-    if team1_score < team2_score:
-        team_winner = team_two
-        team_number = 2
-    game_map = bot.game_map_service.get_first_not_finished_game_map(guild_id=ctx.guild.id, game_id=game.id)
-    message = f"""
-                {team_winner.name} wins the map {game_map.game_number} - {game_map.map_name}.\n The result was {team1_score}:{team2_score}.
-                """
-    public_channel = bot.get_channel(game.game_channel_id)
-    await public_channel.send(message)
-    await _set_result(game=game, team_number=team_number, map_name=game_map.map_name)
-
-    game_server = bot.game_server_service.get_game_server_by_game_id(game.id)
-    if game_server is not None:
-        game_server.is_free = True
-        game_server.game_id = -1
-        bot.game_server_service.update_game_server(game_server)
+    await ctx.send(f"✅ Map result {team1_score}:{team2_score} set")
 
-@bot.command()
+@bot.hybrid_command(description="Records a map vetoed by a team of the game")
 @discord.ext.commands.has_role("admin")
+@app_commands.autocomplete(vetoer=_game_team_autocomplete, map_name=_map_autocomplete)
 async def map_vetoed(ctx, vetoer: str, map_name: str):
-    channel_id = ctx.channel.id
+    await ctx.defer()
     # Get game based on admin game where channel has been created
-    game = bot.game_service.get_game_by_admin_game_channel_id(admin_game_channel_id=channel_id)
+    game = _get_game_by_admin_game_channel(ctx.channel.id)
     if game is None:
         await ctx.send("This must be sent from a admin game channel.")
         return
-    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
-    team_two = bot.team_service.get_team_by_id(game.team_two_id) 
-    team_vetoer_id = -1
-    if vetoer == "team1":
-        team_vetoer_id = team_one.id
-    elif vetoer == "team2":
-        team_vetoer_id = team_two.id
-    game_id = game.id
-    vetoes = bot.veto_service.get_all_vetoes_by_game_id_only(game_id=game_id)
-    picks = bot.pick_service.get_all_picks_by_game_id_only(game_id=game_id)
-    
-    order_veto = len(vetoes)
-    order_pick = len(picks)
-    all_order = order_veto + order_pick
-    veto = Veto(order_veto=all_order + 1, game_id=game_id, team_id=team_vetoer_id, map_name=map_name, guild_id=game.guild_id)
-    bot.veto_service.create_veto(veto)
-    embed = await _game_embed(game)
-    public_channel = bot.get_channel(game.game_channel_id)
-    msg = await public_channel.fetch_message(game.public_game_message_id)
-    await msg.edit(embed=embed)
+    _record_map_action(game, action="veto", team_number=_TEAM_NUMBERS.get(vetoer, -1), map_name=map_name)
+    await ctx.send(f"✅ {map_name} vetoed")
 
-@bot.command()
+@bot.hybrid_command(description="Records a map picked by a team of the game")
 @discord.ext.commands.has_role("admin")
+@app_commands.autocomplete(picker=_game_team_autocomplete, map_name=_map_autocomplete)
 async def map_picked(ctx, picker: str, map_name: str):
-    channel_id = ctx.channel.id
+    await ctx.defer()
     # Get game based on admin game where channel has been created
-    game = bot.game_service.get_game_by_admin_game_channel_id(admin_game_channel_id=channel_id)
+    game = _get_game_by_admin_game_channel(ctx.channel.id)
     if game is None:
         await ctx.send("This must be sent from a admin game channel.")
         return
-    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
-    team_two = bot.team_service.get_team_by_id(game.team_two_id) 
-    team_picker_id = -1
-    if picker == "team1":
-        team_picker_id = team_one.id
-    elif picker == "team2":
-        team_picker_id = team_two.id
-    game_id = game.id
-    
-    vetoes = bot.veto_service.get_all_vetoes_by_game_id_only(game_id=game_id)
-    picks = bot.pick_service.get_all_picks_by_game_id_only(game_id=game_id)
-    
-    order_veto = len(vetoes)
-    order_pick = len(picks)
-    all_order = order_veto + order_pick
-    pick = Pick(order_pick=all_order + 1, game_id=game_id, team_id=team_picker_id, map_name=map_name, guild_id=game.guild_id)
-    bot.pick_service.create_pick(pick)
+    _record_map_action(game, action="pick", team_number=_TEAM_NUMBERS.get(picker, -1), map_name=map_name)
+    await ctx.send(f"✅ {map_name} picked")
 
+_TEAM_NUMBERS = {"team1": 1, "team2": 2}
+
+def _record_map_action(game: Game, action: str, team_number: int, map_name: str):
+    """
+    Records a veto or a pick of a team of a game, -1 if it is not known,
+    a pick adding the map to the game. The game embed is updated through the outbox.
+    """
+    team_id = {1: game.team_one_id, 2: game.team_two_id}.get(team_number, -1)
+    map_action = MapAction(guild_id=game.guild_id, game_id=game.id, action=action, team_id=team_id, map_name=map_name)
+    if action == "veto":
+        bot.map_action_service.create_map_action(map_action, outbox=[_outbox_game_summary(game)])
+        bot.outbox_event.set()
+        return
     map_number = 1
-    game_map = bot.game_map_service.get_last_not_finished_game_map(guild_id=ctx.guild.id, game_id=game.id)
+    game_map = bot.game_map_service.get_last_not_finished_game_map(guild_id=game.guild_id, game_id=game.id)
     if game_map is not None:
         map_number = game_map.game_number + 1
-    
-    game_map = GameMap(game_number=map_number, map_name=pick.map_name, game_id=game.id, team_id_winner=-1, guild_id=game.guild_id)
-    bot.game_map_service.create_game_map(game_map)             
-    embed = await _game_embed(game)
+    game_map = GameMap(game_number=map_number, map_name=map_name, game_id=game.id, team_id_winner=-1, guild_id=game.guild_id)
+    bot.game_map_service.create_game_map(game_map, map_action=map_action, outbox=[_outbox_game_summary(game)])
+    bot.outbox_event.set()
+
+async def _report_map_result(game: Game, team1_score: int, team2_score: int) -> str:
+    """
+    Sets the result of the map being played in a game and frees its server.
+    Returns the reason why the result is not valid, None if it was set.
+    """
+    if team1_score == team2_score:
+        return "A map cannot be draw."
+    game_map = bot.game_map_service.get_first_not_finished_game_map(guild_id=game.guild_id, game_id=game.id)
+    if game_map is None:
+        return "There is no picked map without result in this game."
+    team_number = 1 if team1_score > team2_score else 2
+    team_winner = bot.team_service.get_team_by_id(game.team_one_id if team_number == 1 else game.team_two_id)
+    message = f"""
+                {team_winner.name} wins the map {game_map.game_number} - {game_map.map_name}.\n The result was {team1_score}:{team2_score}.
+                """
     public_channel = bot.get_channel(game.game_channel_id)
-    msg = await public_channel.fetch_message(game.public_game_message_id)
-    await msg.edit(embed=embed)        
+    await public_channel.send(message)
+    await _set_result(game=game, team_number=team_number, map_name=game_map.map_name,
+                      team1_score=team1_score, team2_score=team2_score)
+
+    game_server = bot.game_server_service.get_game_server_by_game_id(game.id)
+    if game_server is not None:
+        game_server.is_free = True
+        game_server.game_id = -1
+        bot.game_server_service.update_game_server(game_server)
+    return None
+
+# Game controls: the veto, pick and result components posted on the admin
+# game channels. Their custom_id is "game:<game_id>:<action>[:<team_number>]"
+# and their interactions are routed by it in on_interaction, so no view is
+# kept in memory and the components keep working after a restart.
+
+def _game_controls_view(game: Game, team_one: Team, team_two: Team) -> View:
+    """
+    Components to veto and pick the maps left for each team and to report
+    the result of the map being played. The view is only used to render
+    them: it is stopped so discord.py does not store it.
+    """
+    taken = {map_action.map_name for map_action in bot.map_action_service.get_map_actions_by_game(game.id)}
+    options = [discord.SelectOption(label=map_name) for map_name in bot.MAP_POOL if map_name not in taken]
+    view = View(timeout=None)
+    if options:
+        for action in ("veto", "pick"):
+            for team_number, team in ((1, team_one), (2, team_two)):
+                view.add_item(discord.ui.Select(custom_id=f"game:{game.id}:{action}:{team_number}",
+                                                placeholder=f"{action.capitalize()} a map for {team.name}",
+                                                options=options))
+    view.add_item(Button(custom_id=f"game:{game.id}:result", label="Report map result",
+                         style=discord.ButtonStyle.primary))
+    view.stop()
+    return view
+
+def _has_any_role(member: discord.Member, role_names: set) -> bool:
+    return any(role.name in role_names for role in getattr(member, "roles", []))
+
+async def _on_game_map_action(interaction: discord.Interaction, game: Game, action: str, team_number: str):
+    """A captain or an admin vetoes or picks a map for a team"""
+    team_one = bot.team_service.get_team_by_id(game.team_one_id)
+    team_two = bot.team_service.get_team_by_id(game.team_two_id)
+    team = team_one if team_number == "1" else team_two
+    if not _has_any_role(interaction.user, {"admin", f"{team.name}_captain"}):
+        await interaction.response.send_message(f"Only admins and the captain of {team.name} can do this.", ephemeral=True)
+        return
+    map_name = interaction.data["values"][0]
+    taken = {map_action.map_name for map_action in bot.map_action_service.get_map_actions_by_game(game.id)}
+    if map_name not in taken:
+        _record_map_action(game, action=action, team_number=int(team_number), map_name=map_name)
+    # The components are redrawn with the maps left either way, the message could be outdated
+    await interaction.response.edit_message(view=_game_controls_view(game, team_one, team_two))
+    if map_name in taken:
+        await interaction.followup.send(f"{map_name} was already vetoed or picked.", ephemeral=True)
+    else:
+        await interaction.followup.send(f"{interaction.user.mention} {action}ed {map_name} for {team.name}")
+
+async def _on_game_result(interaction: discord.Interaction, game: Game):
+    """An admin opens the form to report the result of the map being played"""
+    if not _has_any_role(interaction.user, {"admin"}):
+        await interaction.response.send_message("Only admins can report results.", ephemeral=True)
+        return
+    team_one = bot.team_service.get_team_by_id(game.team_one_id)
+    team_two = bot.team_service.get_team_by_id(game.team_two_id)
+    modal = discord.ui.Modal(title="Map result", custom_id=f"game:{game.id}:score", timeout=None)
+    modal.add_item(discord.ui.TextInput(label=f"{team_one.name} score"[:45], custom_id="team1_score", max_length=3))
+    modal.add_item(discord.ui.TextInput(label=f"{team_two.name} score"[:45], custom_id="team2_score", max_length=3))
+    # Submissions are routed by custom_id too, so the modal is not stored
+    modal.stop()
+    await interaction.response.send_modal(modal)
+
+async def _on_game_score(interaction: discord.Interaction, game: Game):
+    """An admin submits the result of the map being played"""
+    if not _has_any_role(interaction.user, {"admin"}):
+        await interaction.response.send_message("Only admins can report results.", ephemeral=True)
+        return
+    values = {component["custom_id"]: component["value"]
+              for row in interaction.data["components"] for component in row["components"]}
+    try:
+        team1_score = int(values["team1_score"])
+        team2_score = int(values["team2_score"])
+    except (KeyError, ValueError):
+        await interaction.response.send_message("Scores must be numbers.", ephemeral=True)
+        return
+    await interaction.response.defer(thinking=True)
+    error = await _report_map_result(game, team1_score=team1_score, team2_score=team2_score)
+    await interaction.followup.send(error or f"Result {team1_score}:{team2_score} reported by {interaction.user.mention}")
+
+_GAME_ACTIONS = {
+    "veto": lambda interaction, game, team_number: _on_game_map_action(interaction, game, "veto", team_number),
+    "pick": lambda interaction, game, team_number: _on_game_map_action(interaction, game, "pick", team_number),
+    "result": _on_game_result,
+    "score": _on_game_score,
+}
+
+@bot.listen()
+async def on_interaction(interaction: discord.Interaction):
+    """Routes the interactions of the game controls by their custom_id"""
+    if interaction.type not in (discord.InteractionType.component, discord.InteractionType.modal_submit):
+        return
+    parts = (interaction.data or {}).get("custom_id", "").split(":")
+    if len(parts) < 3 or parts[0] != "game" or parts[2] not in _GAME_ACTIONS or not parts[1].isdigit():
+        return
+    game = bot.game_service.get_game_by_id(game_id=int(parts[1]))
+    if game is None or game.guild_id != interaction.guild_id:
+        await interaction.response.send_message("This game does not exist anymore.", ephemeral=True)
+        return
+    try:
+        await _GAME_ACTIONS[parts[2]](interaction, game, *parts[3:])
+    except Exception as e:
+        logging.error(f"Error during game {parts[2]} interaction: {e}")
+        if not interaction.response.is_done():
+            await interaction.response.send_message(f"❌ Error during game {parts[2]} interaction: {e}", ephemeral=True)
 
 @bot.command()
 @discord.ext.commands.has_role("admin")
@@ -716,70 +1021,167 @@ async def autovetoautoresults(ctx):
         await ctx.send(f"❌ Error generating response file: {e}")
         
 
-async def _get_matchzy_values(game: Game) -> str:
+async def _build_match_configs(games: list[Game]) -> dict:
     """
-    Get json for configurate the Matchzy game
+    Build the jsons for configurating the Matchzy games of several games
+    with a single query for all the rosters, and store them in the match config cache.
     More info at https://shobhit-pathak.github.io/MatchZy/match_setup/
     """
+    team_ids = list({game.team_one_id for game in games} | {game.team_two_id for game in games})
+    teams = {team.id: team for team in bot.team_service.get_teams_by_ids(team_ids)}
 
-    match_id = str(game.id)
-    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
-    team_two = bot.team_service.get_team_by_id(game.team_two_id) 
+    # Captains first, then players and coaches, as Matchzy receives them
+    role_order = {"captain": 0, "player": 1, "coach": 2}
+    players_by_team = {team_id: [] for team_id in team_ids}
+    for player in sorted(bot.player_service.get_players_by_team_ids(team_ids), key=lambda p: role_order[p.role_name]):
+        players_by_team[player.team_id].append(player)
 
-    captains_team_one = bot.player_service.get_players_by_team_id_and_role_name(team_one.id, "captain")
-    captains_team_two = bot.player_service.get_players_by_team_id_and_role_name(team_two.id, "captain")
+    configs = {}
+    for game in games:
+        game_to_wins = await _get_game_to_wins(game=game)
+        num_maps = int(game_to_wins.replace('bo',''))
 
-    players_team_one = bot.player_service.get_players_by_team_id_and_role_name(team_one.id, "player")
-    players_team_two = bot.player_service.get_players_by_team_id_and_role_name(team_two.id, "player")
+        data = {}
+        data['matchid'] = str(game.id)
 
-    coaches_team_one = bot.player_service.get_players_by_team_id_and_role_name(team_one.id, "coach")
-    coaches_team_two = bot.player_service.get_players_by_team_id_and_role_name(team_two.id, "coach")
+        for team_key, team_id in [('team1', game.team_one_id), ('team2', game.team_two_id)]:
+            team = {}
+            team['name'] = teams[team_id].name
+            team['players'] = {player.steamid: player.nickname for player in players_by_team[team_id]}
+            data[team_key] = team
 
-    game_to_wins = await _get_game_to_wins(game=game)
-    num_maps = int(game_to_wins.replace('bo',''))
+        data['num_maps'] = num_maps
 
-    data = {}
-    data['matchid'] = match_id
-
-    team1 = {}
-    team1['name'] = team_one.name
-    players = {}
-    for player in captains_team_one:
-        players[player.steamid] = player.nickname
-    for player in players_team_one:
-        players[player.steamid] = player.nickname
-    for player in coaches_team_one:
-        players[player.steamid] = player.nickname
-    team1['players'] = players
-    data['team1'] = team1
-
-    team2 = {}
-    team2['name'] = team_two.name
-    players = {}
-    for player in captains_team_two:
-        players[player.steamid] = player.nickname
-    for player in players_team_two:
-        players[player.steamid] = player.nickname
-    for player in coaches_team_two:
-        players[player.steamid] = player.nickname
-    team2['players'] = players
-    data['team2'] = team2
-
-    data['num_maps'] = num_maps
-
-    data['maplist'] = bot.MAP_POOL
-
-    map_sides = ["knife", "team1_ct", "team2_ct"]
-    data['map_sides'] = map_sides
-
-    data['clinch_series'] = True
-    data['skip_veto'] = False
-
-    data['players_per_team'] = 5
-
-    # Return the json with indent for sending it as file
-    return json.dumps(data, indent=4)    
+        data['maplist'] = bot.MAP_POOL
+
+        map_sides = ["knife", "team1_ct", "team2_ct"]
+        data['map_sides'] = map_sides
+
+        data['clinch_series'] = True
+        data['skip_veto'] = False
+
+        data['players_per_team'] = 5
+
+        # Store the json with indent for sending it as file
+        config = json.dumps(data, indent=4).encode('utf-8')
+        await asyncio.to_thread(bot.match_config_service.save_match_config, game.id, config)
+        configs[game.id] = config
+    return configs
+
+async def _get_match_config(game: Game) -> bytes:
+    """
+    Get json for configurate the Matchzy game, building it only if it is not cached
+    """
+    config = bot.match_config_service.get_match_config(game.id)
+    if config is None:
+        config = (await _build_match_configs([game]))[game.id]
+    return config
+
+async def _invalidate_match_configs(team_id: int):
+    """
+    Invalidates the cached match configs of the not finished games of a team
+    after its roster changes
+    """
+    for game in bot.game_service.get_all_games_not_finished_by_team(team_id=team_id):
+        bot.match_config_service.delete_match_config(game.id)
     
+async def _start_live_game(game: Game, game_server: GameServer, report: bool = False):
+    """
+    Saves the match config of a game already assigned to a game server,
+    posts it on the admin game channel and configures the server with rcon.
+    With `report`, the rcon commands are also posted on the admin game
+    channel, behind the player facing messages.
+    Raises if a rcon command fails, the game server not being configured then.
+    """
+    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
+    team_two = bot.team_service.get_team_by_id(game.team_two_id) 
+    admin_game_channel = bot.get_channel(game.admin_game_channel_id)
+
+    await _get_match_config(game=game)
+    filename = bot.match_config_service.get_path(game.id)
+    file = discord.File(filename, filename=f"match_configs_game_{game.id}.json")
+    await admin_game_channel.send("Match config:", file=file)
+    rcons = {
+        "matchzy_loadmatch_url": f"matchzy_loadmatch_url \"{bot.WEBHOOK_BASE_URL}/match_configs/{game.id}.json\"",
+        "matchzy_remote_log_url": f"matchzy_remote_log_url \"{bot.WEBHOOK_BASE_URL}/match_logs/{game.id}\"",
+        "matchzy_demo_upload_url": f"matchzy_demo_upload_url \"{bot.WEBHOOK_BASE_URL}/match_demos/{game.id}\"",
+        "matchzy_minimum_ready_required": "matchzy_minimum_ready_required 1",
+        "matchzy_chat_prefix": "matchzy_chat_prefix [{Green}" + bot.TOURNAMENT_NAME + "{Default}]",
+        "matchzy_admin_chat_prefix": "matchzy_admin_chat_prefix [{Red}Admin{Default}]",
+        "matchzy_hostname_format": "matchzy_hostname_format \"\"",
+        "matchzy_knife_enabled_default": "matchzy_knife_enabled_default true",
+        "matchzy_kick_when_no_match_loaded": "matchzy_kick_when_no_match_loaded true",
+        "matchzy_enable_damage_report": "matchzy_enable_damage_report false",
+        "hostname": f"hostname \"{bot.TOURNAMENT_NAME}-{team_one.name}vs{team_two.name}-{game.game_type}\"",
+    }
+    for key, value in rcons.items():
+        logging.info(f"Executing rcon command `{value}`")
+        if report:
+            _enqueue([_outbox_send(game.guild_id, game.admin_game_channel_id,
+                                   f"Executing rcon command `{value}`", priority=PRIORITY_DIAGNOSTIC)])
+        response = await _execute_rcon(game_server=game_server, command=value, raise_errors=True)
+        if response is not None and response != "":
+            logging.info(response)
+
+def _release_game_server(game_server: GameServer):
+    """
+    Frees a game server whose game could not be started
+    """
+    game_server.is_free = True
+    game_server.game_id = -1
+    bot.game_server_service.update_game_server(game_server)
+
+async def _start_live_games(guild_id: int) -> str:
+    """
+    Assigns a free game server to every not started game of the guild and
+    configures all of them concurrently, at most LIVE_GAMES_CONCURRENCY at a time.
+    Returns a status report of all the games.
+    """
+    games = bot.game_service.get_all_games_not_finished(guild_id=guild_id)
+    started_game_ids = {game_server.game_id for game_server in
+                        bot.game_server_service.get_game_servers_by_game_ids([game.id for game in games])}
+    games = [game for game in games if game.id not in started_game_ids]
+    if len(games) == 0:
+        return "There are no games waiting to be started."
+
+    # Servers are assigned sequentially so two games never get the same one
+    free_game_servers = bot.game_server_service.get_free_game_servers(guild_id=guild_id)
+    assignments = list(zip(games, free_game_servers))
+    for game, game_server in assignments:
+        game_server.is_free = False
+        game_server.game_id = game.id
+        bot.game_server_service.update_game_server(game_server)
+
+    semaphore = asyncio.Semaphore(bot.LIVE_GAMES_CONCURRENCY)
+
+    async def start(game: Game, game_server: GameServer) -> str:
+        async with semaphore:
+            team_one = bot.team_service.get_team_by_id(game.team_one_id)
+            team_two = bot.team_service.get_team_by_id(game.team_two_id)
+            try:
+                await _start_live_game(game=game, game_server=game_server)
+                _enqueue([
+                    _outbox_send(game.guild_id, game.admin_game_channel_id,
+                                 "✅ Match config saved and game started successfully, please players join the game:",
+                                 priority=PRIORITY_PLAYER),
+                    _outbox_send(game.guild_id, game.admin_game_channel_id,
+                                 f"connect {game_server.ip}:{game_server.game_port}", priority=PRIORITY_PLAYER),
+                ])
+                return f"✅ {team_one.name} vs {team_two.name} started at {game_server.ip}:{game_server.game_port}"
+            except Exception as e:
+                logging.error(f"Error starting game {game.id}: {e}")
+                # Freed so the next !start_live_games retries the game
+                _release_game_server(game_server)
+                return f"❌ {team_one.name} vs {team_two.name} failed at {game_server.ip}:{game_server.game_port}: {e}"
+
+    lines = await asyncio.gather(*(start(game, game_server) for game, game_server in assignments))
+    lines = list(lines)
+    for game in games[len(assignments):]:
+        team_one = bot.team_service.get_team_by_id(game.team_one_id)
+        team_two = bot.team_service.get_team_by_id(game.team_two_id)
+        lines.append(f"⚠️ {team_one.name} vs {team_two.name} not started, there is not free game server.")
+    return "\n".join(lines)
+
 def setup_logging():
     """Configure logging with file rotation"""
     os.makedirs('logs', exist_ok=True)
@@ -810,21 +1212,38 @@ def setup_logging():
 
 def setup_database():
     """Initialize database and attach to bot instance"""
-    bot.db = DatabaseManager()
+    bot.db = DatabaseManager(db_path=os.environ.get("DATABASE_PATH", "./data/tournament.db"))
+    # Api workers do not cache entities, as the bot process writes them
+    cache_enabled = os.environ.get("RUN_MODE", "all") != "api"
+    team_cache = EntityCache(enabled=cache_enabled)
+    bot.game_versions = GameVersions()
     bot.setting_service = SettingService(bot.db.get_connection())
-    bot.service_role_service = ServerRoleService(bot.db.get_connection())
-    bot.team_service = TeamService(bot.db.get_connection())
     bot.server_role_service = ServerRoleService(bot.db.get_connection())
     bot.category_service = CategoryService(bot.db.get_connection())
     bot.channel_service = ChannelService(bot.db.get_connection())
     bot.player_service = PlayerService(bot.db.get_connection())
-    bot.game_service = GameService(bot.db.get_connection())
-    bot.team_service = TeamService(bot.db.get_connection())
-    bot.veto_service = VetoService(bot.db.get_connection())
-    bot.pick_service = PickService(bot.db.get_connection())
-    bot.game_map_service = GameMapService(bot.db.get_connection())
+    bot.game_service = GameService(bot.db.get_connection(), cache=EntityCache(enabled=cache_enabled))
+    bot.team_service = TeamService(bot.db.get_connection(), cache=team_cache)
+    bot.map_action_service = MapActionService(bot.db.get_connection(), versions=bot.game_versions)
+    bot.game_map_service = GameMapService(bot.db.get_connection(), cache=EntityCache(enabled=cache_enabled),
+                                          versions=bot.game_versions)
     bot.summary_service = SummaryService(bot.db.get_connection())
     bot.game_server_service = GameServerService(bot.db.get_connection())
+    bot.match_config_service = MatchConfigService(use_memory=cache_enabled)
+    bot.tournament_round_service = TournamentRoundService(bot.db.get_connection())
+    bot.standing_service = StandingService(bot.db.get_connection())
+    bot.ipc_message_service = IpcMessageService(bot.db.get_connection())
+    bot.outbox_service = OutboxService(bot.db.get_connection())
+    bot.result_service = ResultService(bot.db.get_connection(), game_service=bot.game_service,
+                                       team_service=bot.team_service, game_map_service=bot.game_map_service)
+    bot.maintenance_service = MaintenanceService(bot.db.get_connection(),
+                                                 backup_dir=os.environ.get("BACKUP_DIR", "./backups"),
+                                                 keep_backups=int(os.environ.get("BACKUP_KEEP", "7")))
+    if cache_enabled:
+        for conflict in bot.player_service.get_player_conflicts():
+            logging.warning(f"Player {conflict[3]} (id {conflict[0]}, guild {conflict[1]}, team {conflict[2]}) was removed "
+                            f"by the roster constraints migration, steamid {conflict[4]} belongs to player id {conflict[6]}. "
+                            "Add it again with a different steamid and delete it from player_conflict.")
     logging.info("Database and services initialized")
 
 def setup_vars():
@@ -842,6 +1261,64 @@ def setup_vars():
     bot.THIRD_PLACE_ROUND=os.environ.get("THIRD_PLACE_ROUND", "bo3")
     bot.TOURNAMENT_NAME=os.environ.get("TOURNAMENT_NAME", "MY_TOURNAMENT")
     bot.WEBHOOK_BASE_URL=os.environ.get("WEBHOOK_BASE_URL", None)
+    bot.LIVE_GAMES_CONCURRENCY=int(os.environ.get("LIVE_GAMES_CONCURRENCY", "8"))
+    bot.NUMBER_OF_TEAMS=int(os.environ.get("NUMBER_OF_TEAMS", "16"))
+    bot.SWISS_WINS=int(os.environ.get("SWISS_WINS", "3"))
+    bot.tournament_format = get_format(os.environ.get("TOURNAMENT_FORMAT", "major"), swiss_wins=bot.SWISS_WINS)
+    bot.AUTO_ADVANCE=os.environ.get("AUTO_ADVANCE", "off")
+    bot.RUN_MODE=os.environ.get("RUN_MODE", "all")
+    bot.API_WORKERS=int(os.environ.get("API_WORKERS", "1"))
+    bot.IPC_POLL_INTERVAL=float(os.environ.get("IPC_POLL_INTERVAL", "1"))
+    bot.IPC_MAX_ATTEMPTS=int(os.environ.get("IPC_MAX_ATTEMPTS", "5"))
+    bot.API_PORT=int(os.environ.get("API_PORT", "8000"))
+    bot.GUILD_JOBS_CONCURRENCY=int(os.environ.get("GUILD_JOBS_CONCURRENCY", "2"))
+    bot.OUTBOX_CONCURRENCY=int(os.environ.get("OUTBOX_CONCURRENCY", "4"))
+    bot.OUTBOX_POLL_INTERVAL=float(os.environ.get("OUTBOX_POLL_INTERVAL", "2"))
+    bot.OUTBOX_MAX_ATTEMPTS=int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "8"))
+    bot.OUTBOX_BACKOFF_BASE=float(os.environ.get("OUTBOX_BACKOFF_BASE", "1"))
+    bot.OUTBOX_BACKOFF_MAX=float(os.environ.get("OUTBOX_BACKOFF_MAX", "300"))
+    bot.OUTBOX_BATCH_WINDOW=float(os.environ.get("OUTBOX_BATCH_WINDOW", "0.3"))
+    bot.CHANNEL_POOL_SIZE=int(os.environ.get("CHANNEL_POOL_SIZE", "40"))
+    bot.TEARDOWN_CONCURRENCY=int(os.environ.get("TEARDOWN_CONCURRENCY", "4"))
+    bot.PROVISION_CONCURRENCY=int(os.environ.get("PROVISION_CONCURRENCY", "8"))
+    bot.MAINTENANCE_INTERVAL=float(os.environ.get("MAINTENANCE_INTERVAL", "3600"))
+    bot.MAINTENANCE_VACUUM_PAGES=int(os.environ.get("MAINTENANCE_VACUUM_PAGES", "1000"))
+    bot.BACKUP_INTERVAL=float(os.environ.get("BACKUP_INTERVAL", "21600"))
+    bot.BACKUP_STEP_PAGES=int(os.environ.get("BACKUP_STEP_PAGES", "256"))
+
+    # Runtime state
+    bot.staged_rounds = {}
+    # Changes of the results, teams and rosters by guild, discarding the rounds staged before them
+    bot.staging_generations = {}
+    bot.round_locks = {}
+    bot.background_tasks = set()
+    bot.guild_scheduler = GuildScheduler(concurrency=bot.GUILD_JOBS_CONCURRENCY)
+    bot.channel_pool = ChannelPool(size=bot.CHANNEL_POOL_SIZE)
+    # Prefix tries of the names suggested by the autocomplete of the slash commands
+    bot.name_index = NameIndex(
+        load_teams=lambda guild_id: [team.name for team in bot.team_service.get_all_teams(guild_id=guild_id)],
+        load_players=lambda guild_id: [player.nickname for player in bot.player_service.get_players_by_guild(guild_id=guild_id)],
+        load_game_types=lambda guild_id: bot.game_service.get_game_types(guild_id=guild_id),
+        map_pool=bot.MAP_POOL)
+    # The maintenance and the backups share a connection, one at a time
+    bot.maintenance_lock = asyncio.Lock()
+    # Admin game channel id -> game id, so game commands do not search the games
+    bot.game_routes = bot.game_service.get_admin_game_channel_routes()
+    # Game id -> (game version, embed) of the last rendered game embeds
+    bot.game_embeds = {}
+    # Wakes the outbox dispatcher up when a state change writes outbox messages
+    bot.outbox_event = asyncio.Event()
+    bot.outbox_stats = {"sent": 0, "retried": 0, "failed": 0, "batched": 0, "latencies": deque(maxlen=1000)}
+
+def _get_game_by_admin_game_channel(channel_id: int) -> Game:
+    """
+    Returns the game of an admin game channel, None without any database
+    access if the channel is not an admin game channel
+    """
+    game_id = bot.game_routes.get(channel_id)
+    if game_id is None:
+        return None
+    return bot.game_service.get_game_by_id(game_id=game_id)
 
 async def _create_team(ctx, name:str) -> Team:
     """
@@ -855,25 +1332,85 @@ async def _create_team(ctx, name:str) -> Team:
         await ctx.send("There is no teams channel, please use !start")
         return
 
-    team = bot.team_service.get_team_by_name(name=name, guild_id = guild.id)
-    if team is not None:
-        await ctx.send(f"Team {name} already exists.")
-        return
     embed = await _create_team_embed(team_name=name, members=[])
     msg = await discord_teams_channel.send(embed=embed)
 
+    # The unique name of the team is checked by the insert itself
     team = Team(name=name, guild_id=guild.id, discord_message_id=msg.id)
-    team.id = bot.team_service.create_team(team=team)
+    try:
+        team.id = bot.team_service.create_team(team=team)
+    except ValueError as e:
+        await msg.delete()
+        await ctx.send(str(e))
+        return
+    bot.name_index.add("team", guild.id, [name])
+    bot.standing_service.create_standing(guild_id=guild.id, team_id=team.id)
+    _discard_staged_round(guild.id)
 
     logging.info(f"Team {name} created in guild {guild.name}")
     await ctx.send(f"Created team {name}")
 
-    # Create roles
-    for role_type in ["captain", "player", "coach"]:
-        server_role_name = f"{name}_{role_type}"
-        await _create_server_role(ctx, server_role_name=server_role_name)
+    await _create_team_roles(ctx, teams=[team])
     return team
 
+async def _create_team_roles(ctx, teams: list):
+    """
+    Creates the captain, player and coach roles of several teams concurrently,
+    PROVISION_CONCURRENCY requests at a time, and stores their IDs in a
+    single transaction.
+    """
+    semaphore = asyncio.Semaphore(bot.PROVISION_CONCURRENCY)
+
+    async def create_role(server_role_name: str) -> discord.Role:
+        async with semaphore:
+            return await _create_server_role(ctx, server_role_name=server_role_name)
+
+    roles = await asyncio.gather(*(create_role(f"{team.name}_{role_type}") for team in teams for role_type in ROLES))
+    bot.server_role_service.upsert_server_roles([
+        ServerRole(guild_id=ctx.guild.id, role_name=role.name, role_id=role.id) for role in roles
+    ])
+
+async def _provision_teams(ctx, discord_teams_channel: discord.TextChannel, team_names: list, players: dict) -> list:
+    """
+    Creates a batch of new teams with their members by team name. The team
+    embeds are posted concurrently with their final members, then the teams
+    and the players, also those of existing teams, are inserted in a single
+    transaction and the roles of the new teams are created concurrently.
+    Returns the new teams.
+    Raises ValueError if a team or player was created meanwhile, the posted
+    embeds being deleted then.
+    """
+    guild = ctx.guild
+    semaphore = asyncio.Semaphore(bot.PROVISION_CONCURRENCY)
+
+    async def post_team_embed(team_name: str) -> Team:
+        embed = await _create_team_embed(team_name=team_name, members=players.get(team_name, []))
+        async with semaphore:
+            msg = await discord_teams_channel.send(embed=embed)
+        return Team(name=team_name, guild_id=guild.id, discord_message_id=msg.id)
+
+    results = await asyncio.gather(*(post_team_embed(team_name) for team_name in team_names), return_exceptions=True)
+    new_teams = [result for result in results if isinstance(result, Team)]
+    try:
+        error = next((result for result in results if isinstance(result, BaseException)), None)
+        if error is not None:
+            raise error
+        team_ids = bot.team_service.import_roster(guild_id=guild.id, teams=new_teams, players=players)
+        bot.player_service.invalidate_steamid_index(guild_id=guild.id)
+        bot.name_index.add("team", guild.id, team_names)
+        bot.name_index.add("player", guild.id, [player.nickname for team_players in players.values() for player in team_players])
+        _discard_staged_round(guild.id)
+    except BaseException:
+        await asyncio.gather(*(discord_teams_channel.get_partial_message(team.discord_message_id).delete()
+                               for team in new_teams), return_exceptions=True)
+        raise
+    for team in new_teams:
+        team.id = team_ids[team.name]
+    logging.info(f"{len(new_teams)} teams created in guild {guild.name}")
+
+    await _create_team_roles(ctx, teams=new_teams)
+    return new_teams
+
 async def _add_player(ctx, team_name:str, nickname:str, role_name:str, steamid:str) -> Player:
     """
     Adds a player to a team.
@@ -897,46 +1434,25 @@ async def _add_player(ctx, team_name:str, nickname:str, role_name:str, steamid:s
     team = bot.team_service.get_team_by_name(name=team_name, guild_id=guild.id)
     if team is None:
         return
-    player = bot.player_service.get_player_by_nickname(nickname=nickname, guild_id=guild.id)
-    if player is not None:
-        await ctx.send(f"Player {nickname} already exists with this name.")
-        return None
-    player = bot.player_service.get_player_by_steamid(steamid=steamid, guild_id=guild.id)
-    if player is not None:
-        await ctx.send(f"Player with steamid {steamid} already exists.")
-        return None
     if not steamid.isdigit():
         await ctx.send("❌ SteamID must contain only numbers (steamID64)!")
         return None
-    players = bot.player_service.get_players_by_team_id(team_id=team.id)
-
-    if role_name == "captain":
-        count_captains = sum(1 for p in players if p.role_name == role_name)
-        if count_captains >= 1:
-            await ctx.send("❌ Only one captain can be assigned.")
-            return None
-    elif role_name == "coach":
-        count_coaches = sum(1 for p in players if p.role_name == role_name)
-        if count_coaches >= 2:
-            await ctx.send("❌ Only two coaches can be assigned.")
-            return None
-    elif role_name == "player":
-        count_players = sum(1 for p in players if p.role_name == role_name)
-        if count_players >= 4:
-            await ctx.send("❌ Only four non-captain players can be assigned.")
-            return None
-    else:
-        await ctx.send("❌ Role must be \"captain\", \"coach\" or \"player\".")
-        return None
-
 
+    # Unique nickname and steamid and the role limits are checked by the insert itself
     player = Player(
         guild_id=guild.id, 
         team_id=team.id, 
         nickname=nickname, 
         steamid=steamid,
         role_name=role_name)
-    player.id = bot.player_service.create_player(player)
+    try:
+        player.id = bot.player_service.create_player(player)
+    except ValueError as e:
+        await ctx.send(str(e))
+        return None
+    bot.name_index.add("player", guild.id, [nickname])
+    _discard_staged_round(guild.id)
+    await _invalidate_match_configs(team_id=team.id)
     await ctx.send(f"Player {nickname} with steamid {steamid} added as a {role_name} to team {team_name}")
 
     players = bot.player_service.get_players_by_team_id(team_id=team.id)
@@ -945,6 +1461,59 @@ async def _add_player(ctx, team_name:str, nickname:str, role_name:str, steamid:s
     await discord_team_message.edit(embed=embed)
     return player    
 
+async def _import_roster(ctx, filename: str, content: bytes) -> str:
+    """
+    Imports a roster file. Every row is validated in memory before anything
+    is created, then all the teams and players are inserted in a single
+    transaction, the roles of the new teams are created concurrently and
+    each team embed is posted or edited once.
+    Returns a report of the import.
+    """
+    guild = ctx.guild
+    all_teams_created_setting = bot.setting_service.get_setting_by_name(guild_id=guild.id, setting_key="all_teams_created")
+    if all_teams_created_setting is not None and all_teams_created_setting.value == "true":
+        return "❌ Teams cannot be imported once the tournament has started."
+    teams_channel = bot.channel_service.get_channel_by_name(channel_name="teams", guild_id=guild.id)
+    discord_teams_channel = bot.get_channel(teams_channel.channel_id) if teams_channel is not None else None
+    if discord_teams_channel is None:
+        return "There is no teams channel, please use !start"
+
+    try:
+        rows = parse_roster(filename, content)
+    except ValueError as e:
+        return f"❌ {e}"
+    existing_teams = {team.name: team for team in bot.team_service.get_all_teams(guild_id=guild.id)}
+    existing_players = bot.player_service.get_players_by_guild(guild_id=guild.id)
+    members, errors = validate_roster(rows, {name: team.id for name, team in existing_teams.items()}, existing_players)
+    if errors:
+        return "❌ Nothing imported, please fix the roster file:\n" + "\n".join(errors)
+
+    players = {
+        team_name: [Player(guild_id=guild.id, nickname=nickname, steamid=steamid, role_name=role_name)
+                    for nickname, steamid, role_name in team_members]
+        for team_name, team_members in members.items()
+    }
+    # New teams are posted with their final embed, existing teams are edited once below
+    new_teams = await _provision_teams(ctx, discord_teams_channel,
+                                       team_names=[name for name in members if name not in existing_teams],
+                                       players=players)
+
+    updated_teams = [existing_teams[name] for name in members if name in existing_teams and len(players[name]) > 0]
+    rosters = {}
+    for player in bot.player_service.get_players_by_team_ids([team.id for team in updated_teams]):
+        rosters.setdefault(player.team_id, []).append(player)
+
+    async def edit_team_embed(team: Team):
+        embed = await _create_team_embed(team_name=team.name, members=rosters.get(team.id, []))
+        await discord_teams_channel.get_partial_message(team.discord_message_id).edit(embed=embed)
+
+    await asyncio.gather(*(edit_team_embed(team) for team in updated_teams))
+    for team in updated_teams:
+        await _invalidate_match_configs(team_id=team.id)
+    logging.info(f"Roster {filename} imported in guild {guild.name}")
+    return (f"✅ Roster imported: {len(new_teams)} teams created, {len(updated_teams)} teams updated "
+            f"and {sum(len(team_players) for team_players in players.values())} players added.")
+
 async def _delete_player(ctx, nickname:str):
     """
     Delets a player from a team.
@@ -967,6 +1536,9 @@ async def _delete_player(ctx, nickname:str):
     
     team = bot.team_service.get_team_by_id(team_id=player.team_id)
     player.id = bot.player_service.delete_player_by_id(id=player.id)
+    bot.name_index.remove("player", guild.id, [nickname])
+    _discard_staged_round(guild.id)
+    await _invalidate_match_configs(team_id=team.id)
     await ctx.send(f"Player {nickname} deleted successfully.")
 
     players = bot.player_service.get_players_by_team_id(team_id=team.id)
@@ -977,7 +1549,7 @@ async def _delete_player(ctx, nickname:str):
 
 async def _delete_team(ctx, name:str):
     """
-    Deletes a team and its players.
+    Deletes a team, its players and its games with their channels.
     """
     guild = ctx.guild
     discord_info_category = discord.utils.get(guild.categories, name="Info")
@@ -1001,16 +1573,30 @@ async def _delete_team(ctx, name:str):
     await captain_role.delete()
     await player_role.delete()
     await coach_role.delete()
+    bot.server_role_service.delete_server_roles_by_name(
+        guild_id=guild.id, server_role_names=[f"{name}_{role_type}" for role_type in ROLES])
 
     players = bot.player_service.get_players_by_team_id(team_id=team.id)
     for player in players:
         bot.player_service.delete_player_by_id(id=player.id)
+    bot.name_index.remove("player", guild.id, [player.nickname for player in players])
+    bot.name_index.remove("team", guild.id, [name])
+    _discard_staged_round(guild.id)
+
+    # The games of the team would be deleted with it by cascade, without
+    # removing their channels, freeing their servers or recounting their rounds
+    rounds = {}
+    for game in bot.game_service.get_games_by_team(team_id=team.id):
+        rounds.setdefault(game.round_number, []).append(game)
+    lines = []
+    for round_number, round_games in sorted(rounds.items()):
+        lines.append(await _delete_round_games(guild.id, round_number, round_games))
 
     logging.info(team.name)
     team.id = bot.team_service.delete_team_by_id(id=team.id)
 
     logging.info(f"Team {name} deleted in guild {guild.name}")
-    await ctx.send(f"Deleted team {name}")
+    await _send_text(ctx, "\n".join([f"Deleted team {name}"] + lines))
         
 async def _create_team_embed(team_name: str, members: list) -> discord.Embed:
     """Creates an embed for team display with current members and status"""
@@ -1117,61 +1703,232 @@ async def _create_server_setting(ctx, key:str, value:str) -> Setting:
         setting.id = bot.setting_service.create_setting(setting=setting)
     return setting
 
+class AdminChannelContext:
+    """
+    Minimal command context for tasks not started by a command,
+    everything sent goes to the admin channel of the guild.
+    """
+    def __init__(self, guild: discord.Guild, channel: discord.TextChannel):
+        self.guild = guild
+        self.channel = channel
+
+    async def send(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
+def _get_admin_context(guild_id: int) -> AdminChannelContext:
+    """
+    Creates a context posting on the admin channel of a guild
+    """
+    admin_channel = bot.channel_service.get_channel_by_name(channel_name="admin", guild_id=guild_id)
+    return AdminChannelContext(guild=bot.get_guild(guild_id), channel=bot.get_channel(admin_channel.channel_id))
+
+def _get_round_lock(guild_id: int) -> asyncio.Lock:
+    """
+    Lock avoiding two rounds of a guild being staged or opened at the same time
+    """
+    if guild_id not in bot.round_locks:
+        bot.round_locks[guild_id] = asyncio.Lock()
+    return bot.round_locks[guild_id]
+
+def _discard_staged_round(guild_id: int):
+    """
+    Discards the round staged in background of a guild after a result, team
+    or roster change, as it was paired from the previous records. A staging
+    in progress is not kept either.
+    """
+    bot.staged_rounds.pop(guild_id, None)
+    bot.staging_generations[guild_id] = bot.staging_generations.get(guild_id, 0) + 1
+
+def _run_in_background(coroutine):
+    """
+    Runs a coroutine without waiting for it, keeping a reference until it finishes
+    """
+    task = asyncio.create_task(coroutine)
+    bot.background_tasks.add(task)
+    task.add_done_callback(bot.background_tasks.discard)
+    return task
+
+async def _teardown_game_channels(game: Game, semaphore: asyncio.Semaphore) -> int:
+    """
+    Deletes the text channels of a game and parks its voice channels.
+    Returns the number of channels removed.
+    """
+    channels = [bot.get_channel(game.game_channel_id), bot.get_channel(game.admin_game_channel_id)]
+    # Voice channels of finished games were parked with the result, and may be used by other games now
+    voice_channels = []
+    if game.team_winner <= 0:
+        voice_channels = [bot.get_channel(game.voice_channel_team_one_id), bot.get_channel(game.voice_channel_team_two_id)]
+
+    async def remove(channel, park: bool) -> int:
+        async with semaphore:
+            try:
+                if park:
+                    await bot.channel_pool.park(channel)
+                else:
+                    await channel.delete()
+            except discord.NotFound:
+                pass
+            return 1
+
+    results = await asyncio.gather(*(remove(channel, False) for channel in channels if channel),
+                                   *(remove(channel, True) for channel in voice_channels if channel))
+    return sum(results)
+
+async def _delete_round_games(guild_id: int, round_number: int, games: list) -> str:
+    """
+    Removes the channels of some games of a round concurrently, at most
+    TEARDOWN_CONCURRENCY requests at a time, then deletes the games with
+    their maps, vetoes and picks in a single transaction.
+    Returns the timings of the round.
+    """
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(bot.TEARDOWN_CONCURRENCY)
+    removed = await asyncio.gather(*(_teardown_game_channels(game, semaphore) for game in games))
+    discord_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    game_ids = [game.id for game in games]
+    bot.game_service.delete_games(game_ids)
+    bot.name_index.invalidate("game_type", guild_id)
+    for game in games:
+        bot.game_map_service.invalidate_game(game_id=game.id)
+        bot.match_config_service.delete_match_config(game.id)
+        bot.game_routes.pop(game.admin_game_channel_id, None)
+        bot.game_embeds.pop(game.id, None)
+    bot.tournament_round_service.refresh_round(guild_id=guild_id, round_number=round_number)
+    database_time = time.perf_counter() - start
+    return (f"Round {round_number}: {len(games)} games and {sum(removed)} channels removed in {discord_time:.2f}s, "
+            f"database in {database_time * 1000:.0f}ms.")
+
+async def _get_next_round(guild_id: int):
+    """
+    Returns the stage and number of the next round with the current round,
+    or None if the current round is not finished
+    """
+    current_round = bot.tournament_round_service.get_current_round(guild_id=guild_id)
+    teams_in_swiss = 0
+    if current_round is not None and current_round.stage == "swiss":
+        teams_in_swiss = bot.team_service.count_teams_in_swiss(
+            guild_id=guild_id, wins=bot.SWISS_WINS, losses=bot.SWISS_WINS)
+    stage = bot.tournament_format.next_stage(current_round=current_round, teams_in_swiss=teams_in_swiss)
+    if stage is None:
+        return None
+    round_number = 1 if current_round is None else current_round.round_number + 1
+    return stage, round_number, current_round
+
 async def _set_new_round(ctx):
     """
-    Checks if a new round have to be and creates the needed resources if true
+    Checks if a new round have to be and creates the needed resources if true.
+    If the round was already staged in background it is opened directly.
+    Returns the number and the created games of the round, None if there was none.
     """
     guild = ctx.guild
-    all_games_finished = bot.game_service.get_all_games_finished(guild_id=guild.id)
-    all_games = bot.game_service.get_all_games(guild_id=guild.id)
-    number_of_games_finished = len(all_games_finished)
-    number_of_games = len(all_games)
-    
-    game_type = ""
-    if number_of_games_finished == 0 and number_of_games == 0: # First round of swiss (swiss_1)
-        game_types = ["swiss_1"]
-    elif number_of_games_finished == 8 and number_of_games == 8: # Second round of swiss (swiss_2)
-        game_types = ["swiss_2"]
-    elif number_of_games_finished == 16 and number_of_games == 16: # Third round of swiss (swiss_3)
-        game_types = ["swiss_3"]
-    elif number_of_games_finished == 24 and number_of_games == 24: # Fourth round of swiss (swiss_4)
-        game_types = ["swiss_4"]
-    elif number_of_games_finished == 30 and number_of_games == 30: # Firth round of swiss (swiss_5)
-        game_types = ["swiss_5"]
-    elif number_of_games_finished == 33 and number_of_games == 33: # First knockout round (quarterfinal)
-        game_types = ["quarterfinal"]
-    elif number_of_games_finished == 37 and number_of_games == 37: # Second knockout round (semifinal)
-        game_types = ["semifinal"]
-    elif number_of_games_finished == 39 and number_of_games == 39: # Third knockout round (third_place and final)
-        game_types = ["third_place", "final"]
-    else:
-        return
-    for game_type in game_types:
-        await _create_games(ctx, game_type) 
-
-async def _random_games(ctx, teams: list[Team], game_type: str) -> list[Game]:
-    """Randomize the games for the given teams"""  
-    guild = ctx.guild  
-    # Shuffle the teams
-    random.shuffle(teams)
-    
-    # Create pairs of teams
+    async with _get_round_lock(guild.id):
+        next_round = await _get_next_round(guild_id=guild.id)
+        if next_round is None:
+            return None
+        stage, round_number, current_round = next_round
+        staged_round = bot.staged_rounds.pop(guild.id, None)
+        # Staging and creating are separate jobs so other guilds can run in between
+        if staged_round is None or staged_round["round_number"] != round_number:
+            staged_round = await bot.guild_scheduler.run(guild.id, _stage_round(
+                ctx, stage=stage, round_number=round_number, previous_round=current_round))
+        games = await bot.guild_scheduler.run(guild.id, _create_games(ctx, staged_round))
+        if len(games) == 0:
+            return None
+        return round_number, games
+
+async def _stage_round(ctx, stage: str, round_number: int, previous_round: TournamentRound) -> dict:
+    """
+    Pairs the teams of the next round and prepares their channels, messages
+    and categories, everything but creating the games.
+    """
+    guild = ctx.guild
+    games = await _get_round_games(ctx, stage=stage, round_number=round_number, previous_round=previous_round)
+    plans = []
+    for game in games:
+        category_name = bot.tournament_format.category_name(game.game_type, round_number)
+        if discord.utils.get(guild.categories, name=category_name) is None:
+            await _create_server_category(
+                ctx, category_name=category_name, category_position=len(guild.categories),
+                overwrites=discord.utils.get(guild.categories, name="Info").overwrites)
+        plans.append(await _plan_game(ctx, game))
+    return {"stage": stage, "round_number": round_number, "games": games, "plans": plans}
+
+async def _prepare_next_round(guild_id: int):
+    """
+    Stages the next round in background once the current one is finished.
+    With AUTO_ADVANCE=auto the round is opened, with AUTO_ADVANCE=confirm
+    the admins are asked to run !finish_round to open it.
+    """
+    try:
+        ctx = _get_admin_context(guild_id=guild_id)
+        async with _get_round_lock(guild_id):
+            next_round = await _get_next_round(guild_id=guild_id)
+            if next_round is None or guild_id in bot.staged_rounds:
+                return
+            stage, round_number, current_round = next_round
+            generation = bot.staging_generations.get(guild_id, 0)
+            staged_round = await bot.guild_scheduler.run(guild_id, _stage_round(
+                ctx, stage=stage, round_number=round_number, previous_round=current_round))
+            # Results, teams or rosters changed while pairing, !finish_round pairs it again
+            if len(staged_round["games"]) == 0 or bot.staging_generations.get(guild_id, 0) != generation:
+                return
+            bot.staged_rounds[guild_id] = staged_round
+        if bot.AUTO_ADVANCE == "auto":
+            await ctx.send(f"All games finished, opening round {round_number}.")
+            await _set_new_round(ctx)
+        else:
+            await ctx.send(f"✅ All games finished. Round {round_number} is ready with {len(staged_round['games'])} games, run `!finish_round` to open it.")
+    except Exception as e:
+        logging.error(f"Error preparing next round: {e}", exc_info=True)
+
+async def _get_round_games(ctx, stage: str, round_number: int, previous_round: TournamentRound) -> list[Game]:
+    """
+    Pairs the teams of the new round based on the stage
+    """
+    guild = ctx.guild
+    tournament_format = bot.tournament_format
     games = []
-    for i in range(0, len(teams), 2):
-        if i + 1 < len(teams):  # Safety check
-            game = Game(
-                game_type=game_type, 
-                guild_id=guild.id,
-                team_one_id = teams[i].id,
-                team_two_id=teams[i+1].id
-            )
-            games.append(game)
-            
+    if stage == "swiss":
+        teams = bot.team_service.get_teams_in_swiss(guild_id=guild.id, wins=bot.SWISS_WINS, losses=bot.SWISS_WINS)
+        played = bot.game_service.get_played_pairs(guild_id=guild.id)
+        pairs = tournament_format.swiss_pairings(teams, played)
+        if pairs is None:
+            await ctx.send("❌ Teams cannot be paired, there is a record with an odd number of teams.")
+            return games
+        for team_one, team_two in pairs:
+            game_type = tournament_format.swiss_game_type(round_number, team_one.swiss_wins, team_one.swiss_losses)
+            games.append(Game(game_type=game_type, guild_id=guild.id, round_number=round_number,
+                              team_one_id=team_one.id, team_two_id=team_two.id))
+        return games
+
+    if previous_round.stage == "swiss":
+        # First playoff round, qualified teams are drawn randomly
+        teams = bot.team_service.get_teams_qualified(guild_id=guild.id, wins=bot.SWISS_WINS)
+        random.shuffle(teams)
+        team_ids = [team.id for team in teams]
+        loser_ids = []
+    else:
+        # Winners of consecutive games of the previous round face each other
+        previous_games = bot.game_service.get_games_by_round(guild_id=guild.id, round_number=previous_round.round_number)
+        team_ids = [game.team_winner for game in previous_games]
+        loser_ids = [game.team_two_id if game.team_winner == game.team_one_id else game.team_one_id
+                     for game in previous_games]
+
+    game_type = tournament_format.playoff_game_type(len(team_ids) // 2)
+    for i in range(0, len(team_ids) - 1, 2):
+        games.append(Game(game_type=game_type, guild_id=guild.id, round_number=round_number,
+                          team_one_id=team_ids[i], team_two_id=team_ids[i + 1]))
+    if stage == "final" and len(loser_ids) == 2:
+        games.insert(0, Game(game_type="third_place", guild_id=guild.id, round_number=round_number,
+                             team_one_id=loser_ids[0], team_two_id=loser_ids[1]))
     return games
 
-async def _create_game(ctx, game: Game, category: discord.CategoryChannel):
+async def _plan_game(ctx, game: Game) -> dict:
     """
-    Create a game with its type and so on
+    Prepares everything needed for creating the channels and messages of a game
+    without calling Discord, so it can be done before the round is opened.
     """
     guild = ctx.guild
     team_one = bot.team_service.get_team_by_id(game.team_one_id)
@@ -1191,8 +1948,10 @@ async def _create_game(ctx, game: Game, category: discord.CategoryChannel):
         await ctx.send(f"❌ Missing required roles: {', '.join(missing)}")
         return None
     
-    # Create admin channel
-    admin_overwrites = {
+    plan = {"team_one": team_one, "team_two": team_two}
+
+    # Admin channel
+    plan["admin_overwrites"] = {
         guild.default_role: discord.PermissionOverwrite(read_messages=False),
         guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True),
         roles["admin"]: discord.PermissionOverwrite(read_messages=True, send_messages=True),
@@ -1203,23 +1962,18 @@ async def _create_game(ctx, game: Game, category: discord.CategoryChannel):
         roles["team_two_coach"]: discord.PermissionOverwrite(read_messages=True, send_messages=False),
         roles["team_two_player"]: discord.PermissionOverwrite(read_messages=True, send_messages=False)
     }
+    plan["admin_channel_name"] = f"ADMINS {team_one.name} vs {team_two.name}"
 
-    admin_channel_name = f"ADMINS {team_one.name} vs {team_two.name}"
-    admin_channel = await _create_text_channel(ctx, channel_name=admin_channel_name, overwrites=admin_overwrites, category=category)
-    await admin_channel.send(f"This channel will be used for communicating between org and teams on this game, remember that only admins and users with role {team_one.name}_captain and {team_two.name}_captain can write in this channel.")
-
-    # Create public channel
-    public_overwrites = {
+    # Public channel
+    plan["public_overwrites"] = {
         guild.default_role: discord.PermissionOverwrite(read_messages=True, send_messages=False),
         guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True),
         roles["admin"]: discord.PermissionOverwrite(read_messages=True, send_messages=True)
     }
+    plan["game_channel_name"] = f"{team_one.name} vs {team_two.name}"
 
-    game_channel_name = f"{team_one.name} vs {team_two.name}"
-    public_channel = await _create_text_channel(ctx, channel_name=game_channel_name, overwrites=public_overwrites, category=category)
-
-    # Create voice channels
-    voice1_overwrites = {
+    # Voice channels
+    plan["voice1_overwrites"] = {
         guild.default_role: discord.PermissionOverwrite(connect=False),
         guild.me: discord.PermissionOverwrite(connect=True, speak=True),
         roles["admin"]: discord.PermissionOverwrite(connect=True, speak=True),
@@ -1228,7 +1982,7 @@ async def _create_game(ctx, game: Game, category: discord.CategoryChannel):
         roles["team_one_player"]: discord.PermissionOverwrite(connect=True, speak=True)
     }
     
-    voice2_overwrites = {
+    plan["voice2_overwrites"] = {
         guild.default_role: discord.PermissionOverwrite(connect=False),
         guild.me: discord.PermissionOverwrite(connect=True, speak=True),
         roles["admin"]: discord.PermissionOverwrite(connect=True, speak=True),
@@ -1236,17 +1990,53 @@ async def _create_game(ctx, game: Game, category: discord.CategoryChannel):
         roles["team_two_coach"]: discord.PermissionOverwrite(connect=True, speak=True),
         roles["team_two_player"]: discord.PermissionOverwrite(connect=True, speak=True)
     }
+
+    # Embeds, the game has no picks, bans nor maps yet
+    plan["embed"] = await _game_embed(game)
+
+    embed = discord.Embed(title=f"{team_one.name} vs {team_two.name} picks, bans and maps", color=discord.Color.blue())
+    game_to_wins = await _get_game_to_wins(game=game)
+    embed.description = f"Game between {team_one.name} vs {team_two.name} of type {game_to_wins}.\n"
     
-    voice1 = await category.create_voice_channel(team_one.name, overwrites=voice1_overwrites)
+    embed.add_field(name="Waiting", value="Waiting the admin to execute `!start_live_game`", inline=False)
+    not_live_message = """
+                    You can manually set picks, vetoes and map_results.
+                    Use `!map_vetoed <team1|team2> <map_name>` for vetoing a map.
+                    Use `!map_picked <team1|team2|decider> <map_name>` for picking a map.
+                    Use `!map_result <team1_score> <team2_score>` for setting the current map score.
+                    """
+    embed.add_field(name="Not live", value=not_live_message, inline=False)
+    plan["admin_embed"] = embed
+    return plan
+
+async def _create_game(ctx, game: Game, category: discord.CategoryChannel, plan: dict = None):
+    """
+    Create a game with its type and so on
+    """
+    guild = ctx.guild
+    if plan is None:
+        plan = await _plan_game(ctx, game)
+    if plan is None:
+        return None
+    team_one = plan["team_one"]
+    team_two = plan["team_two"]
+
+    # Create admin channel
+    admin_channel = await _create_text_channel(ctx, channel_name=plan["admin_channel_name"], overwrites=plan["admin_overwrites"], category=category)
+
+    # Create public channel
+    public_channel = await _create_text_channel(ctx, channel_name=plan["game_channel_name"], overwrites=plan["public_overwrites"], category=category)
+
+    # Create voice channels
+    voice1 = await bot.channel_pool.acquire_voice_channel(guild, category, team_one.name, plan["voice1_overwrites"])
     channel = Channel(guild_id=guild.id, channel_name=team_one.name, channel_id=voice1.id)
     bot.channel_service.create_channel(channel=channel)
 
-    voice2 = await category.create_voice_channel(team_two.name, overwrites=voice2_overwrites)
+    voice2 = await bot.channel_pool.acquire_voice_channel(guild, category, team_two.name, plan["voice2_overwrites"])
     channel = Channel(guild_id=guild.id, channel_name=team_two.name, channel_id=voice2.id)
     bot.channel_service.create_channel(channel=channel)
 
-    embed = await _game_embed(game)
-    msg = await public_channel.send(embed=embed)
+    msg = await public_channel.send(embed=plan["embed"])
 
     game.admin_game_channel_id = admin_channel.id
     game.game_channel_id = public_channel.id
@@ -1257,118 +2047,75 @@ async def _create_game(ctx, game: Game, category: discord.CategoryChannel):
     game.result_button_message_id = -1
 
     game.id = bot.game_service.create_game(game)
-
-    embed = discord.Embed(title=f"{team_one.name} vs {team_two.name} picks, bans and maps", color=discord.Color.blue())
-    game_to_wins = await _get_game_to_wins(game=game)
-    embed.description = f"Game between {team_one.name} vs {team_two.name} of type {game_to_wins}.\n"
-    
-    embed.add_field(name="Waiting", value="Waiting the admin to execute `!start_live_game`", inline=False)
-    not_live_message = """
-                    You can manually set picks, vetoes and map_results.
-                    Use `!map_vetoed <team1|team2> <map_name>` for vetoing a map.
-                    Use `!map_picked <team1|team2|decider> <map_name>` for picking a map.
-                    Use `!map_result <team1_score> <team2_score>` for setting the current map score.
-                    """
-    embed.add_field(name="Not live", value=not_live_message, inline=False)
-    msg = await admin_channel.send(embed=embed)
+    bot.name_index.add("game_type", game.guild_id, [game.game_type])
+    bot.game_routes[admin_channel.id] = game.id
+
+    # The welcome text goes along with the admin embed and the veto, pick and
+    # result controls, in a single message
+    msg = await admin_channel.send(f"This channel will be used for communicating between org and teams on this game, remember that only admins and users with role {team_one.name}_captain and {team_two.name}_captain can write in this channel.",
+                                   embed=plan["admin_embed"], view=_game_controls_view(game, team_one, team_two))
+    game.admin_pick_veto_button_message_id = msg.id
+    game.result_button_message_id = msg.id
     bot.game_service.update_game(game)
 
-async def _create_games(ctx, game_type: str):
+async def _create_games(ctx, staged_round: dict) -> list[Game]:
     """
-    Get games and create them
+    Create the games of a staged round and returns the created ones
     """
-    games = []
     guild = ctx.guild
-    if game_type == "swiss_1":
-        teams = bot.team_service.get_all_teams(guild_id=guild.id)
-        games += await _random_games(ctx, teams=teams, game_type=game_type)
-        game_category_name = "Swiss stage round 1"
-    if game_type == "swiss_2":
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=1,losses=0)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_high")
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=0,losses=1)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_low")
-        game_category_name = "Swiss stage round 2"
-    if game_type == "swiss_3":
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=2,losses=0)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_high")
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=1,losses=1)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_mid")
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=0,losses=2)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_low")
-        game_category_name = "Swiss stage round 3"
-    if game_type == "swiss_4":
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=2,losses=1)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_high")
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=1,losses=2)
-        games += await _random_games(ctx, teams=teams, game_type=f"{game_type}_low")
-        game_category_name = "Swiss stage round 4"
-    if game_type == "swiss_5":
-        teams = bot.team_service.get_teams_by_record(guild_id=guild.id, wins=2,losses=2)
-        games += await _random_games(ctx, teams=teams, game_type=game_type)
-        game_category_name = "Swiss stage round 5"        
-    if game_type == "quarterfinal":
-        teams = bot.team_service.get_teams_quarterfinalist(guild_id=guild.id)
-        games += await _random_games(ctx, teams=teams, game_type=game_type)
-        game_category_name = "Quarterfinals"       
-    if game_type == "semifinal":
-        teams = bot.team_service.get_teams_semifinalist(guild_id=guild.id)
-        games += await _random_games(ctx, teams=teams, game_type=game_type)
-        game_category_name = "Semifinals"
-    if game_type == "final":
-        teams = bot.team_service.get_teams_finalist(guild_id=guild.id)
-        games += await _random_games(ctx, teams=teams, game_type=game_type)
-        game_category_name = "Final"
-    if game_type == "third_place":
-        teams = bot.team_service.get_teams_third_place(guild_id=guild.id)
-        games += await _random_games(ctx, teams=teams, game_type=game_type)
-        game_category_name = "Third Place"
-    
-    discord_game_category = discord.utils.get(guild.categories, name=game_category_name)
-    for game in games:
-        await _create_game(ctx, game, category=discord_game_category)
-    await _tournament_summary(guild_id=guild.id)
+    round_number = staged_round["round_number"]
+    games = staged_round["games"]
+
+    for game, plan in zip(games, staged_round["plans"]):
+        if plan is None:
+            continue
+        category_name = bot.tournament_format.category_name(game.game_type, round_number)
+        discord_game_category = discord.utils.get(guild.categories, name=category_name)
+        await _create_game(ctx, game, category=discord_game_category, plan=plan)
+    games = [game for game in games if game.id is not None]
+    if len(games) == 0:
+        return games
+
+    tournament_round = TournamentRound(guild_id=guild.id, round_number=round_number, stage=staged_round["stage"],
+                                       total_games=len(games))
+    bot.tournament_round_service.create_tournament_round(tournament_round)
+    await _build_match_configs(games)
+    pool_report = bot.channel_pool.take_report(guild.id)
+    _enqueue([
+        _outbox_tournament_summary(guild.id),
+        _outbox_send(guild.id, ctx.channel.id,
+                     f"♻️ Voice channels since the last round: {pool_report['reused']} reused and "
+                     f"{pool_report['created']} created, {pool_report['parked']} parked and {pool_report['deleted']} deleted. "
+                     f"{pool_report['reused'] + pool_report['parked']} channel creations and deletions avoided."),
+    ])
+    return games
 
 async def _tournament_summary(guild_id: int):
     """
     Creates tournament summary
     """
     game_rounds = [
-        ("swiss_1", "Swiss round 1 (0 Wins, 0 Losses)"),
-        ("swiss_2_high", "Swiss round 2 high (1 Win, 0 Losses)"),
-        ("swiss_2_low", "Swiss round 2 low (0 Wins, 1 Loss)"),
-        ("swiss_3_high", "Swiss round 3 high (2 Wins, 0 Losses)"),
-        ("swiss_3_mid", "Swiss round 3 mid (1 Win, 1 Loss)"),
-        ("swiss_3_low", "Swiss round 3 low (0 Wins, 2 Losses)"),
-        ("swiss_4_high", "Swiss round 4 high (2 Wins, 1 Losses)"),
-        ("swiss_4_low", "Swiss round 4 low (1 Win, 2 Losses)"),
-        ("swiss_5", "Swiss round 5 (2 Wins, 2 Losses)"),
-        ("quarterfinal", "Quarter-final"),
-        ("semifinal", "Semi-final"),
-        ("third_place", "Third place"),
-        ("final", "Final")
-    ] 
+        (game_type, bot.tournament_format.title(game_type))
+        for game_type in bot.game_service.get_game_types(guild_id=guild_id)
+    ]
     discord_summary_channel_id = (bot.channel_service.get_channel_by_name(channel_name="summary", guild_id=guild_id)).channel_id
     discord_summary_channel = bot.get_channel(discord_summary_channel_id)
 
+    # One query for the results of all the games, grouped by game type
+    game_results = {}
+    for game_result in bot.game_service.get_game_results(guild_id=guild_id):
+        game_results.setdefault(game_result.game_type, []).append(game_result)
+
     for game_round, title in game_rounds:
         embed = discord.Embed(title=title, color=discord.Color.blue())
-        games = bot.game_service.get_games_by_type(game_type=game_round, guild_id=guild_id)
+        games = game_results.get(game_round, [])
         if len(games) > 0:
             text = ""
             for game in games:
-                team_one = bot.team_service.get_team_by_id(team_id=game.team_one_id)
-                team_two = bot.team_service.get_team_by_id(team_id=game.team_two_id)
-                team_one_name = team_one.name
-                team_two_name = team_two.name
-                game_maps = bot.game_map_service.get_all_game_maps_by_game(guild_id=guild_id, game_id=game.id)
-                team_one_wins = 0
-                team_two_wins = 0
-                for game_map in game_maps:
-                    if game_map.team_id_winner == team_one.id:
-                        team_one_wins = team_one_wins + 1
-                    elif game_map.team_id_winner == team_two.id:
-                        team_two_wins = team_two_wins + 1
+                team_one_name = game.team_one_name
+                team_two_name = game.team_two_name
+                team_one_wins = game.team_one_wins
+                team_two_wins = game.team_two_wins
                 games_to_wins = await _get_game_to_wins(game)
                 game_winner = None
                 if games_to_wins == "bo1":
@@ -1405,16 +2152,49 @@ async def _tournament_summary(guild_id: int):
                 msg = await discord_summary_channel.fetch_message(summary.message_id)
                 await msg.edit(embed=embed)
 
+async def _get_standings(guild_id: int) -> list:
+    """
+    Gets the standings ordered by wins, losses, buchholz, map difference and
+    round difference. Teams tied on all of them are ordered by their games
+    won minus lost against the other teams of the tie.
+    """
+    standings = bot.standing_service.get_standings(guild_id=guild_id)
+    key = lambda s: (s.wins, s.losses, s.buchholz, s.map_difference, s.round_difference)
+    ranked = []
+    for _, group in itertools.groupby(standings, key=key):
+        group = list(group)
+        if len(group) > 1:
+            head_to_head = bot.standing_service.get_head_to_head([standing.team_id for standing in group])
+            group.sort(key=lambda standing: -head_to_head[standing.team_id])
+        ranked += group
+    return ranked
+
+async def _standings_embed(guild_id: int) -> discord.Embed:
+    """
+    Creates the standings embed
+    """
+    embed = discord.Embed(title="Swiss stage standings", color=discord.Color.blue())
+    standings = await _get_standings(guild_id=guild_id)
+    if len(standings) == 0:
+        embed.description = "_No teams yet_"
+        return embed
+    text = f"{'#':>2} {'Team':<16} {'W-L':>5} {'Maps':>5} {'Rounds':>6} {'Buch':>4}\n"
+    for position, standing in enumerate(standings, start=1):
+        text += (f"{position:>2} {standing.team_name[:16]:<16} {standing.wins:>2}-{standing.losses:<2} "
+                 f"{standing.map_difference:>+5} {standing.round_difference:>+6} {standing.buchholz:>+4}\n")
+    embed.description = f"```\n{text}```"
+    return embed
+
 async def _get_game_to_wins(game: Game) -> str:
     """
     Have to return if the game is bo1, bo3 or bo5
     """
     game_type = game.game_type
-    if game_type == "swiss_1" or game_type == "swiss_2_high" or game_type == "swiss_2_low" or game_type == "swiss_3_low" or game_type == "swiss_3_mid":
+    if game_type.startswith("swiss_"):
+        if bot.tournament_format.is_decider(game_type):
+            return bot.SWISS_DECIDER
         return bot.SWISS_NOT_DECIDER
-    if game_type == "swiss_3_high" or game_type == "swiss_4_high" or game_type == "swiss_4_low" or game_type == "swiss_5":
-        return bot.SWISS_DECIDER
-    if game_type == "quarterfinal":
+    if game_type == "quarterfinal" or game_type.startswith("round_of_"):
         return bot.QUARTERFINAL_ROUND
     if game_type == "semifinal":
         return bot.SEMIFINAL_ROUND
@@ -1425,58 +2205,59 @@ async def _get_game_to_wins(game: Game) -> str:
 
 async def _game_embed(game: Game) -> discord.Embed:
     """
-    Creates the summary embed for a game
+    Creates the summary embed for a game.
+    The embed is memoized until the vetoes, picks or maps of the game
+    change, so callers must not modify it.
     """
+    version = bot.game_versions.get(game.id) if game.id is not None else None
+    memoized = bot.game_embeds.get(game.id)
+    if memoized is not None and memoized[0] == version:
+        return memoized[1]
 
     game_to_wins = await _get_game_to_wins(game)
-    
-    team_one = bot.team_service.get_team_by_id(game.team_one_id)
-    team_two = bot.team_service.get_team_by_id(game.team_two_id)
-    vetoes = bot.veto_service.get_all_vetoes_by_game(guild_id=game.guild_id, game_id=game.id)
-    picks = bot.pick_service.get_all_picks_by_game(guild_id=game.guild_id, game_id=game.id)
-    game_maps = bot.game_map_service.get_all_game_maps_by_game(guild_id=game.guild_id, game_id=game.id)
 
-    embed = discord.Embed(title=f"{team_one.name} vs {team_two.name} picks, bans and maps", color=discord.Color.blue())
-    embed.description = f"Game between {team_one.name} vs {team_two.name} of type {game_to_wins}.\n"
-    
-    # Get picks and bans order
-    # Normalize both to a unified list with a common 'order'
-    combined = [
-        {"type": "veto", "order": veto.order_veto, "team_id": veto.team_id, "object": veto}
-        for veto in vetoes
-    ] + [
-        {"type": "pick", "order": pick.order_pick, "team_id": pick.team_id, "object": pick}
-        for pick in picks
-    ]
+    # Games not created yet have no actions
+    actions = bot.game_service.get_game_actions(game_id=game.id) if game.id is not None else []
+    if len(actions) > 0:
+        team_one_name = actions[0].team_one_name
+        team_two_name = actions[0].team_two_name
+    else:
+        team_one_name = bot.team_service.get_team_by_id(game.team_one_id).name
+        team_two_name = bot.team_service.get_team_by_id(game.team_two_id).name
+    picks_and_bans = [action for action in actions if action.kind in ("veto", "pick")]
+    game_maps = [action for action in actions if action.kind == "map"]
 
-    # Sort by order
-    combined_sorted = sorted(combined, key=lambda x: x["order"])
+    embed = discord.Embed(title=f"{team_one_name} vs {team_two_name} picks, bans and maps", color=discord.Color.blue())
+    embed.description = f"Game between {team_one_name} vs {team_two_name} of type {game_to_wins}.\n"
+    
+    # Picks and bans come ordered from the query
     text = ""
-    for entry in combined_sorted:
-        if entry['team_id'] == team_one.id:
-            text += f"{entry['order']}.- {team_one.name} {entry['type'].capitalize()} {entry['object'].map_name}.\n"
-        elif entry['team_id'] == team_two.id:
-            text += f"{entry['order']}.- {team_two.name} {entry['type'].capitalize()} {entry['object'].map_name}.\n"
+    for action in picks_and_bans:
+        if action.team_id == game.team_one_id:
+            text += f"{action.number}.- {team_one_name} {action.kind.capitalize()} {action.map_name}.\n"
+        elif action.team_id == game.team_two_id:
+            text += f"{action.number}.- {team_two_name} {action.kind.capitalize()} {action.map_name}.\n"
         else:
-            text += f"{entry['order']}.- Decider map will be {entry['object'].map_name}."
-    if len(combined_sorted) == 0:
+            text += f"{action.number}.- Decider map will be {action.map_name}."
+    if len(picks_and_bans) == 0:
         text = "No picks and bans already."
     embed.add_field(name="Picks and bans", value=text, inline=False)
     
     # Set game maps
     text = ""
-    bot.game_map_service.get_all_game_maps_by_game(guild_id=game.guild_id, game_id=game.id)
     for game_map in game_maps:
-        if game_map.team_id_winner == team_one.id:
-            text += f"{game_map.game_number}.- {team_one.name} won {game_map.map_name}.\n"
-        elif game_map.team_id_winner == team_two.id:
-            text += f"{game_map.game_number}.- {team_two.name} won {game_map.map_name}.\n"
+        if game_map.team_id == game.team_one_id:
+            text += f"{game_map.number}.- {team_one_name} won {game_map.map_name}.\n"
+        elif game_map.team_id == game.team_two_id:
+            text += f"{game_map.number}.- {team_two_name} won {game_map.map_name}.\n"
         else:
-            text += f"{game_map.game_number}.- {game_map.map_name} have not been played.\n"
+            text += f"{game_map.number}.- {game_map.map_name} have not been played.\n"
     if len(game_maps) == 0:
         text = "No game maps picked already."
     embed.add_field(name="Game maps", value=text, inline=False)
 
+    if version is not None:
+        bot.game_embeds[game.id] = (version, embed)
     return embed
 
 async def _game_summary(game: Game):
@@ -1484,15 +2265,61 @@ async def _game_summary(game: Game):
     Creates a game summary
     """
     public_channel = bot.get_channel(game.game_channel_id)
+    if public_channel is None:
+        return
     embed = await _game_embed(game)
-    if public_channel:
-        try:
-            msg = await public_channel.fetch_message(game.public_game_message_id)
-            await msg.edit(embed=embed)
-        except Exception as e:
-            print(f"⚠️ Error on sending msg: {e}")
+    # Edits the message by id, without fetching it first
+    await public_channel.get_partial_message(game.public_game_message_id).edit(embed=embed)
 
-async def _set_result(game: Game, team_number: int, map_name: str):
+def _outbox_send(guild_id: int, channel_id: int, content: str, priority: int = PRIORITY_NORMAL) -> OutboxMessage:
+    """
+    Outbox message sending a text message to a channel. Consecutive text
+    messages to a channel are delivered as one message.
+    """
+    return OutboxMessage(guild_id=guild_id, kind="send", route=f"channel:{channel_id}", priority=priority,
+                         payload=json.dumps({"channel_id": channel_id, "content": content}))
+
+def _outbox_game_summary(game: Game) -> OutboxMessage:
+    """
+    Outbox message editing the public embed of a game. Only the last edit
+    of a game waiting in the outbox is delivered.
+    """
+    return OutboxMessage(guild_id=game.guild_id, kind="game_embed", route=f"channel:{game.game_channel_id}",
+                         coalesce_key=f"game_embed:{game.id}", payload=json.dumps({"game_id": game.id}))
+
+def _outbox_tournament_summary(guild_id: int) -> OutboxMessage:
+    """
+    Outbox message refreshing the tournament summary of a guild. Only the
+    last refresh waiting in the outbox is delivered.
+    """
+    return OutboxMessage(guild_id=guild_id, kind="tournament_summary", route=f"summary:{guild_id}",
+                         coalesce_key=f"summary:{guild_id}", payload=json.dumps({"guild_id": guild_id}))
+
+def _outbox_park_channel(guild_id: int, channel_id: int) -> OutboxMessage:
+    """
+    Outbox message moving a voice channel to the channel pool
+    """
+    return OutboxMessage(guild_id=guild_id, kind="park_channel", route=f"channel:{channel_id}",
+                         payload=json.dumps({"channel_id": channel_id}))
+
+async def _send_text(destination, content: str):
+    """
+    Sends a text message, attaching it as a file when it is over the 2000
+    characters limit of Discord
+    """
+    if len(content) <= 2000:
+        return await destination.send(content)
+    file = discord.File(io.BytesIO(content.encode()), filename="message.txt")
+    return await destination.send(f"📄 Message of {len(content)} characters attached as a file.", file=file)
+
+def _enqueue(outbox_messages: list):
+    """
+    Writes outbox messages not tied to a state change and wakes the dispatcher up
+    """
+    bot.outbox_service.create_outbox_messages(outbox_messages)
+    bot.outbox_event.set()
+
+async def _set_result(game: Game, team_number: int, map_name: str, team1_score: int = 0, team2_score: int = 0):
     """
     Sets the winner on a game map
     """
@@ -1519,16 +2346,21 @@ async def _set_result(game: Game, team_number: int, map_name: str):
         await admin_channel.send(f"The map {map_name} is not one of the game.")
         return
     game_map.team_id_winner = team_winner.id
-    bot.game_map_service.update_game_map(game_map)
-    await admin_channel.send(f"{team_winner.name} won map number {game_map.game_number} played in {map_name}.")
+    # Discord is updated by the outbox dispatcher, from messages written with the result
+    outbox = [
+        _outbox_send(guild_id, game.admin_game_channel_id,
+                     f"{team_winner.name} won map number {game_map.game_number} played in {map_name}."),
+        _outbox_game_summary(game),
+    ]
 
     game_maps = bot.game_map_service.get_all_game_maps_by_game(guild_id=guild_id, game_id=game.id)
     team_one_wins = 0
     team_two_wins = 0
-    for game_map in game_maps:
-        if game_map.team_id_winner == team_one.id:
+    for other_map in game_maps:
+        winner_id = team_winner.id if other_map.id == game_map.id else other_map.team_id_winner
+        if winner_id == team_one.id:
             team_one_wins = team_one_wins + 1
-        elif game_map.team_id_winner == team_two.id:
+        elif winner_id == team_two.id:
             team_two_wins = team_two_wins + 1
 
     games_to_wins = await _get_game_to_wins(game)
@@ -1548,16 +2380,20 @@ async def _set_result(game: Game, team_number: int, map_name: str):
             game_winner = team_one
         elif team_two_wins >= 3:
             game_winner = team_two
-    
+
     if game_winner is not None:
-        await admin_channel.send(f"The winner of the game is {game_winner.name}.")
         game.team_winner = game_winner.id
-        bot.game_service.update_game(game=game)
-        await _game_summary(game)
+        outbox += [
+            _outbox_send(guild_id, game.admin_game_channel_id, f"The winner of the game is {game_winner.name}."),
+            _outbox_game_summary(game),
+            _outbox_park_channel(guild_id, game.voice_channel_team_one_id),
+            _outbox_park_channel(guild_id, game.voice_channel_team_two_id),
+            _outbox_tournament_summary(guild_id),
+        ]
         if "swiss_" in game.game_type:
             team_winner.swiss_wins = team_winner.swiss_wins + 1
             team_looser.swiss_losses = team_looser.swiss_losses + 1
-            if team_winner.swiss_wins >= 3:
+            if team_winner.swiss_wins >= bot.SWISS_WINS:
                 team_winner.is_quarterfinalist = True
         if game.game_type == "quarterfinal":
             team_winner.is_semifinalist = True
@@ -1565,25 +2401,27 @@ async def _set_result(game: Game, team_number: int, map_name: str):
             team_winner.is_finalist = True
             team_looser.is_third_place = True
 
-        bot.team_service.update_team(team_winner)
-        bot.team_service.update_team(team_looser)
-        
-        voice_channel_team_one_name = team_one.name
-        voice_channel_team_one = bot.get_channel(game.voice_channel_team_one_id)
-        if voice_channel_team_one:
-            await voice_channel_team_one.delete()
-            
-        voice_channel_team_two = bot.get_channel(game.voice_channel_team_two_id)
-        if voice_channel_team_two:
-            await voice_channel_team_two.delete()
-        await _tournament_summary(guild_id=guild_id)
-    
-    await _game_summary(game=game)
+    # The map, the game, the round, the standings and the team records are written together
+    bot.result_service.record_result(
+        game_map, winner_id=team_winner.id, loser_id=team_looser.id, swiss=game.game_type.startswith("swiss_"),
+        round_difference=abs(team1_score - team2_score), outbox=outbox,
+        game=game if game_winner is not None else None, teams=[team_winner, team_looser])
+    bot.outbox_event.set()
+    _discard_staged_round(guild_id)
+
+    if game_winner is not None:
+        # Paired from the records saved above
+        if bot.AUTO_ADVANCE != "off":
+            current_round = bot.tournament_round_service.get_current_round(guild_id=guild_id)
+            if current_round.finished_games >= current_round.total_games:
+                _run_in_background(_prepare_next_round(guild_id=guild_id))
 
-async def _execute_rcon(game_server:GameServer, command: str) -> str : 
+async def _execute_rcon(game_server:GameServer, command: str, raise_errors: bool = False) -> str : 
     """
-    Sends rcon command to host
+    Sends rcon command to host.
+    Errors are returned as the response, or raised with `raise_errors`.
     """
+    from rcon.source import rcon
     try:    
         response = await rcon(
             command,
@@ -1592,6 +2430,8 @@ async def _execute_rcon(game_server:GameServer, command: str) -> str :
         return response
     except Exception as e:
         logging.error(f"Error on execute_rcon: {e}")
+        if raise_errors:
+            raise RuntimeError(f"rcon command failed on {game_server.ip}:{game_server.game_port}: {e}") from e
         return f"❌ Error on execute_rcon. Start manually the game on the server: {e}"
 
 async def _auto_veto(guild_id: int) -> list:
@@ -1700,46 +2540,56 @@ async def _send_result(matchid: int, map_number: int, winner_team: str) -> str:
     cmd = f"curl -X POST {url} -H \"Content-Type: application/json\" -d '{data}'"
     return cmd
 
-async def _get_teams_stats_from_json(datas: list) -> any: 
+async def _get_teams_stats_from_json(datas: list, guild_id: int) -> tuple:
     """
-    Gets team stats from a list of jsons
+    Gets team stats from a list of jsons. Players are matched to the
+    registered ones by steamid, so renamed players keep a single row with
+    their nickname and team. Players not registered in the guild, like
+    stand-ins, are kept under the team of the payload with their in-game name.
+    Returns the stats by team and the unknown players by steamid.
     """
+    players_by_steamid = bot.player_service.get_steamid_index(guild_id=guild_id)
     teams_data = {}
+    unknown_players = {}
     for data in datas:
         for team_key in ['team1', 'team2']:
             team = data[team_key]
             if not team:
                 continue
-            team_name = team['name']
-            if not team_name:
-                continue
-            if team_name not in teams_data:
-                teams_data[team_name] = {}
 
             for player in team['players']:
-                name = player['name']
+                steamid = str(player.get('steamid') or "")
                 stats = player['stats']
-                if not name:
+                registered = players_by_steamid.get(steamid)
+                registered_team = bot.team_service.get_team_by_id(registered.team_id) if registered else None
+                if registered_team is not None:
+                    team_name = registered_team.name
+                    name = registered.nickname
+                else:
+                    team_name = team['name']
+                    name = player['name']
+                    unknown_players[steamid] = name
+                if not team_name or not name:
                     continue
-                if name not in teams_data[team_name]:
-                    teams_data[team_name][name] = {
-                        "kills": 0,
-                        "deaths": 0,
-                        "damage": 0,
-                        "kast": 0,
-                        "matches": 0
-                    }
-                teams_data[team_name][name]["kills"] += stats.get("kills", 0)
-                teams_data[team_name][name]["deaths"] += stats.get("deaths", 0)
-                teams_data[team_name][name]["damage"] += stats.get("damage", 0)
-                teams_data[team_name][name]["kast"] += stats.get("kast", 0)
-                teams_data[team_name][name]["matches"] += 1
+                player_data = teams_data.setdefault(team_name, {}).setdefault(steamid or name, {
+                    "name": name,
+                    "kills": 0,
+                    "deaths": 0,
+                    "damage": 0,
+                    "kast": 0,
+                    "matches": 0
+                })
+                player_data["kills"] += stats.get("kills", 0)
+                player_data["deaths"] += stats.get("deaths", 0)
+                player_data["damage"] += stats.get("damage", 0)
+                player_data["kast"] += stats.get("kast", 0)
+                player_data["matches"] += 1
 
     # Construcción del resultado
     teams = []
     for team_name, players in teams_data.items():
         team_entry = {"name": team_name, "players": []}
-        for player_name, stats in players.items():
+        for stats in players.values():
             kills = stats["kills"]
             deaths = stats["deaths"]
             damage = stats["damage"]
@@ -1751,16 +2601,17 @@ async def _get_teams_stats_from_json(datas: list) -> any:
             adr = f"{(damage / deaths):.1f}" if deaths != 0 else "0.0"
             kast = f"{(kast_total / matches):.1f}%"
 
-            team_entry["players"].append((player_name, kd, diff, adr, kast))
+            team_entry["players"].append((stats["name"], kd, diff, adr, kast))
 
         teams.append(team_entry)
 
-    return teams
+    return teams, unknown_players
 
-async def _create_image_from_stats(datas: list) -> str:
+async def _create_image_from_stats(teams: list) -> str:
     """
     Creates an image to be sended to the public game channel for informaiton
     """
+    from PIL import Image, ImageDraw
     # Creates the base image
     width, height = 450, 450
     img = Image.new('RGB', (width, height), color=(36, 45, 60))
@@ -1777,8 +2628,7 @@ async def _create_image_from_stats(datas: list) -> str:
     column_titles = ["K-D", "+/-", "ADR", "KAST"]
     column_x = [150, 220, 270, 330, 390]
 
-    # Get stats and redraw with the values
-    teams = await _get_teams_stats_from_json(datas)
+    # Draw the values of the stats
     y_offset = 20
     for team in teams:
         draw.text((width // 2 - draw.textlength(team["name"]) // 2, y_offset),
@@ -1809,7 +2659,7 @@ async def _create_image_from_stats(datas: list) -> str:
     return output_path_centered
 
 # API paths
-@app.get('/match_configs/{file_name}')
+@api_route("GET", '/match_configs/{file_name}')
 async def match_configs_file(file_name: str):
     """
     Sends Matchzy match_config for configuring a match
@@ -1819,15 +2669,18 @@ async def match_configs_file(file_name: str):
         You may optionally provide an HTTP header and value pair using the header name and header value arguments. 
         You should put all arguments inside quotation marks (""). ("").
     """
-    # Read the corresponding JSON file
     try:
-        with open(f'/usr/src/app/match_configs/{file_name}', 'r') as f:
-            return json.loads(f.read())
-    except FileNotFoundError:
+        game = bot.game_service.get_game_by_id(game_id=int(file_name.removesuffix(".json")))
+    except ValueError:
+        game = None
+    if game is None:
         return {"error": "Match config file not found"}
+    config = await _get_match_config(game=game)
+    from fastapi import Response
+    return Response(content=config, media_type="application/json")
 
-@app.post('/match_logs/{game_id}')
-async def match_logs(game_id: str, request: Request):
+@api_route("POST", '/match_logs/{game_id}')
+async def match_logs(game_id: str, request: "Request"):
     """
     Receives logs from Matchzy events
     More info at:
@@ -1844,131 +2697,121 @@ async def match_logs(game_id: str, request: Request):
         random_filename = f"game_{game_id}_{str(uuid.uuid4())}.json"
         filepath = f'/usr/src/app/match_logs/{random_filename}'
 
-        game = bot.game_service.get_game_by_id(game_id=int(game_id))
-        team_one = bot.team_service.get_team_by_id(game.team_one_id) 
-        team_two = bot.team_service.get_team_by_id(game.team_two_id) 
-        public_channel = bot.get_channel(game.game_channel_id)
-        logging.error(f"public_channel.id: {public_channel.id})")
-        guild_id = game.guild_id
-
-        file = None
         # Save request body as JSON file
         data = await request.json()
         with open(filepath, "w") as f:
             json.dump(data, f, indent=4)
-        if data is None:
-            await public_channel.send("NONO")
-            return
-        
-        event_value = data.get('event')
 
-        logging.error(data)
-        
-        if event_value == "series_start":  # If series started, Send a message to start game
-            await public_channel.send("Starting game")          
-        elif event_value == "map_result": # If match finishes, set map finished and send the stats to public channel
-            winner = data.get('winner').get('team')
-            map_number = data.get('map_number') + 1
-            game_map = bot.game_map_service.get_by_game_id_game_number_game_map(game_id=game_id, game_number=map_number)
-            map_name = game_map.map_name
-            team_winner = None
-            team_looser = None
-            team_number = -1
-            if winner == "team1":
-                team_winner = team_one
-                team_looser = team_two
-                team_number = 1
-            else:
-                team_winner = team_two
-                team_looser = team_one
-                team_number = 2
-            team1_score = data.get('team1').get('score')
-            team2_score = data.get('team2').get('score')
-            message = f"""
-                        {team_winner.name} wins the map {map_number} - {map_name}.\n The result was {team1_score}:{team2_score}.
-                        """
-            image_path = await _create_image_from_stats([data])
-            file = discord.File(image_path, filename=os.path.basename(image_path))
-            await public_channel.send(message, file=file)
-            await _set_result(game=game, team_number=team_number, map_name = map_name)
-        elif event_value == "map_vetoed": # Set map vetoed
-            vetoer = data.get('team')
-            team_vetoer_id = -1
-            if vetoer == "team1":
-                team_vetoer_id = team_one.id
-            elif vetoer == "team2":
-                team_vetoer_id = team_two.id
-
-            vetoes = bot.veto_service.get_all_vetoes_by_game_id_only(game_id=game_id)
-            picks = bot.pick_service.get_all_picks_by_game_id_only(game_id=game_id)
-            
-            order_veto = len(vetoes)
-            order_pick = len(picks)
-            all_order = order_veto + order_pick
-            map_name = data.get('map_name')
-            veto = Veto(order_veto=all_order + 1, game_id=game_id, team_id=team_vetoer_id, map_name=map_name, guild_id=game.guild_id)
-            bot.veto_service.create_veto(veto)
-            embed = await _game_embed(game)
-            if public_channel:
-                try:
-                    msg = await public_channel.fetch_message(game.public_game_message_id)
-                    await msg.edit(embed=embed)
-                except Exception as e:
-                    await public_channel.send(f"⚠️ Veto added but failed to update display: {e}")
-        elif event_value == "map_picked": # Set map picked
-            picker = data.get('team')
-            team_picker_id = -1
-            if picker == "team1":
-                team_picker_id = team_one.id
-            elif picker == "team2":
-                team_picker_id = team_two.id
-
-            vetoes = bot.veto_service.get_all_vetoes_by_game_id_only(game_id=game_id)
-            picks = bot.pick_service.get_all_picks_by_game_id_only(game_id=game_id)
-            
-            order_veto = len(vetoes)
-            order_pick = len(picks)
-            all_order = order_veto + order_pick
-            map_name = data.get('map_name')
-            pick = Pick(order_pick=all_order + 1, game_id=game_id, team_id=team_picker_id, map_name=map_name, guild_id=game.guild_id)
-            bot.pick_service.create_pick(pick)
-            map_number = data.get('map_number')
-            game_map = GameMap(game_number=map_number, map_name=pick.map_name, game_id=game.id, team_id_winner=-1, guild_id=game.guild_id)
-            bot.game_map_service.create_game_map(game_map)             
-            embed = await _game_embed(game)
-            if public_channel:
-                try:
-                    msg = await public_channel.fetch_message(game.public_game_message_id)
-                    await msg.edit(embed=embed)
-                except Exception as e:
-                    await public_channel.send(f"⚠️ Pick added but failed to update display: {e}")
-        elif event_value == "series_end": # Set server free
-            game_server = bot.game_server_service.get_game_server_by_game_id(game_id)
-            await _execute_rcon(game_server=game_server, command="matchzy_loadmatch_url \"\"")
-            game_server.is_free = True
-            game_server.game_id = -1
-            bot.game_server_service.update_game_server(game_server)
-
-        else: # Else event is not accepted
-            logging.info(f"Event value not accepted: {event_value}")
-        await _tournament_summary(guild_id=guild_id)
+        if bot.RUN_MODE == "api":
+            # Discord is handled by the bot process
+            game = bot.game_service.get_game_by_id(game_id=int(game_id))
+            _send_to_bot("match_log", {"game_id": game_id, "data": data}, guild_id=game.guild_id)
+        else:
+            await _process_match_log(game_id=game_id, data=data)
         return {"message": "Log saved successfully", "filename": random_filename}
     except Exception as e:
         logging.error(f"Failed to save log: {str(e)}")
         return {"error": f"Failed to save log: {str(e)}"}
 
-@app.post('/match_demos/{game_id}')
-async def match_demos(game_id: str, request: Request):
+async def _process_match_log(game_id: str, data: dict):
+    """
+    Applies a Matchzy event to the game and updates Discord
+    """
+    game = bot.game_service.get_game_by_id(game_id=int(game_id))
+    team_one = bot.team_service.get_team_by_id(game.team_one_id) 
+    team_two = bot.team_service.get_team_by_id(game.team_two_id) 
+    public_channel = bot.get_channel(game.game_channel_id)
+    guild_id = game.guild_id
+
+    file = None
+    if data is None:
+        await public_channel.send("NONO")
+        return
+    
+    event_value = data.get('event')
+
+    logging.error(data)
+    
+    if event_value == "series_start":  # If series started, Send a message to start game
+        _enqueue([_outbox_send(guild_id, game.game_channel_id, "Starting game", priority=PRIORITY_PLAYER)])          
+    elif event_value == "map_result": # If match finishes, set map finished and send the stats to public channel
+        winner = data.get('winner').get('team')
+        map_number = data.get('map_number') + 1
+        game_map = bot.game_map_service.get_by_game_id_game_number_game_map(game_id=game_id, game_number=map_number)
+        map_name = game_map.map_name
+        team_winner = None
+        team_looser = None
+        team_number = -1
+        if winner == "team1":
+            team_winner = team_one
+            team_looser = team_two
+            team_number = 1
+        else:
+            team_winner = team_two
+            team_looser = team_one
+            team_number = 2
+        team1_score = data.get('team1').get('score')
+        team2_score = data.get('team2').get('score')
+        message = f"""
+                    {team_winner.name} wins the map {map_number} - {map_name}.\n The result was {team1_score}:{team2_score}.
+                    """
+        teams, unknown_players = await _get_teams_stats_from_json([data], guild_id=guild_id)
+        image_path = await _create_image_from_stats(teams)
+        file = discord.File(image_path, filename=os.path.basename(image_path))
+        await public_channel.send(message, file=file)
+        if unknown_players:
+            stand_ins = ", ".join(f"{name} ({steamid})" for steamid, name in unknown_players.items())
+            logging.info(f"Unregistered players in game {game.id} map {map_number}: {stand_ins}")
+            _enqueue([_outbox_send(guild_id, game.admin_game_channel_id,
+                                   f"⚠️ Players not registered in any team played map {map_number}: {stand_ins}")])
+        await _set_result(game=game, team_number=team_number, map_name = map_name,
+                          team1_score=team1_score, team2_score=team2_score)
+    elif event_value == "map_vetoed": # Set map vetoed
+        vetoer = data.get('team')
+        team_vetoer_id = -1
+        if vetoer == "team1":
+            team_vetoer_id = team_one.id
+        elif vetoer == "team2":
+            team_vetoer_id = team_two.id
+
+        map_name = data.get('map_name')
+        map_action = MapAction(guild_id=game.guild_id, game_id=game.id, action="veto", team_id=team_vetoer_id, map_name=map_name)
+        bot.map_action_service.create_map_action(map_action, outbox=[_outbox_game_summary(game)])
+        bot.outbox_event.set()
+    elif event_value == "map_picked": # Set map picked
+        picker = data.get('team')
+        team_picker_id = -1
+        if picker == "team1":
+            team_picker_id = team_one.id
+        elif picker == "team2":
+            team_picker_id = team_two.id
+
+        map_name = data.get('map_name')
+        map_action = MapAction(guild_id=game.guild_id, game_id=game.id, action="pick", team_id=team_picker_id, map_name=map_name)
+        map_number = data.get('map_number')
+        game_map = GameMap(game_number=map_number, map_name=map_name, game_id=game.id, team_id_winner=-1, guild_id=game.guild_id)
+        bot.game_map_service.create_game_map(game_map, map_action=map_action, outbox=[_outbox_game_summary(game)])
+        bot.outbox_event.set()
+    elif event_value == "series_end": # Set server free
+        game_server = bot.game_server_service.get_game_server_by_game_id(game_id)
+        await _execute_rcon(game_server=game_server, command="matchzy_loadmatch_url \"\"")
+        game_server.is_free = True
+        game_server.game_id = -1
+        bot.game_server_service.update_game_server(game_server)
+
+    else: # Else event is not accepted
+        logging.info(f"Event value not accepted: {event_value}")
+    _enqueue([_outbox_tournament_summary(guild_id)])
+
+@api_route("POST", '/match_demos/{game_id}')
+async def match_demos(game_id: str, request: "Request"):
     """
     Saves the demo from Matchzy
     More info at https://shobhit-pathak.github.io/MatchZy/gotv/
     """
     try:
-        game = bot.game_service.get_game_by_id(game_id=int(game_id))
-        public_channel = bot.get_channel(game.game_channel_id)
-
         # Create directory if it doesn't exist
-        os.makedirs('/usr/src/app/match_logs', exist_ok=True)
+        os.makedirs('/usr/src/app/match_demos', exist_ok=True)
 
         # Get filename from header
         filename = request.headers.get('MatchZy-FileName')
@@ -1978,26 +2821,388 @@ async def match_demos(game_id: str, request: Request):
         with open(filepath, 'wb') as f:
             contents = await request.body()
             f.write(contents)
-        map_name = (bot.game_map_service.get_by_game_id_game_number_game_map(game_id=game_id, game_number=game_number)).map_name
 
-        file = discord.File(filepath, filename=filename)
-        await public_channel.send(f"Demo - {map_name}:", file=file)
+        if bot.RUN_MODE == "api":
+            game = bot.game_service.get_game_by_id(game_id=int(game_id))
+            _send_to_bot("match_demo", {"game_id": game_id, "filename": filename, "game_number": game_number},
+                         guild_id=game.guild_id)
+        else:
+            await _process_match_demo(game_id=game_id, filename=filename, game_number=game_number)
 
         return {"message": "Demo received successfully"}
     except Exception as e:
         return {"error": f"Error writing demo file: {str(e)}"}
 
+async def _process_match_demo(game_id: str, filename: str, game_number: int):
+    """
+    Sends a saved demo to the public channel of the game
+    """
+    game = bot.game_service.get_game_by_id(game_id=int(game_id))
+    public_channel = bot.get_channel(game.game_channel_id)
+    map_name = (bot.game_map_service.get_by_game_id_game_number_game_map(game_id=game_id, game_number=game_number)).map_name
+
+    file = discord.File(f'/usr/src/app/match_demos/{filename}', filename=filename)
+    await public_channel.send(f"Demo - {map_name}:", file=file)
+
+@api_route("POST", '/start_live_games/{guild_id}')
+async def start_live_games_api(guild_id: int):
+    """
+    Starts all the not started games of the current round of a guild
+    and posts the report on the admin channel.
+    """
+    try:
+        if bot.RUN_MODE == "api":
+            _send_to_bot("start_live_games", {"guild_id": guild_id}, guild_id=guild_id)
+            return {"message": "Live games will be started by the bot, the report will be posted on the admin channel"}
+        report = await _process_start_live_games(guild_id=guild_id)
+        return {"message": report}
+    except Exception as e:
+        logging.error(f"Error starting live games: {e}")
+        return {"error": f"Error starting live games: {str(e)}"}
+
+async def _process_start_live_games(guild_id: int) -> str:
+    """
+    Starts the live games of a guild and posts the report on the admin channel
+    """
+    report = await bot.guild_scheduler.run(guild_id, _start_live_games(guild_id=guild_id))
+    admin_channel = bot.channel_service.get_channel_by_name(channel_name="admin", guild_id=guild_id)
+    if admin_channel is not None:
+        await _send_text(bot.get_channel(admin_channel.channel_id), report)
+    return report
+
+@api_route("GET", '/standings/{guild_id}')
+async def standings_api(guild_id: int):
+    """
+    Sends the swiss stage standings of a guild
+    """
+    standings = await _get_standings(guild_id=guild_id)
+    return [
+        {
+            "position": position,
+            "team": standing.team_name,
+            "wins": standing.wins,
+            "losses": standing.losses,
+            "map_difference": standing.map_difference,
+            "round_difference": standing.round_difference,
+            "buchholz": standing.buchholz,
+        }
+        for position, standing in enumerate(standings, start=1)
+    ]
+
+@api_route("POST", '/import_roster/{guild_id}')
+async def import_roster_api(guild_id: int, request: "Request", filename: str = "roster.json"):
+    """
+    Imports the roster file sent as the request body, its format is taken
+    from the filename query parameter, and posts the report on the admin channel.
+    """
+    try:
+        content = await request.body()
+        if bot.RUN_MODE == "api":
+            _send_to_bot("import_roster", {"guild_id": guild_id, "filename": filename,
+                                           "content": content.decode("utf-8")}, guild_id=guild_id)
+            return {"message": "The roster will be imported by the bot, the report will be posted on the admin channel"}
+        report = await _process_import_roster(guild_id=guild_id, filename=filename, content=content)
+        return {"message": report}
+    except Exception as e:
+        logging.error(f"Error importing roster: {e}")
+        return {"error": f"Error importing roster: {str(e)}"}
+
+async def _process_import_roster(guild_id: int, filename: str, content: bytes) -> str:
+    """
+    Imports a roster file on a guild and posts the report on the admin channel
+    """
+    ctx = _get_admin_context(guild_id)
+    report = await bot.guild_scheduler.run(guild_id, _import_roster(ctx, filename=filename, content=content))
+    await _send_text(ctx, report)
+    return report
+
+def _send_to_bot(kind: str, payload: dict, guild_id: int):
+    """
+    Queues an event for the bot process of the guild, used when the api runs in its own processes
+    """
+    bot.ipc_message_service.create_ipc_message(IpcMessage(kind=kind, payload=json.dumps(payload), guild_id=guild_id))
+
+async def _handle_ipc_message(ipc_message: IpcMessage):
+    """
+    Handles an event queued by an api process
+    """
+    payload = json.loads(ipc_message.payload)
+    if ipc_message.kind == "match_log":
+        await _process_match_log(game_id=payload["game_id"], data=payload["data"])
+    elif ipc_message.kind == "match_demo":
+        await _process_match_demo(game_id=payload["game_id"], filename=payload["filename"],
+                                  game_number=payload["game_number"])
+    elif ipc_message.kind == "start_live_games":
+        await _process_start_live_games(guild_id=payload["guild_id"])
+    elif ipc_message.kind == "import_roster":
+        await _process_import_roster(guild_id=payload["guild_id"], filename=payload["filename"],
+                                     content=payload["content"].encode("utf-8"))
+    else:
+        logging.error(f"Unknown ipc message kind: {ipc_message.kind}")
+
+async def _process_ipc_messages():
+    """
+    Polls the events queued by the api processes and handles them in arrival order
+    """
+    await bot.wait_until_ready()
+    while not bot.is_closed():
+        try:
+            guild_ids = [guild.id for guild in bot.guilds]
+            ipc_messages = bot.ipc_message_service.get_pending_ipc_messages(guild_ids=guild_ids) if guild_ids else []
+            for ipc_message in ipc_messages:
+                try:
+                    await _handle_ipc_message(ipc_message)
+                except Exception as e:
+                    # Kept for a retry or, once given up, for inspection
+                    attempts = ipc_message.attempts + 1
+                    if attempts < bot.IPC_MAX_ATTEMPTS:
+                        delay = bot.IPC_POLL_INTERVAL * 2 ** attempts
+                        logging.warning(f"Retrying ipc message {ipc_message.id} ({ipc_message.kind}) in {delay:.1f}s: {e}")
+                        bot.ipc_message_service.set_retry(ipc_message.id, attempts=attempts,
+                                                          next_attempt_at=time.time() + delay, error=str(e))
+                    else:
+                        logging.error(f"Error handling ipc message {ipc_message.id} ({ipc_message.kind}): {e}")
+                        bot.ipc_message_service.set_failed(ipc_message.id, attempts=attempts, error=str(e))
+                    continue
+                bot.ipc_message_service.set_processed(ipc_message.id)
+            if ipc_messages:
+                bot.ipc_message_service.delete_processed()
+        except Exception as e:
+            logging.error(f"Error polling ipc messages: {e}")
+        await asyncio.sleep(bot.IPC_POLL_INTERVAL)
+
+async def _deliver_outbox_batch(batch: list) -> str:
+    """
+    Applies a batch of outbox messages to Discord. Returns why the batch can
+    never be delivered, None once it is delivered.
+    Failed requests raise, rate limits are waited by discord.py itself.
+    """
+    outbox_message = batch[0]
+    payload = json.loads(outbox_message.payload)
+    if outbox_message.kind == "send":
+        channel = bot.get_channel(payload["channel_id"])
+        if channel is None:
+            return f"Unknown channel {payload['channel_id']}"
+        await _send_text(channel, "\n".join(json.loads(message.payload)["content"] for message in batch))
+    elif outbox_message.kind == "game_embed":
+        game = bot.game_service.get_game_by_id(game_id=payload["game_id"])
+        if game is None:
+            return f"Unknown game {payload['game_id']}"
+        await _game_summary(game)
+    elif outbox_message.kind == "tournament_summary":
+        await _tournament_summary(guild_id=payload["guild_id"])
+    elif outbox_message.kind == "park_channel":
+        # Already deleted channels are done
+        channel = bot.get_channel(payload["channel_id"])
+        if channel is not None:
+            await bot.channel_pool.park(channel)
+    elif outbox_message.kind == "delete_channel":
+        # Written before the channel pool
+        channel = bot.get_channel(payload["channel_id"])
+        if channel is not None:
+            await channel.delete()
+    else:
+        return f"Unknown outbox message kind {outbox_message.kind}"
+    return None
+
+def _batch_outbox_messages(outbox_messages: list) -> list:
+    """
+    Groups the consecutive text messages of a route with the same priority
+    into batches fitting in one Discord message. Other messages are batches
+    of their own.
+    """
+    batches = []
+    length = 0
+    for outbox_message in outbox_messages:
+        message_length = len(json.loads(outbox_message.payload).get("content", "")) + 1
+        if (batches and outbox_message.kind == "send" and batches[-1][-1].kind == "send"
+                and batches[-1][-1].priority == outbox_message.priority and length + message_length <= 2000):
+            batches[-1].append(outbox_message)
+            length += message_length
+        else:
+            batches.append([outbox_message])
+            length = message_length
+    return batches
+
+async def _deliver_outbox_route(outbox_messages: list, semaphore: asyncio.Semaphore):
+    """
+    Delivers the messages of a route by priority and then in order. A batch
+    waiting for a retry stops the delivery, and the route is not fetched
+    again until the retry is due, so a channel never receives them out of order.
+    """
+    async with semaphore:
+        for batch in _batch_outbox_messages(outbox_messages):
+            attempts = max(outbox_message.attempts for outbox_message in batch) + 1
+            try:
+                error = await _deliver_outbox_batch(batch)
+            except (discord.NotFound, discord.Forbidden) as e:
+                error = str(e)
+            except Exception as e:
+                if attempts < bot.OUTBOX_MAX_ATTEMPTS:
+                    # Jittered exponential backoff, so retries of many routes do not burst together
+                    delay = min(bot.OUTBOX_BACKOFF_MAX, bot.OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1))
+                    delay = delay * random.uniform(0.5, 1.5)
+                    logging.warning(f"Retrying outbox messages {[m.id for m in batch]} ({batch[0].kind}) in {delay:.1f}s: {e}")
+                    for outbox_message in batch:
+                        bot.outbox_service.set_retry(outbox_message.id, attempts=attempts,
+                                                     next_attempt_at=time.time() + delay, error=str(e))
+                    bot.outbox_stats["retried"] += len(batch)
+                    return
+                error = str(e)
+            for outbox_message in batch:
+                if error is not None:
+                    logging.error(f"Error delivering outbox message {outbox_message.id} ({outbox_message.kind}): {error}")
+                    bot.outbox_service.set_failed(outbox_message.id, attempts=attempts, error=error)
+                    bot.outbox_stats["failed"] += 1
+                    continue
+                sent_at = bot.outbox_service.set_sent(outbox_message.id)
+                bot.outbox_stats["sent"] += 1
+                bot.outbox_stats["latencies"].append(sent_at - outbox_message.created_at)
+            if len(batch) > 1:
+                bot.outbox_stats["batched"] += len(batch) - 1
+
+def _outbox_worker_done(workers: dict, route: str, task: asyncio.Task):
+    """
+    Releases the route of a finished outbox worker, so it is fetched again
+    """
+    workers.pop(route, None)
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Error delivering outbox route {route}: {task.exception()}")
+
+async def _dispatch_outbox():
+    """
+    Delivers the outbox messages written by the state changes. Every route
+    is delivered by its own worker, up to OUTBOX_CONCURRENCY at a time, and
+    the messages of a route one at a time. Routes still being delivered are
+    not fetched again, so a slow channel (rate limited or backing off) does
+    not hold back the others.
+    Wakes up OUTBOX_BATCH_WINDOW after a state change writes messages, so the
+    messages written together are batched, or every OUTBOX_POLL_INTERVAL for
+    the messages written by other processes and the retries.
+    """
+    await bot.wait_until_ready()
+    semaphore = asyncio.Semaphore(bot.OUTBOX_CONCURRENCY)
+    # Worker task of the routes being delivered
+    workers = {}
+    last_cleanup = time.time()
+    while not bot.is_closed():
+        try:
+            await asyncio.wait_for(bot.outbox_event.wait(), timeout=bot.OUTBOX_POLL_INTERVAL)
+            await asyncio.sleep(bot.OUTBOX_BATCH_WINDOW)
+        except asyncio.TimeoutError:
+            pass
+        bot.outbox_event.clear()
+        try:
+            guild_ids = [guild.id for guild in bot.guilds]
+            outbox_messages = bot.outbox_service.get_due_outbox_messages(
+                guild_ids=guild_ids, exclude_routes=list(workers)) if guild_ids else []
+            routes = {}
+            for outbox_message in outbox_messages:
+                routes.setdefault(outbox_message.route, []).append(outbox_message)
+            # Messages come by priority, so routes with player facing messages take the semaphore first
+            for route, route_messages in routes.items():
+                worker = asyncio.create_task(_deliver_outbox_route(route_messages, semaphore))
+                workers[route] = worker
+                worker.add_done_callback(lambda task, route=route: _outbox_worker_done(workers, route, task))
+            if time.time() - last_cleanup > 3600:
+                bot.outbox_service.delete_delivered(before=time.time() - 86400)
+                last_cleanup = time.time()
+        except Exception as e:
+            logging.error(f"Error dispatching outbox messages: {e}")
+
+async def _run_database_maintenance() -> str:
+    """
+    Refreshes the planner statistics, sweeps the orphan rows and frees up to
+    MAINTENANCE_VACUUM_PAGES unused pages, in a thread.
+    Returns a report of the pass.
+    """
+    service = bot.maintenance_service
+    async with bot.maintenance_lock:
+        start = time.perf_counter()
+        await asyncio.to_thread(service.optimize)
+        orphans = await asyncio.to_thread(service.sweep_orphans)
+        before = await asyncio.to_thread(service.get_size)
+        await asyncio.to_thread(service.incremental_vacuum, bot.MAINTENANCE_VACUUM_PAGES)
+        after = await asyncio.to_thread(service.get_size)
+    swept = ", ".join(f"{count} {table}" for table, count in orphans.items()) or "none"
+    return (f"🧹 Database maintenance in {time.perf_counter() - start:.2f}s. Orphan rows deleted: {swept}. "
+            f"Freed {(before['bytes'] - after['bytes']) // 1024} KiB, the database takes {after['bytes'] // 1024} KiB "
+            f"with {after['free_pages']} free pages left.")
+
+async def _run_database_backup() -> str:
+    """
+    Copies the database to BACKUP_DIR with the SQLite backup API in a thread,
+    BACKUP_STEP_PAGES pages at a time. Returns a report of the backup.
+    """
+    async with bot.maintenance_lock:
+        start = time.perf_counter()
+        path = await asyncio.to_thread(bot.maintenance_service.backup, bot.BACKUP_STEP_PAGES)
+    return f"💾 Database backup saved to {path} in {time.perf_counter() - start:.2f}s."
+
+async def _database_maintenance():
+    """
+    Runs the database maintenance every MAINTENANCE_INTERVAL seconds and a
+    backup every BACKUP_INTERVAL seconds, 0 disabling backups
+    """
+    await bot.wait_until_ready()
+    last_backup = time.time()
+    while not bot.is_closed():
+        await asyncio.sleep(bot.MAINTENANCE_INTERVAL)
+        try:
+            logging.info(await _run_database_maintenance())
+            if bot.BACKUP_INTERVAL > 0 and time.time() - last_backup >= bot.BACKUP_INTERVAL:
+                logging.info(await _run_database_backup())
+                last_backup = time.time()
+        except Exception as e:
+            logging.error(f"Error during database maintenance: {e}")
+
+async def api_startup():
+    """
+    Initializes the database and values on api worker processes,
+    which import this module without running main
+    """
+    if not hasattr(bot, "db"):
+        load_dotenv()
+        setup_database()
+        setup_vars()
+
+def create_app():
+    """
+    Creates the api app with the registered routes. The routes annotate
+    their request as "Request", as fastapi is not imported yet when they are
+    defined, and the annotation is replaced by the class before adding them.
+    """
+    from fastapi import FastAPI, Request
+    app = FastAPI(on_startup=[api_startup])
+    for method, path, endpoint in API_ROUTES:
+        for name, annotation in endpoint.__annotations__.items():
+            if annotation == "Request":
+                endpoint.__annotations__[name] = Request
+        app.add_api_route(path, endpoint, methods=[method])
+    return app
+
 async def run_api():
     """
-    Starts api on port 8000
+    Starts api on API_PORT, 8000 by default
     """
-    config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="info")
+    import uvicorn
+    config = uvicorn.Config(create_app(), host="0.0.0.0", port=bot.API_PORT, log_level="info")
     server = uvicorn.Server(config)
     await server.serve()
 
+def run_api_workers():
+    """
+    Starts api on API_PORT with API_WORKERS processes, without the bot
+    """
+    setup_database()
+    setup_vars()
+    import uvicorn
+    logging.info(f"Starting api with {bot.API_WORKERS} workers")
+    uvicorn.run("main:create_app", factory=True, host="0.0.0.0", port=bot.API_PORT, log_level="info", workers=bot.API_WORKERS)
+
 async def main():
     """
-    Starts all
+    Starts all, or only the bot when RUN_MODE is bot
     """
     try:
         logging.info("Starting bot initialization...")
@@ -2007,10 +3212,17 @@ async def main():
         setup_database()
         setup_vars()
         
-        # Create threads for bot and API
-        api_task = asyncio.create_task(run_api())
         bot_task = asyncio.create_task(bot.start(os.environ['DISCORD_BOT_TOKEN']))
-        await asyncio.gather(api_task, bot_task)
+        outbox_task = asyncio.create_task(_dispatch_outbox())
+        maintenance_task = asyncio.create_task(_database_maintenance())
+        if bot.RUN_MODE == "bot":
+            # The api runs in its own processes and queues the events in the database
+            ipc_task = asyncio.create_task(_process_ipc_messages())
+            await asyncio.gather(ipc_task, outbox_task, maintenance_task, bot_task)
+        else:
+            # Create tasks for bot and API
+            api_task = asyncio.create_task(run_api())
+            await asyncio.gather(api_task, outbox_task, maintenance_task, bot_task)
         
     except KeyError:
         logging.critical("Missing DISCORD_BOT_TOKEN in environment variables")
@@ -2020,6 +3232,10 @@ async def main():
 
 if __name__ == "__main__":
     """
-    Executes main asyncronous
+    Executes main asyncronous, or the api workers when RUN_MODE is api
     """
-    asyncio.run(main())
\ No newline at end of file
+    load_dotenv()
+    if os.environ.get("RUN_MODE", "all") == "api":
+        run_api_workers()
+    else:
+        asyncio.run(main())
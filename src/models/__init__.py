@@ -6,16 +6,20 @@ Imported directly from schema definitions.
 from models.category import Category
 from models.game_map import GameMap
 from models.game import Game
-from models.pick import Pick
 from models.player import Player
 from models.server_role import ServerRole
 from models.team import Team
-from models.veto import Veto
+from models.map_action import MapAction
 from models.channel import Channel
 from models.setting import Setting
 from models.summary import Summary
 from models.game_server import GameServer
+from models.tournament_round import TournamentRound
+from models.standing import Standing
+from models.ipc_message import IpcMessage
+from models.game_result import GameResult
+from models.game_action import GameAction
 
-__all__ = ['Category', 'GameMap', 'Game', 'Pick', 'Player', 
-'ServerRole', 'Team', 'Veto', 'Channel', 'Setting', "Summary",
-'GameServer' ]  # Explicit exports
\ No newline at end of file
+__all__ = ['Category', 'GameMap', 'Game', 'MapAction', 'Player', 
+'ServerRole', 'Team', 'Channel', 'Setting', "Summary",
+'GameServer', 'TournamentRound', 'Standing', 'IpcMessage', 'GameResult', 'GameAction' ]  # Explicit exports
\ No newline at end of file
@@ -0,0 +1,28 @@
+import dataclasses
+from typing import Tuple
+
+def slotted(cls):
+    """
+    Rebuilds a dataclass with __slots__, like dataclass(slots=True) does
+    from Python 3.10, so rows do not allocate a __dict__ each.
+    """
+    field_names = tuple(field.name for field in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    for field_name in field_names:
+        namespace.pop(field_name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+def column_names(model) -> Tuple[str, ...]:
+    """Names of the fields of a model, in the order its constructor expects them"""
+    return tuple(field.name for field in dataclasses.fields(model))
+
+def columns(model, table: str = "", exclude: Tuple[str, ...] = ()) -> str:
+    """
+    Explicit SELECT column list of a model, so rows map to the model fields
+    whatever the order of the table columns is
+    """
+    prefix = f"{table}." if table else ""
+    return ", ".join(f"{prefix}{name}" for name in column_names(model) if name not in exclude)
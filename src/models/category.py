@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from models.base import slotted
 from typing import Optional
 
+@slotted
 @dataclass
 class Category:
     """
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from models.base import slotted
 from typing import Optional
 from enum import Enum
+@slotted
 @dataclass
 class Game:
     """
@@ -17,6 +19,7 @@ class Game:
         voice_channel_team_two_id: Voice channel used for ingame for team two
         public_game_message_id: Message id where the summary of the game is setted
         admin_pick_veto_button_message_id: Message id where picks and bans are setted
+        round_number: Round of the tournament the game belongs to
     """    
     # Optional fields with defaults
     id: Optional[int] = None
@@ -31,4 +34,5 @@ class Game:
     voice_channel_team_two_id: Optional[int] = None
     public_game_message_id: Optional[int] = None
     admin_pick_veto_button_message_id: Optional[int] = -1
-    result_button_message_id: Optional[int] = -1
\ No newline at end of file
+    result_button_message_id: Optional[int] = -1
+    round_number: int = 0
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import NamedTuple, Optional
+
+class GameAction(NamedTuple):
+    """
+    Read only view of a veto, pick or map of a game with the names of the
+    teams of the game, as returned by the single query of the game embed.
+
+    Attributes:
+        kind: veto, pick or map, None if the game has no actions yet
+        number: Order of the veto or pick, or number of the map
+        team_id: Team that vetoed or picked, or winner of the map
+    """
+    team_one_name: str
+    team_two_name: str
+    kind: Optional[str]
+    number: Optional[int]
+    team_id: Optional[int]
+    map_name: Optional[str]
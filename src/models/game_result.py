@@ -0,0 +1,20 @@
+from typing import NamedTuple
+
+class GameResult(NamedTuple):
+    """
+    Read only view of a game with its team names and maps won, used to
+    render the tournament summary without loading every team and map.
+
+    Attributes:
+        team_one_wins: Maps won by team one
+        team_two_wins: Maps won by team two
+    """
+    id: int
+    game_type: str
+    round_number: int
+    team_one_id: int
+    team_two_id: int
+    team_one_name: str
+    team_two_name: str
+    team_one_wins: int
+    team_two_wins: int
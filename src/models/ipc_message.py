@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from models.base import slotted
+from typing import Optional
+
+@slotted
+@dataclass
+class IpcMessage:
+    """
+    Represents an event sent by an api process to the bot process.
+
+    Attributes:
+        kind: Type of event (match_log, match_demo, start_live_games)
+        payload: JSON encoded arguments of the event
+        created_at: Date the event was received
+        processed_at: Date the bot handled the event, None if pending
+        guild_id: Discord guild id, used to route the event to the process of its shard
+        attempts: Failed attempts to handle the event so far
+        next_attempt_at: Unix time of the next attempt
+        last_error: Error of the last failed attempt
+        failed_at: Date the bot gave up on the event, kept for inspection
+    """
+    id: Optional[int] = None
+    kind: str = ""
+    payload: str = "{}"
+    created_at: Optional[str] = None
+    processed_at: Optional[str] = None
+    guild_id: int = 0
+    attempts: int = 0
+    next_attempt_at: float = 0
+    last_error: Optional[str] = None
+    failed_at: Optional[str] = None
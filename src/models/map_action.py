@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from models.base import slotted
+from typing import Optional
+
+@slotted
+@dataclass
+class MapAction:
+    """
+    Veto or pick of a map in the pick and bans phase of a game.
+
+    Attributes:
+        guild_id: Discord guild id
+        game_id: Id of the game
+        seq: Order of the action in the game, starting at 1, set when inserted
+        action: veto or pick
+        team_id: Team that made the action, -1 for the decider map
+        map_name: Vetoed or picked map
+    """
+    id: Optional[int] = None
+    guild_id: int = 0
+    game_id: int = 0
+    seq: int = 0
+    action: str = "veto"
+    team_id: int = 0
+    map_name: str = ""
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from models.base import slotted
+from typing import Optional
+
+# Delivery priorities of the outbox messages, lower first
+PRIORITY_PLAYER = 0
+PRIORITY_NORMAL = 1
+PRIORITY_DIAGNOSTIC = 2
+
+@slotted
+@dataclass
+class OutboxMessage:
+    """
+    Discord side effect waiting to be delivered by the outbox dispatcher.
+
+    Attributes:
+        guild_id: Discord guild id
+        kind: send, game_embed, tournament_summary or park_channel
+        route: Messages of the same route are delivered one at a time and in
+            order, like the messages of a channel
+        coalesce_key: A newer message with the same key supersedes this one
+            while it is pending, like two edits of the same message
+        priority: PRIORITY_PLAYER, PRIORITY_NORMAL or PRIORITY_DIAGNOSTIC,
+            player facing messages jump ahead of the diagnostic chatter
+        payload: JSON encoded arguments of the side effect
+        status: pending, sent, superseded or failed
+        attempts: Failed deliveries so far
+        created_at: Unix time the message was written
+        next_attempt_at: Unix time of the next delivery attempt
+        sent_at: Unix time the message was delivered
+        last_error: Error of the last failed delivery
+    """
+    id: Optional[int] = None
+    guild_id: int = 0
+    kind: str = "send"
+    route: str = ""
+    coalesce_key: Optional[str] = None
+    priority: int = PRIORITY_NORMAL
+    payload: str = "{}"
+    status: str = "pending"
+    attempts: int = 0
+    created_at: float = 0
+    next_attempt_at: float = 0
+    sent_at: Optional[float] = None
+    last_error: Optional[str] = None
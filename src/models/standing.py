@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from models.base import slotted
+from typing import Optional
+
+@slotted
+@dataclass
+class Standing:
+    """
+    Swiss stage standing of a team.
+
+    Attributes:
+        guild_id: Discord guild id
+        team_id: Id of the team
+        wins: Swiss games won
+        losses: Swiss games lost
+        map_difference: Maps won minus maps lost
+        round_difference: Rounds won minus rounds lost
+        buchholz: Sum of the wins minus losses of every opponent faced
+        team_name: Name of the team, only filled when reading the standings
+    """
+    id: Optional[int] = None
+    guild_id: int = 0
+    team_id: int = 0
+    wins: int = 0
+    losses: int = 0
+    map_difference: int = 0
+    round_difference: int = 0
+    buchholz: int = 0
+    team_name: str = ""
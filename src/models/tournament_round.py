@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from models.base import slotted
+from typing import Optional
+
+@slotted
+@dataclass
+class TournamentRound:
+    """
+    Represents the state of a round of the tournament.
+
+    Attributes:
+        guild_id: Discord guild id
+        round_number: Number of the round, starting at 1
+        stage: swiss, playoff or final
+        total_games: Number of games created for the round
+        finished_games: Number of games of the round with a winner
+    """
+    id: Optional[int] = None
+    guild_id: int = 0
+    round_number: int = 0
+    stage: str = "swiss"
+    total_games: int = 0
+    finished_games: int = 0
@@ -0,0 +1,144 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+class _Node:
+    __slots__ = ("children", "names", "count", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # First names below this node in order, at most `limit` of them
+        self.names: List[str] = []
+        # Number of names below this node
+        self.count = 0
+        # Names ending at this node, differing only in case
+        self.terminal: List[str] = []
+
+def _order(name: str) -> tuple:
+    return (name.lower(), name)
+
+class PrefixTrie:
+    """
+    Case insensitive prefix tree of names. Every node keeps the first
+    `limit` names below it, so a search walks the prefix only and does not
+    depend on how many names there are.
+    """
+    def __init__(self, names: Iterable[str] = (), limit: int = MAX_CHOICES):
+        self.limit = limit
+        self.root = _Node()
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return self.root.count
+
+    def _path(self, key: str) -> Optional[List[_Node]]:
+        path = [self.root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                return None
+            path.append(node)
+        return path
+
+    def add(self, name: str):
+        """Add a name, doing nothing if it is already there"""
+        key = name.lower()
+        node = self.root
+        path = [node]
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            path.append(node)
+        if name in node.terminal:
+            return
+        node.terminal.append(name)
+        node.terminal.sort()
+        for node in path:
+            node.count += 1
+            if len(node.names) < self.limit or _order(name) < _order(node.names[-1]):
+                node.names.append(name)
+                node.names.sort(key=_order)
+                del node.names[self.limit:]
+
+    def remove(self, name: str):
+        """Remove a name, doing nothing if it is not there"""
+        key = name.lower()
+        path = self._path(key)
+        if path is None or name not in path[-1].terminal:
+            return
+        path[-1].terminal.remove(name)
+        for node in path:
+            node.count -= 1
+            if name in node.names:
+                node.names.remove(name)
+                if node.count > len(node.names):
+                    node.names = self._collect(node)
+        # Drop the nodes left without names
+        for parent, char in zip(reversed(path[:-1]), reversed(key)):
+            if parent.children[char].count > 0:
+                break
+            del parent.children[char]
+
+    def _collect(self, node: _Node) -> List[str]:
+        """First `limit` names below a node, walking it in order"""
+        names = []
+        stack = [node]
+        while stack and len(names) < self.limit:
+            node = stack.pop()
+            names += node.terminal
+            stack += [node.children[char] for char in sorted(node.children, reverse=True)]
+        return names[:self.limit]
+
+    def search(self, prefix: str) -> List[str]:
+        """First names starting with a prefix, ignoring case"""
+        path = self._path(prefix.lower())
+        return list(path[-1].names) if path is not None else []
+
+class NameIndex:
+    """
+    Prefix tries serving the autocomplete of the slash commands: team names,
+    player nicknames and game types of each guild, and the map pool.
+    The tries of a guild are loaded the first time it is searched and kept
+    in sync by the commands changing teams and players. Changes to guilds
+    not loaded yet are ignored, as the load reads them from the database.
+    Game types only change with the rounds, so their trie is reloaded instead.
+    """
+    def __init__(self, load_teams: Callable[[int], List[str]], load_players: Callable[[int], List[str]],
+                 load_game_types: Callable[[int], List[str]], map_pool: List[str]):
+        self.loaders = {"team": load_teams, "player": load_players, "game_type": load_game_types}
+        self.tries: Dict[str, Dict[int, PrefixTrie]] = {kind: {} for kind in self.loaders}
+        self.maps = PrefixTrie(map_pool)
+
+    def _get_trie(self, kind: str, guild_id: int) -> PrefixTrie:
+        trie = self.tries[kind].get(guild_id)
+        if trie is None:
+            trie = PrefixTrie(self.loaders[kind](guild_id))
+            self.tries[kind][guild_id] = trie
+        return trie
+
+    def search(self, kind: str, guild_id: int, prefix: str) -> List[str]:
+        """Names of a kind of a guild starting with a prefix"""
+        return self._get_trie(kind, guild_id).search(prefix)
+
+    def search_maps(self, prefix: str) -> List[str]:
+        """Maps of the map pool starting with a prefix"""
+        return self.maps.search(prefix)
+
+    def add(self, kind: str, guild_id: int, names: Iterable[str]):
+        """Add names to a loaded guild"""
+        trie = self.tries[kind].get(guild_id)
+        if trie is not None:
+            for name in names:
+                trie.add(name)
+
+    def remove(self, kind: str, guild_id: int, names: Iterable[str]):
+        """Remove names from a loaded guild"""
+        trie = self.tries[kind].get(guild_id)
+        if trie is not None:
+            for name in names:
+                trie.remove(name)
+
+    def invalidate(self, kind: str, guild_id: int):
+        """Reload the names of a kind of a guild on its next search"""
+        self.tries[kind].pop(guild_id, None)
@@ -0,0 +1,112 @@
+"""
+Parsing and validation of the roster files imported with !import_roster.
+
+CSV files have a header with the team, nickname, steamid and role columns,
+one member per row. JSON files are a list of teams:
+[{"name": "Iberian_Soul", "players": [{"nickname": "alex", "steamid": "76561198000984547", "role": "captain"}]}]
+"""
+import csv
+import io
+import json
+from typing import Dict, List, Tuple
+from services.player_service import ROLE_LIMITS, ROLE_LIMIT_ERRORS
+
+ROLES = ("captain", "player", "coach")
+
+def _text(value) -> str:
+    """JSON value as text, null being empty"""
+    return "" if value is None else str(value)
+
+def parse_roster(filename: str, content: bytes) -> List[Tuple[str, str, str, str, str]]:
+    """
+    Parses a CSV or JSON roster file into (where, team, nickname, steamid,
+    role) rows, `where` locating the row in the file for the errors: the
+    line of a CSV row, the team and player number of a JSON one. Team rows
+    of a JSON file have no nickname, steamid nor role. Team names with
+    spaces get '_' instead, like !create_team does.
+    Raises ValueError if the file can not be read.
+    """
+    text = content.decode("utf-8-sig")
+    rows = []
+    if filename.lower().endswith(".json"):
+        try:
+            teams = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(teams, list):
+            raise ValueError("The JSON roster must be a list of teams.")
+        for team_number, team in enumerate(teams, start=1):
+            if not isinstance(team, dict) or "name" not in team:
+                raise ValueError(f"Team {team_number}: every team must be an object with a name.")
+            players = team.get("players") or []
+            if not isinstance(players, list):
+                raise ValueError(f"Team {team_number}: players must be a list.")
+            rows.append((f"Team {team_number}", _text(team["name"]), None, None, None))
+            for player_number, player in enumerate(players, start=1):
+                if not isinstance(player, dict):
+                    raise ValueError(f"Team {team_number}, player {player_number}: every player must be an object.")
+                rows.append((f"Team {team_number}, player {player_number}", _text(team["name"]),
+                             _text(player.get("nickname")), _text(player.get("steamid")), _text(player.get("role"))))
+    elif filename.lower().endswith(".csv"):
+        reader = csv.DictReader(io.StringIO(text))
+        missing = {"team", "nickname", "steamid", "role"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            # Short rows miss the last values
+            rows.append((f"Row {reader.line_num}", row["team"] or "", row["nickname"] or "",
+                         row["steamid"] or "", row["role"] or ""))
+    else:
+        raise ValueError("The roster must be a .csv or a .json file.")
+    return [
+        (where,
+         " ".join(team.split()).replace(" ", "_"),
+         nickname.strip() if nickname is not None else None,
+         steamid.strip() if steamid is not None else None,
+         role.strip().lower() if role is not None else None)
+        for where, team, nickname, steamid, role in rows
+    ]
+
+def validate_roster(rows: List[Tuple[str, str, str, str, str]], existing_teams: Dict[str, int],
+                    existing_players: list) -> Tuple[Dict[str, List[Tuple[str, str, str]]], List[str]]:
+    """
+    Checks the rows with the rules of !add_player against the existing
+    teams (name -> id) and players of the guild and against each other.
+    Returns the new members by team name, teams without new members
+    included, and the errors found. Nothing must be imported with errors.
+    """
+    errors = []
+    members: Dict[str, List[Tuple[str, str, str]]] = {}
+    nicknames = {player.nickname for player in existing_players}
+    steamids = {player.steamid for player in existing_players}
+    counts: Dict[Tuple[str, str], int] = {}
+    team_names = {team_id: name for name, team_id in existing_teams.items()}
+    for player in existing_players:
+        key = (team_names.get(player.team_id), player.role_name)
+        counts[key] = counts.get(key, 0) + 1
+
+    for where, team, nickname, steamid, role in rows:
+        if team == "":
+            errors.append(f"{where}: missing team name.")
+            continue
+        members.setdefault(team, [])
+        if nickname is None:
+            continue
+        if nickname == "" or " " in nickname:
+            errors.append(f"{where}: player name must be a single word.")
+        elif nickname in nicknames:
+            errors.append(f"{where}: player {nickname} already exists with this name.")
+        if not steamid.isdigit():
+            errors.append(f"{where}: SteamID of {nickname} must contain only numbers (steamID64).")
+        elif steamid in steamids:
+            errors.append(f"{where}: player with steamid {steamid} already exists.")
+        if role not in ROLES:
+            errors.append(f"{where}: invalid role {role}, must be one of: {', '.join(ROLES)}.")
+            continue
+        counts[(team, role)] = counts.get((team, role), 0) + 1
+        if counts[(team, role)] > ROLE_LIMITS[role]:
+            errors.append(f"{where}: {team}: {ROLE_LIMIT_ERRORS[role]}")
+        nicknames.add(nickname)
+        steamids.add(steamid)
+        members[team].append((nickname, steamid, role))
+    return members, errors
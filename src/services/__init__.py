@@ -6,11 +6,22 @@ from services.category_service import CategoryService
 from services.channel_service import ChannelService
 from services.player_service import PlayerService
 from services.game_service import GameService
-from services.veto_service import VetoService
-from services.pick_service import PickService
+from services.map_action_service import MapActionService
+from services.game_map_service import GameMapService
 from services.summary_service import SummaryService
 from services.game_server_service import GameServerService
+from services.match_config_service import MatchConfigService
+from services.tournament_round_service import TournamentRoundService
+from services.standing_service import StandingService
+from services.ipc_message_service import IpcMessageService
+from services.outbox_service import OutboxService
+from services.result_service import ResultService
+from services.maintenance_service import MaintenanceService
+from services.entity_cache import EntityCache
+from services.game_versions import GameVersions
 
 __all__ = ['DatabaseManager', 'PlayerService', 'TeamService', 'ServerRoleService', 
-'SettingService', 'CategoryService', 'ChannelService', 'GameService', 'VetoService', 
-"PickService", "GameMapService", "SummaryService", "GameServerService"]  # Control what's exposed
\ No newline at end of file
+'SettingService', 'CategoryService', 'ChannelService', 'GameService', 'MapActionService', 
+"GameMapService", "SummaryService", "GameServerService",
+"MatchConfigService", "TournamentRoundService",
+"StandingService", "IpcMessageService", "OutboxService", "ResultService", "MaintenanceService", "EntityCache", "GameVersions"]  # Control what's exposed
\ No newline at end of file
@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.category import Category
+from models.base import columns
+
+CATEGORY_COLUMNS = columns(Category)
 
 class CategoryService:
     def __init__(self, conn: Connection):
@@ -21,7 +24,7 @@ class CategoryService:
     def get_category_by_id(self, category_id: int) -> Optional[Category]:
         """Fetch a category by ID"""
         row = self.conn.execute(
-            "SELECT * FROM category WHERE id = ?", 
+            f"SELECT {CATEGORY_COLUMNS} FROM category WHERE id = ?", 
             (category_id,)
         ).fetchone()
         return Category(*row) if row else None
@@ -29,7 +32,7 @@ class CategoryService:
     def get_category_by_name(self, category_name: str, guild_id: int) -> Optional[Category]:
         """Fetch a category by category_name for a guild id"""
         row = self.conn.execute(
-            "SELECT * FROM category WHERE category_name = ? AND guild_id = ?", 
+            f"SELECT {CATEGORY_COLUMNS} FROM category WHERE category_name = ? AND guild_id = ?", 
             (category_name, guild_id)
         ).fetchone()
         return Category(*row) if row else None
@@ -38,7 +41,7 @@ class CategoryService:
         """Fetch all categories for a guild"""
         return [
             Category(*row) 
-            for row in self.conn.execute("SELECT * FROM category WHERE guild_id = ?",
+            for row in self.conn.execute(f"SELECT {CATEGORY_COLUMNS} FROM category WHERE guild_id = ?",
                                          (guild_id,))
         ]
     
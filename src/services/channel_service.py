@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.channel import Channel
+from models.base import columns
+
+CHANNEL_COLUMNS = columns(Channel)
 
 class ChannelService:
     def __init__(self, conn: Connection):
@@ -21,7 +24,7 @@ class ChannelService:
     def get_channel_by_id(self, channel_id: int) -> Optional[Channel]:
         """Fetch a channel by ID"""
         row = self.conn.execute(
-            "SELECT * FROM channel WHERE channel_id = ?", 
+            f"SELECT {CHANNEL_COLUMNS} FROM channel WHERE channel_id = ?", 
             (channel_id,)
         ).fetchone()
         return Channel(*row) if row else None
@@ -29,7 +32,7 @@ class ChannelService:
     def get_channel_by_name(self, channel_name: str, guild_id: int) -> Optional[Channel]:
         """Fetch a channel by channel_name for a guild id"""
         row = self.conn.execute(
-            f"SELECT * FROM channel WHERE channel_name = ? AND guild_id = ?", 
+            f"SELECT {CHANNEL_COLUMNS} FROM channel WHERE channel_name = ? AND guild_id = ?", 
             (channel_name, guild_id)
         ).fetchone()
         return Channel(*row) if row else None
@@ -38,7 +41,7 @@ class ChannelService:
         """Fetch all channels for a guild"""
         return [
             Channel(*row) 
-            for row in self.conn.execute("SELECT * FROM channel WHERE guild_id = ?",
+            for row in self.conn.execute(f"SELECT {CHANNEL_COLUMNS} FROM channel WHERE guild_id = ?",
                                          (guild_id,))
         ]
     
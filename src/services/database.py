@@ -2,6 +2,9 @@ import sqlite3
 from pathlib import Path
 from typing import Optional
 
+# First line of the migrations that can not run in a transaction
+NO_TRANSACTION = "-- no transaction"
+
 class DatabaseManager:
     def __init__(self, db_path: str = "./data/tournament.db"):
         self.db_path = db_path
@@ -16,12 +19,66 @@ class DatabaseManager:
         with open(self._get_sql_file_path(), 'r', encoding='utf-8') as f:
             return f.read()
 
-    def _create_tables(self) -> None:
-        """Initialize database using external SQL file"""
+    def _get_migration_files(self) -> list:
+        """Locate the numbered migration files, ordered by number"""
+        migrations_path = Path(__file__).parent.parent / "sql" / "migrations"
+        migrations = []
+        for path in migrations_path.glob("*.sql"):
+            migrations.append((int(path.name.split("_")[0]), path))
+        return sorted(migrations)
+
+    def _run_migrations(self, conn: sqlite3.Connection) -> None:
+        """
+        Apply the migrations newer than the database user_version. Each one
+        runs in a transaction with its user_version, so a failed migration
+        leaves the schema as it was and is run whole next time. Migrations
+        starting with "-- no transaction", like a VACUUM, run outside one
+        and must be safe to run again.
+        Foreign keys are off meanwhile, so rebuilding a table does not
+        cascade to the rows referencing it.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            for number, path in self._get_migration_files():
+                if number <= version:
+                    continue
+                script = path.read_text(encoding='utf-8')
+                if script.startswith(NO_TRANSACTION):
+                    conn.executescript(script)
+                    conn.execute(f"PRAGMA user_version = {number}")
+                    conn.commit()
+                    continue
+                try:
+                    conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {number};\nCOMMIT;")
+                except sqlite3.Error as e:
+                    conn.rollback()
+                    raise sqlite3.Error(f"migration {path.name} failed, nothing of it was applied: {e}") from e
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+
+    def _is_up_to_date(self, conn: sqlite3.Connection, migrations: list) -> bool:
+        """
+        Whether the schema is created and every migration applied, so the
+        initialization file does not have to be run again
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        return version > 0 and version >= (migrations[-1][0] if migrations else 0)
+
+    def _create_tables(self, force: bool = False) -> None:
+        """
+        Initialize database using external SQL file and apply the migrations,
+        skipped when the database is already at the last migration unless forced
+        """
         try:
             with self.get_connection() as conn:
+                # WAL lets the api processes read while the bot process writes
+                conn.execute("PRAGMA journal_mode = WAL")
+                if not force and self._is_up_to_date(conn, self._get_migration_files()):
+                    return
                 conn.executescript(self._read_sql_file())
                 conn.commit()
+                self._run_migrations(conn)
         except FileNotFoundError:
             raise RuntimeError(f"SQL initialization file not found at {self._get_sql_file_path()}")
         except sqlite3.Error as e:
@@ -29,7 +86,12 @@ class DatabaseManager:
 
     def get_connection(self) -> sqlite3.Connection:
         """Get a thread-safe database connection"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Wait for the writer of another process instead of failing with "database is locked"
+        conn.execute("PRAGMA busy_timeout = 5000")
+        # Off by default in SQLite, deleting a game cascades to its maps, vetoes and picks
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
 
     def reset_database(self) -> None:
         """Drop all tables and reinitialize (for testing)"""
@@ -41,4 +103,4 @@ class DatabaseManager:
                 -- Add all other tables to drop
                 PRAGMA foreign_keys = ON;
             """)
-        self._create_tables()  # Recreate fresh tables
+        self._create_tables(force=True)  # Recreate fresh tables
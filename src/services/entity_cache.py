@@ -0,0 +1,59 @@
+import copy
+from typing import Dict, Hashable, Optional
+
+class EntityCache:
+    """
+    Identity map of the entities loaded by a service, grouped by guild.
+    An entry is an entity or a list of entities, like the maps of a game.
+    Entities are copied in and out, so callers changing an entity without
+    saving it through the service never change the cached one.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.entities: Dict[int, Dict[Hashable, object]] = {}
+        self.guild_ids: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Fetch a copy of a cached entity, None if it is not cached"""
+        guild_id = self.guild_ids.get(key)
+        if guild_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _copy(self.entities[guild_id][key])
+
+    def put(self, key: Hashable, entity: object, guild_id: int):
+        """Store a copy of an entity"""
+        if not self.enabled:
+            return
+        self.remove(key)
+        self.entities.setdefault(guild_id, {})[key] = _copy(entity)
+        self.guild_ids[key] = guild_id
+
+    def remove(self, key: Hashable):
+        """Invalidate an entity"""
+        guild_id = self.guild_ids.pop(key, None)
+        if guild_id is not None:
+            del self.entities[guild_id][key]
+
+    def clear(self, guild_id: Optional[int] = None):
+        """Invalidate the entities of a guild, or all of them"""
+        if guild_id is None:
+            self.entities.clear()
+            self.guild_ids.clear()
+            return
+        for key in self.entities.pop(guild_id, {}):
+            del self.guild_ids[key]
+
+    def get_stats(self) -> dict:
+        """Hits, misses and number of cached entities"""
+        return {"hits": self.hits, "misses": self.misses, "entities": len(self.guild_ids),
+                "guilds": len(self.entities)}
+
+def _copy(entity: object) -> object:
+    """Copy an entity or a list of entities"""
+    if isinstance(entity, list):
+        return [copy.copy(item) for item in entity]
+    return copy.copy(entity)
@@ -1,89 +1,124 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.game_map import GameMap
+from models.map_action import MapAction
+from models.outbox_message import OutboxMessage
+from models.base import columns
+from services.entity_cache import EntityCache
+from services.game_versions import GameVersions
+from services.map_action_service import write_map_action
+from services.outbox_service import insert_outbox_messages
+
+GAME_MAP_COLUMNS = columns(GameMap)
+
+def write_game_map(conn: Connection, game_map: GameMap):
+    """Update a game_map without committing, so it is written in the transaction of the caller"""
+    conn.execute(
+        """
+        UPDATE game_map 
+        SET guild_id = ?, team_id_winner = ?, game_number = ?, map_name = ?, 
+        game_id = ?
+        WHERE id = ?
+        """,
+        (game_map.guild_id, game_map.team_id_winner, game_map.game_number, game_map.map_name, 
+         game_map.game_id, 
+         game_map.id)
+    )
 
 class GameMapService:
-    def __init__(self, conn: Connection):
+    def __init__(self, conn: Connection, cache: Optional[EntityCache] = None,
+                 versions: Optional[GameVersions] = None):
         self.conn = conn
+        # Cached by game id, as game_maps are always read by game
+        self.cache = cache if cache is not None else EntityCache()
+        self.versions = versions if versions is not None else GameVersions()
 
-    def create_game_map(self, game_map: GameMap) -> int:
-        """Insert a new game_map, returns game_map ID"""
-        cursor = self.conn.execute(
-            """
-            INSERT INTO game_map (guild_id, team_id_winner, game_number, map_name, game_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (game_map.guild_id, game_map.team_id_winner, game_map.game_number, game_map.map_name, game_map.game_id)
-        )
-        self.conn.commit()
+    def create_game_map(self, game_map: GameMap, map_action: Optional[MapAction] = None,
+                        outbox: Optional[List[OutboxMessage]] = None) -> int:
+        """
+        Insert a new game_map, returns game_map ID.
+        The pick adding the map to the game and the outbox messages of the
+        change are written in the same transaction.
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                INSERT INTO game_map (guild_id, team_id_winner, game_number, map_name, game_id)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (game_map.guild_id, game_map.team_id_winner, game_map.game_number, game_map.map_name, game_map.game_id)
+            )
+            if map_action is not None:
+                write_map_action(self.conn, map_action)
+            insert_outbox_messages(self.conn, outbox)
+        self.invalidate_game(game_map.game_id)
         return cursor.lastrowid
 
     def get_all_game_maps(self, guild_id: int) -> List[GameMap]:
         """Fetch all game_maps"""
         return [
             GameMap(*row) 
-            for row in self.conn.execute("SELECT * FROM game_map WHERE guild_id = ?", (guild_id,))
+            for row in self.conn.execute(f"SELECT {GAME_MAP_COLUMNS} FROM game_map WHERE guild_id = ?", (guild_id,))
+        ]
+
+    def _get_game_maps(self, game_id: int) -> List[GameMap]:
+        """Fetch the game_maps of a game ordered by game_number, from the cache if loaded"""
+        game_id = int(game_id)
+        game_maps = self.cache.get(game_id)
+        if game_maps is not None:
+            return game_maps
+        game_maps = [
+            GameMap(*row)
+            for row in self.conn.execute(f"SELECT {GAME_MAP_COLUMNS} FROM game_map WHERE game_id = ? ORDER BY game_number ASC",
+                                         (game_id,))
         ]
+        if game_maps:
+            self.cache.put(game_id, game_maps, game_maps[0].guild_id)
+        return game_maps
+
+    def invalidate_game(self, game_id: int):
+        """Invalidate the cached game_maps of a game"""
+        self.cache.remove(int(game_id))
+        self.versions.bump(game_id)
 
     def get_all_game_maps_by_game(self, guild_id: int, game_id: int) -> List[GameMap]:
         """Fetch all game_maps by game id"""
-        return [
-            GameMap(*row) 
-            for row in self.conn.execute("""SELECT * FROM game_map 
-                            WHERE guild_id = ? AND game_id = ?
-                            ORDER BY game_number ASC""", 
-                         (guild_id, game_id))
-        ]
+        return [game_map for game_map in self._get_game_maps(game_id) if game_map.guild_id == guild_id]
 
     def get_game_map_by_game_and_map_name(self, guild_id: int, game_id: int, map_name: str) -> Optional[GameMap]:
         """Fetch the first game_map with a lower game_number that is not finished"""
-        cursor = self.conn.execute("""SELECT * FROM game_map 
-                            WHERE guild_id = ? AND game_id = ? AND map_name = ?
-                            """, 
-                         (guild_id, game_id, map_name))
-        row = cursor.fetchone()
-        if row:
-            return GameMap(*row)
+        for game_map in self.get_all_game_maps_by_game(guild_id=guild_id, game_id=game_id):
+            if game_map.map_name == map_name:
+                return game_map
         return None
 
     def get_first_not_finished_game_map(self, guild_id: int, game_id: int) -> Optional[GameMap]:
         """Fetch the first game_map with a lower game_number that is not finished"""
-        cursor = self.conn.execute("""SELECT * FROM game_map 
-                            WHERE guild_id = ? AND game_id = ? AND team_id_winner <= 0
-                            ORDER BY game_number ASC
-                            LIMIT 1""", 
-                         (guild_id, game_id))
-        row = cursor.fetchone()
-        if row:
-            return GameMap(*row)
+        for game_map in self.get_all_game_maps_by_game(guild_id=guild_id, game_id=game_id):
+            if game_map.team_id_winner <= 0:
+                return game_map
         return None
 
     def get_last_not_finished_game_map(self, guild_id: int, game_id: int) -> Optional[GameMap]:
         """Fetch the last game_map with a lower game_number that is not finished"""
-        cursor = self.conn.execute("""SELECT * FROM game_map 
-                    WHERE guild_id = ? AND game_id = ? AND team_id_winner <= 0
-                    ORDER BY game_number DESC
-                    LIMIT 1""", 
-                 (guild_id, game_id))
-        row = cursor.fetchone()
-        if row:
-            return GameMap(*row)
+        for game_map in reversed(self.get_all_game_maps_by_game(guild_id=guild_id, game_id=game_id)):
+            if game_map.team_id_winner <= 0:
+                return game_map
         return None
 
     def get_by_game_id_game_number_game_map(self, game_id: int, game_number: int) -> Optional[GameMap]:
         """Fetch the first game_map with a lower game_number that is not finished"""
-        cursor = self.conn.execute("""SELECT * FROM game_map 
-                            WHERE game_id = ? AND game_number = ?
-                            """, 
-                         (game_id, game_number))
-        row = cursor.fetchone()
-        if row:
-            return GameMap(*row)
+        for game_map in self._get_game_maps(game_id):
+            if game_map.game_number == int(game_number):
+                return game_map
         return None
 
 
     def delete_game_map_by_id(self, id: int):
         """Delete game_map by id"""
+        row = self.conn.execute("SELECT game_id FROM game_map WHERE id = ?", (id,)).fetchone()
+        if row is not None:
+            self.invalidate_game(row[0])
         cursor = self.conn.execute(
             """
             DELETE FROM game_map 
@@ -94,18 +129,10 @@ class GameMapService:
         self.conn.commit()
         return
 
-    def update_game_map(self, game_map: GameMap):
-        """Update game_map"""
-        self.conn.execute(
-            """
-            UPDATE game_map 
-            SET guild_id = ?, team_id_winner = ?, game_number = ?, map_name = ?, 
-            game_id = ?
-            WHERE id = ?
-            """,
-            (game_map.guild_id, game_map.team_id_winner, game_map.game_number, game_map.map_name, 
-             game_map.game_id, 
-             game_map.id)
-        )
+    def update_game_map(self, game_map: GameMap, outbox: Optional[List[OutboxMessage]] = None):
+        """Update game_map, writing the outbox messages of the change in the same transaction"""
+        write_game_map(self.conn, game_map)
+        insert_outbox_messages(self.conn, outbox)
         self.conn.commit()
+        self.invalidate_game(game_map.game_id)
         return
\ No newline at end of file
@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.game_server import GameServer
+from models.base import columns
+
+GAME_SERVER_COLUMNS = columns(GameServer)
 
 class GameServerService:
     def __init__(self, conn: Connection):
@@ -30,7 +33,7 @@ class GameServerService:
     def get_game_server_by_id(self, game_server_id: int) -> Optional[GameServer]:
         """Fetch a game_server by ID"""
         row = self.conn.execute(
-            "SELECT * FROM game_server WHERE id = ?", 
+            f"SELECT {GAME_SERVER_COLUMNS} FROM game_server WHERE id = ?", 
             (game_server_id,)
         ).fetchone()
         return GameServer(*row) if row else None
@@ -38,7 +41,7 @@ class GameServerService:
     def get_game_server_by_ip(self, ip: str) -> Optional[GameServer]:
         """Fetch a game_server by ip"""
         row = self.conn.execute(
-            "SELECT * FROM game_server WHERE ip = ?", 
+            f"SELECT {GAME_SERVER_COLUMNS} FROM game_server WHERE ip = ?", 
             (ip,)
         ).fetchone()
         return GameServer(*row) if row else None
@@ -46,7 +49,7 @@ class GameServerService:
     def get_game_server_by_game_id(self, game_id: int) -> Optional[GameServer]:
         """Fetch a game_server by ip"""
         row = self.conn.execute(
-            "SELECT * FROM game_server WHERE game_id = ?", 
+            f"SELECT {GAME_SERVER_COLUMNS} FROM game_server WHERE game_id = ?", 
             (game_id,)
         ).fetchone()
         return GameServer(*row) if row else None
@@ -55,14 +58,14 @@ class GameServerService:
         """Fetch all game_servers"""
         return [
             GameServer(*row) 
-            for row in self.conn.execute("SELECT * FROM game_server WHERE guild_id = ?",
+            for row in self.conn.execute(f"SELECT {GAME_SERVER_COLUMNS} FROM game_server WHERE guild_id = ?",
                                          (guild_id,))
         ]
     
     def get_free_game_server(self, guild_id: int) -> List[GameServer]:
         """Fetch first free game_server"""
-        cursor = self.conn.execute("""
-                                    SELECT * FROM game_server
+        cursor = self.conn.execute(f"""
+                                    SELECT {GAME_SERVER_COLUMNS} FROM game_server
                                     WHERE guild_id = ? AND is_free = TRUE
                                     LIMIT 1""",
                                     (guild_id,))
@@ -71,10 +74,20 @@ class GameServerService:
             return GameServer(*row)
         return None
     
+    def get_free_game_servers(self, guild_id: int) -> List[GameServer]:
+        """Fetch all free game_servers"""
+        return [
+            GameServer(*row) 
+            for row in self.conn.execute(f"""
+                                    SELECT {GAME_SERVER_COLUMNS} FROM game_server
+                                    WHERE guild_id = ? AND is_free = TRUE""",
+                                    (guild_id,))
+        ]
+    
     def get_game_server_by_game_id(self, game_id: int) -> List[GameServer]:
         """Fetch first free game_server"""
-        cursor = self.conn.execute("""
-                                    SELECT * FROM game_server
+        cursor = self.conn.execute(f"""
+                                    SELECT {GAME_SERVER_COLUMNS} FROM game_server
                                     WHERE game_id = ?""",
                                     (game_id,))
         row = cursor.fetchone()
@@ -82,6 +95,19 @@ class GameServerService:
             return GameServer(*row)
         return None
     
+    def get_game_servers_by_game_ids(self, game_ids: List[int]) -> List[GameServer]:
+        """Fetch the game_servers assigned to several games in a single query"""
+        if len(game_ids) == 0:
+            return []
+        placeholders = ", ".join("?" for _ in game_ids)
+        return [
+            GameServer(*row)
+            for row in self.conn.execute(
+            f"SELECT {GAME_SERVER_COLUMNS} FROM game_server WHERE game_id IN ({placeholders})",
+            tuple(game_ids)
+            )
+        ]
+
     def delete_all_game_servers(self, guild_id: int):
         """Delete all game_servers of a guild"""
         cursor = self.conn.execute(
@@ -1,10 +1,37 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.game import Game
+from models.game_result import GameResult
+from models.game_action import GameAction
+from models.outbox_message import OutboxMessage
+from models.base import columns
+from services.entity_cache import EntityCache
+from services.outbox_service import insert_outbox_messages
+
+GAME_COLUMNS = columns(Game)
+
+def write_game(conn: Connection, game: Game):
+    """Update an existing game without committing, so it is written in the transaction of the caller"""
+    conn.execute(
+        """
+        UPDATE game SET guild_id = ?, team_one_id = ?, team_two_id = ?, 
+        game_type = ?, game_channel_id = ?, admin_game_channel_id = ?,
+        voice_channel_team_one_id = ?, voice_channel_team_two_id = ?,
+        public_game_message_id = ?, team_winner = ?, admin_pick_veto_button_message_id = ?,
+        result_button_message_id = ?, round_number = ?
+        WHERE id = ?
+        """,
+        (game.guild_id, game.team_one_id, game.team_two_id,
+         game.game_type, game.game_channel_id, game.admin_game_channel_id,
+         game.voice_channel_team_one_id, game.voice_channel_team_two_id, 
+         game.public_game_message_id, game.team_winner, game.admin_pick_veto_button_message_id,
+         game.result_button_message_id, game.round_number, game.id)
+    )
 
 class GameService:
-    def __init__(self, conn: Connection):
+    def __init__(self, conn: Connection, cache: Optional[EntityCache] = None):
         self.conn = conn
+        self.cache = cache if cache is not None else EntityCache()
 
     def create_game(self, game: Game) -> int:
         """Insert a new game, returns game ID"""
@@ -13,59 +40,153 @@ class GameService:
             INSERT INTO game (guild_id, team_one_id, team_two_id, 
                 game_type, game_channel_id, admin_game_channel_id,
                 voice_channel_team_one_id, voice_channel_team_two_id,
-                public_game_message_id, admin_pick_veto_button_message_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                public_game_message_id, admin_pick_veto_button_message_id, round_number)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (game.guild_id, game.team_one_id, game.team_two_id,
              game.game_type, game.game_channel_id, game.admin_game_channel_id,
              game.voice_channel_team_one_id, game.voice_channel_team_two_id, 
-             game.public_game_message_id, game.admin_pick_veto_button_message_id)
+             game.public_game_message_id, game.admin_pick_veto_button_message_id,
+             game.round_number)
         )
         self.conn.commit()
         return cursor.lastrowid
 
     def get_game_by_id(self, game_id: int) -> Optional[Game]:
         """Fetch a game by ID"""
+        game = self.cache.get(game_id)
+        if game is not None:
+            return game
         row = self.conn.execute(
-            "SELECT * FROM game WHERE id = ?", 
+            f"SELECT {GAME_COLUMNS} FROM game WHERE id = ?", 
             (game_id,)
         ).fetchone()
-        return Game(*row) if row else None
+        if row is None:
+            return None
+        game = Game(*row)
+        self.cache.put(game.id, game, game.guild_id)
+        return game
 
     def get_all_games(self, guild_id: int) -> List[Game]:
         """Fetch all games"""
         return [
             Game(*row) 
-            for row in self.conn.execute("SELECT * FROM game WHERE guild_id = ?", (guild_id,))
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE guild_id = ?", (guild_id,))
         ]
 
     def get_all_games_finished(self, guild_id: int) -> List[Game]:
         """Fetch all games"""
         return [
             Game(*row) 
-            for row in self.conn.execute("SELECT * FROM game WHERE guild_id = ? AND team_winner > 0", (guild_id,))
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE guild_id = ? AND team_winner > 0", (guild_id,))
         ]
 
     def get_all_games_not_finished(self, guild_id: int) -> List[Game]:
         """Fetch all games"""
         return [
             Game(*row) 
-            for row in self.conn.execute("SELECT * FROM game WHERE guild_id = ? AND team_winner <= 0", (guild_id,))
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE guild_id = ? AND team_winner <= 0", (guild_id,))
+        ]
+
+    def get_all_games_not_finished_by_team(self, team_id: int) -> List[Game]:
+        """Fetch all not finished games where a team plays"""
+        return [
+            Game(*row) 
+            for row in self.conn.execute(f"""SELECT {GAME_COLUMNS} FROM game 
+                                         WHERE (team_one_id = ? OR team_two_id = ?) AND team_winner <= 0""",
+                                         (team_id, team_id))
+        ]
+
+    def get_games_by_team(self, team_id: int) -> List[Game]:
+        """Fetch all games where a team plays"""
+        return [
+            Game(*row) 
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE team_one_id = ? OR team_two_id = ?",
+                                         (team_id, team_id))
         ]
 
     def get_games_by_type(self, game_type: str, guild_id: int) -> List[Game]:
         """Fetch games by type for a guild id"""
         return [
             Game(*row) 
-            for row in self.conn.execute("SELECT * FROM game WHERE game_type = ?  AND guild_id = ?", (game_type, guild_id))
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE game_type = ?  AND guild_id = ?", (game_type, guild_id))
+        ]
+
+    def get_games_by_round(self, guild_id: int, round_number: int) -> List[Game]:
+        """Fetch the games of a round ordered by creation"""
+        return [
+            Game(*row) 
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE guild_id = ? AND round_number = ? ORDER BY id",
+                                         (guild_id, round_number))
+        ]
+
+    def get_played_pairs(self, guild_id: int) -> set:
+        """Fetch the pairs of team ids that already played each other"""
+        return {
+            frozenset(row) 
+            for row in self.conn.execute("SELECT team_one_id, team_two_id FROM game WHERE guild_id = ?", 
+                                         (guild_id,))
+        }
+
+    def get_game_results(self, guild_id: int) -> List[GameResult]:
+        """Fetch every game of a guild with its team names and maps won, ordered by round"""
+        cursor = self.conn.execute(
+            """
+            SELECT game.id, game.game_type, game.round_number, game.team_one_id, game.team_two_id,
+                team_one.name, team_two.name,
+                COUNT(CASE WHEN game_map.team_id_winner = game.team_one_id THEN 1 END),
+                COUNT(CASE WHEN game_map.team_id_winner = game.team_two_id THEN 1 END)
+            FROM game
+            JOIN team AS team_one ON team_one.id = game.team_one_id
+            JOIN team AS team_two ON team_two.id = game.team_two_id
+            LEFT JOIN game_map ON game_map.game_id = game.id
+            WHERE game.guild_id = ?
+            GROUP BY game.id
+            ORDER BY game.round_number, game.id
+            """,
+            (guild_id,)
+        )
+        return list(map(GameResult._make, cursor))
+
+    def get_game_actions(self, game_id: int) -> List[GameAction]:
+        """
+        Fetch the team names of a game with its vetoes and picks in order,
+        followed by its maps by number, in a single query.
+        A game without actions returns one row with the team names.
+        """
+        cursor = self.conn.execute(
+            """
+            SELECT team_one.name, team_two.name, action.kind, action.number, action.team_id, action.map_name
+            FROM game
+            JOIN team AS team_one ON team_one.id = game.team_one_id
+            JOIN team AS team_two ON team_two.id = game.team_two_id
+            LEFT JOIN (
+                SELECT action AS kind, seq AS number, team_id, map_name FROM map_action WHERE game_id = :game_id
+                UNION ALL
+                SELECT 'map', game_number, team_id_winner, map_name FROM game_map WHERE game_id = :game_id
+            ) AS action ON 1
+            WHERE game.id = :game_id
+            ORDER BY action.kind = 'map', action.number
+            """,
+            {"game_id": game_id}
+        )
+        return list(map(GameAction._make, cursor))
+
+    def get_game_types(self, guild_id: int) -> List[str]:
+        """Fetch the game types of a guild ordered by round"""
+        return [
+            row[0] 
+            for row in self.conn.execute("""SELECT game_type FROM game WHERE guild_id = ?
+                                         GROUP BY game_type ORDER BY MIN(round_number), MIN(id)""",
+                                         (guild_id,))
         ]
 
     def get_game_by_teams_and_type(self, team_one_id: int, team_two_id:int, 
                                    game_type: str, guild_id: int) -> Optional[Game]:
         """Fetch a game by teams and type for a guild id"""
         row = self.conn.execute(
-            """
-            SELECT * FROM game WHERE (team_one_id = ? AND team_two_id = ?)
+            f"""
+            SELECT {GAME_COLUMNS} FROM game WHERE (team_one_id = ? AND team_two_id = ?)
             OR (team_one_id = ? AND team_two_id = ?)
             AND game_type = ?
             AND guild_id = ?
@@ -77,19 +198,26 @@ class GameService:
     def get_game_by_admin_game_channel_id(self, admin_game_channel_id: int) -> Optional[Game]:
         """Fetch a game by admin game channel ID"""
         row = self.conn.execute(
-            """
-            SELECT * FROM game WHERE admin_game_channel_id = ?
+            f"""
+            SELECT {GAME_COLUMNS} FROM game WHERE admin_game_channel_id = ?
             """, 
             (admin_game_channel_id,)
         ).fetchone()
-        print(f"row -> {row}")
         return Game(*row) if row else None
 
+    def get_admin_game_channel_routes(self) -> dict:
+        """Fetch the game id of every admin game channel id"""
+        return {
+            admin_game_channel_id: game_id
+            for admin_game_channel_id, game_id in self.conn.execute(
+                "SELECT admin_game_channel_id, id FROM game WHERE admin_game_channel_id IS NOT NULL")
+        }
+
     def get_all_games_by_type(self, guild_id: int, game_type: str) -> List[Game]:
         """Fetch all games by type"""
         return [
             Game(*row) 
-            for row in self.conn.execute("SELECT * FROM game WHERE guild_id = ? AND game_type == ?", 
+            for row in self.conn.execute(f"SELECT {GAME_COLUMNS} FROM game WHERE guild_id = ? AND game_type == ?", 
                                         (guild_id, game_type))
         ]    
 
@@ -103,8 +231,26 @@ class GameService:
             (id,)
         )
         self.conn.commit()
+        self.cache.remove(id)
         return
 
+    def delete_games(self, game_ids: List[int]):
+        """
+        Delete games in a single transaction. Their maps, vetoes and picks
+        are deleted by cascade and their game servers are freed.
+        """
+        if not game_ids:
+            return
+        placeholders = ",".join("?" * len(game_ids))
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE game_server SET is_free = TRUE, game_id = -1 WHERE game_id IN ({placeholders})",
+                game_ids
+            )
+            self.conn.execute(f"DELETE FROM game WHERE id IN ({placeholders})", game_ids)
+        for game_id in game_ids:
+            self.cache.remove(game_id)
+
     def delete_games_by_round(self, game_type: str):
         """Delete game by id"""
         cursor = self.conn.execute(
@@ -115,23 +261,16 @@ class GameService:
             (game_type,)
         )
         self.conn.commit()
+        self.cache.clear()
         return
     
-    def update_game(self, game: Game):
-        """Update an existing game"""
-        self.conn.execute(
-            """
-            UPDATE game SET guild_id = ?, team_one_id = ?, team_two_id = ?, 
-            game_type = ?, game_channel_id = ?, admin_game_channel_id = ?,
-            voice_channel_team_one_id = ?, voice_channel_team_two_id = ?,
-            public_game_message_id = ?, team_winner = ?, admin_pick_veto_button_message_id = ?,
-            result_button_message_id = ?
-            WHERE id = ?
-            """,
-            (game.guild_id, game.team_one_id, game.team_two_id,
-             game.game_type, game.game_channel_id, game.admin_game_channel_id,
-             game.voice_channel_team_one_id, game.voice_channel_team_two_id, 
-             game.public_game_message_id, game.team_winner, game.admin_pick_veto_button_message_id,
-             game.result_button_message_id, game.id)
-        )
+    def update_game(self, game: Game, outbox: Optional[List[OutboxMessage]] = None):
+        """Update an existing game, writing the outbox messages of the change in the same transaction"""
+        write_game(self.conn, game)
+        insert_outbox_messages(self.conn, outbox)
         self.conn.commit()
+        self.cache.put(game.id, game, game.guild_id)
+
+    def refresh_game(self, game: Game):
+        """Refresh the cached game with one written in the transaction of another service"""
+        self.cache.put(game.id, game, game.guild_id)
@@ -0,0 +1,19 @@
+from typing import Dict
+
+class GameVersions:
+    """
+    Version counter of every game, bumped by the services each time the
+    vetoes, picks or maps of the game change. Renders of a game, like its
+    embed, are valid while the version they were made with is current.
+    """
+    def __init__(self):
+        self.versions: Dict[int, int] = {}
+
+    def get(self, game_id: int) -> int:
+        """Current version of a game"""
+        return self.versions.get(int(game_id), 0)
+
+    def bump(self, game_id: int):
+        """Invalidate the renders of a game"""
+        game_id = int(game_id)
+        self.versions[game_id] = self.versions.get(game_id, 0) + 1
@@ -0,0 +1,67 @@
+import time
+from typing import List
+from sqlite3 import Connection
+from models.ipc_message import IpcMessage
+from models.base import columns
+
+IPC_MESSAGE_COLUMNS = columns(IpcMessage)
+
+class IpcMessageService:
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    def create_ipc_message(self, ipc_message: IpcMessage) -> int:
+        """Insert a new ipc_message, returns ipc_message ID"""
+        cursor = self.conn.execute(
+            "INSERT INTO ipc_message (kind, payload, guild_id) VALUES (?, ?, ?)",
+            (ipc_message.kind, ipc_message.payload, ipc_message.guild_id)
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def get_pending_ipc_messages(self, guild_ids: List[int], limit: int = 100) -> List[IpcMessage]:
+        """
+        Fetch the not processed ipc_messages of some guilds in arrival order,
+        skipping the ones given up and the ones waiting for a retry
+        """
+        placeholders = ",".join("?" * len(guild_ids))
+        return [
+            IpcMessage(*row)
+            for row in self.conn.execute(
+                f"""
+                SELECT {IPC_MESSAGE_COLUMNS} FROM ipc_message
+                WHERE processed_at IS NULL AND failed_at IS NULL AND guild_id IN ({placeholders}) AND next_attempt_at <= ?
+                ORDER BY id LIMIT ?
+                """,
+                (*guild_ids, time.time(), limit)
+            )
+        ]
+
+    def set_processed(self, ipc_message_id: int):
+        """Mark an ipc_message as processed"""
+        self.conn.execute(
+            "UPDATE ipc_message SET processed_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (ipc_message_id,)
+        )
+        self.conn.commit()
+
+    def set_retry(self, ipc_message_id: int, attempts: int, next_attempt_at: float, error: str):
+        """Schedule a new attempt of an ipc_message"""
+        self.conn.execute(
+            "UPDATE ipc_message SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (attempts, next_attempt_at, error, ipc_message_id)
+        )
+        self.conn.commit()
+
+    def set_failed(self, ipc_message_id: int, attempts: int, error: str):
+        """Give up on an ipc_message, it is kept for inspection"""
+        self.conn.execute(
+            "UPDATE ipc_message SET failed_at = CURRENT_TIMESTAMP, attempts = ?, last_error = ? WHERE id = ?",
+            (attempts, error, ipc_message_id)
+        )
+        self.conn.commit()
+
+    def delete_processed(self):
+        """Delete the processed ipc_messages"""
+        self.conn.execute("DELETE FROM ipc_message WHERE processed_at IS NOT NULL")
+        self.conn.commit()
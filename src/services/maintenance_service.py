@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import time
+from sqlite3 import Connection
+from typing import Dict, List
+
+# Rows pointing to a deleted parent, by table. Foreign keys cascade the deletes
+# now, this catches the rows written by processes without them.
+ORPHAN_SWEEPS = {
+    "game_map": "DELETE FROM game_map WHERE game_id NOT IN (SELECT id FROM game)",
+    "map_action": "DELETE FROM map_action WHERE game_id NOT IN (SELECT id FROM game)",
+    "veto": "DELETE FROM veto WHERE game_id NOT IN (SELECT id FROM game)",
+    "pick": "DELETE FROM pick WHERE game_id NOT IN (SELECT id FROM game)",
+    "player": "DELETE FROM player WHERE team_id NOT IN (SELECT id FROM team)",
+    "standing": "DELETE FROM standing WHERE team_id NOT IN (SELECT id FROM team)",
+    "head_to_head": """
+        DELETE FROM head_to_head
+        WHERE team_id NOT IN (SELECT id FROM team) OR opponent_id NOT IN (SELECT id FROM team)
+        """,
+    "game_server": """
+        UPDATE game_server SET is_free = TRUE, game_id = -1
+        WHERE game_id != -1 AND game_id NOT IN (SELECT id FROM game)
+        """,
+}
+
+class MaintenanceService:
+    """
+    Keeps the database file healthy: planner statistics, orphan rows, free
+    pages and online backups.
+    Methods block while SQLite works, so callers run them in a thread.
+    """
+    def __init__(self, conn: Connection, backup_dir: str = "./backups", keep_backups: int = 7):
+        self.conn = conn
+        self.backup_dir = backup_dir
+        self.keep_backups = keep_backups
+
+    def optimize(self):
+        """Refresh the planner statistics, with a full ANALYZE the first time"""
+        has_stats = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).fetchone() is not None
+        if not has_stats:
+            self.conn.execute("ANALYZE")
+        self.conn.execute("PRAGMA optimize")
+        self.conn.commit()
+
+    def sweep_orphans(self) -> Dict[str, int]:
+        """Delete the orphan rows in a single transaction, returns the count by table"""
+        with self.conn:
+            counts = {table: self.conn.execute(statement).rowcount for table, statement in ORPHAN_SWEEPS.items()}
+        return {table: count for table, count in counts.items() if count > 0}
+
+    def incremental_vacuum(self, pages: int = 1000) -> int:
+        """Return up to `pages` free pages to the file system, returns the free pages left"""
+        # The pragma frees one page per step of the statement, executescript runs all of them
+        self.conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        return self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def get_size(self) -> Dict[str, int]:
+        """Pages of the database file and free pages in it"""
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {"bytes": page_size * page_count, "pages": page_count, "free_pages": freelist_count}
+
+    def backup(self, pages: int = 256, sleep: float = 0.01) -> str:
+        """
+        Copy the database to a new file of the backup directory with the
+        SQLite backup API, `pages` pages per step, sleeping between steps so
+        writers are never waiting for long. The copy is consistent even with
+        concurrent writes, and only appears under its name once complete.
+        Returns the path of the backup.
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = self._new_backup_path()
+        partial_path = f"{path}.partial"
+        target = sqlite3.connect(partial_path)
+        try:
+            self.conn.backup(target, pages=pages, sleep=sleep)
+        finally:
+            target.close()
+        os.replace(partial_path, path)
+        self._prune_backups()
+        return path
+
+    def _new_backup_path(self) -> str:
+        """
+        Path of a new backup, named by time up to the microsecond so the names
+        sort in order. A time already taken by another backup moves forward.
+        """
+        now = time.time()
+        while True:
+            name = f"tournament-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now % 1 * 10 ** 6):06d}.db"
+            path = os.path.join(self.backup_dir, name)
+            if not os.path.exists(path) and not os.path.exists(f"{path}.partial"):
+                return path
+            now += 10 ** -6
+
+    def get_backups(self) -> List[str]:
+        """Paths of the complete backups, oldest first"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        return sorted(
+            os.path.join(self.backup_dir, name)
+            for name in os.listdir(self.backup_dir)
+            if name.startswith("tournament-") and name.endswith(".db")
+        )
+
+    def _prune_backups(self):
+        """Delete the oldest backups above keep_backups"""
+        backups = self.get_backups()
+        for path in backups[:max(0, len(backups) - self.keep_backups)]:
+            os.remove(path)
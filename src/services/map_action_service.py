@@ -0,0 +1,56 @@
+from typing import List, Optional
+from sqlite3 import Connection
+from models.map_action import MapAction
+from models.outbox_message import OutboxMessage
+from models.base import columns
+from services.game_versions import GameVersions
+from services.outbox_service import insert_outbox_messages
+
+MAP_ACTION_COLUMNS = columns(MapAction)
+
+def write_map_action(conn: Connection, map_action: MapAction) -> int:
+    """
+    Append a veto or pick to the log of its game without committing, so it is
+    written in the transaction of the caller. Returns map_action ID.
+    The sequence is allocated by the insert, without reading the log first.
+    """
+    cursor = conn.execute(
+        """
+        INSERT INTO map_action (guild_id, game_id, seq, action, team_id, map_name)
+        SELECT ?, ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ?
+        FROM map_action WHERE game_id = ?
+        """,
+        (map_action.guild_id, map_action.game_id, map_action.action,
+         map_action.team_id, map_action.map_name, map_action.game_id)
+    )
+    return cursor.lastrowid
+
+class MapActionService:
+    def __init__(self, conn: Connection, versions: Optional[GameVersions] = None):
+        self.conn = conn
+        self.versions = versions if versions is not None else GameVersions()
+
+    def create_map_action(self, map_action: MapAction, outbox: Optional[List[OutboxMessage]] = None) -> int:
+        """
+        Append a veto or pick to the log of its game, returns map_action ID.
+        The outbox messages of the change are written in the same transaction.
+        """
+        with self.conn:
+            map_action_id = write_map_action(self.conn, map_action)
+            insert_outbox_messages(self.conn, outbox)
+        self.versions.bump(map_action.game_id)
+        return map_action_id
+
+    def get_map_actions_by_game(self, game_id: int) -> List[MapAction]:
+        """Fetch the vetoes and picks of a game in order"""
+        return [
+            MapAction(*row)
+            for row in self.conn.execute(f"SELECT {MAP_ACTION_COLUMNS} FROM map_action WHERE game_id = ? ORDER BY seq",
+                                         (game_id,))
+        ]
+
+    def delete_map_actions_by_game(self, game_id: int):
+        """Delete the vetoes and picks of a game"""
+        self.conn.execute("DELETE FROM map_action WHERE game_id = ?", (game_id,))
+        self.conn.commit()
+        self.versions.bump(game_id)
@@ -0,0 +1,47 @@
+import os
+from typing import Dict, Optional
+
+class MatchConfigService:
+    """
+    Stores the serialized Matchzy match configs in memory and on disk.
+    Processes that do not build the configs should not use memory, as they
+    would not see the invalidations made by the bot process.
+    """
+    def __init__(self, directory: str = "/usr/src/app/match_configs", use_memory: bool = True):
+        self.directory = directory
+        self.use_memory = use_memory
+        self.configs: Dict[int, bytes] = {}
+
+    def get_path(self, game_id: int) -> str:
+        """Path of the match config file of a game"""
+        return os.path.join(self.directory, f"{game_id}.json")
+
+    def get_match_config(self, game_id: int) -> Optional[bytes]:
+        """Fetch a match config from memory, or from disk if not loaded yet"""
+        config = self.configs.get(game_id)
+        if config is not None:
+            return config
+        try:
+            with open(self.get_path(game_id), 'rb') as f:
+                config = f.read()
+        except FileNotFoundError:
+            return None
+        if self.use_memory:
+            self.configs[game_id] = config
+        return config
+
+    def save_match_config(self, game_id: int, config: bytes):
+        """Store a match config in memory and on disk"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.get_path(game_id), 'wb') as f:
+            f.write(config)
+        if self.use_memory:
+            self.configs[game_id] = config
+
+    def delete_match_config(self, game_id: int):
+        """Invalidate the match config of a game"""
+        self.configs.pop(game_id, None)
+        try:
+            os.remove(self.get_path(game_id))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,112 @@
+import time
+from typing import List, Optional
+from sqlite3 import Connection
+from models.outbox_message import OutboxMessage
+from models.base import columns
+
+OUTBOX_COLUMNS = columns(OutboxMessage)
+
+def insert_outbox_messages(conn: Connection, outbox_messages: Optional[List[OutboxMessage]]) -> int:
+    """
+    Insert outbox messages without committing, so other services write them
+    in the same transaction as their state change.
+    Pending messages with the same coalesce key are superseded.
+    Returns the number of superseded messages.
+    """
+    if not outbox_messages:
+        return 0
+    now = time.time()
+    superseded = 0
+    for outbox_message in outbox_messages:
+        if outbox_message.coalesce_key is not None:
+            superseded += conn.execute(
+                "UPDATE outbox SET status = 'superseded' WHERE coalesce_key = ? AND status = 'pending'",
+                (outbox_message.coalesce_key,)
+            ).rowcount
+        conn.execute(
+            """
+            INSERT INTO outbox (guild_id, kind, route, coalesce_key, priority, payload, created_at, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (outbox_message.guild_id, outbox_message.kind, outbox_message.route,
+             outbox_message.coalesce_key, outbox_message.priority, outbox_message.payload, now, now)
+        )
+    return superseded
+
+class OutboxService:
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    def create_outbox_messages(self, outbox_messages: List[OutboxMessage]):
+        """Insert outbox messages not tied to a state change"""
+        with self.conn:
+            insert_outbox_messages(self.conn, outbox_messages)
+
+    def get_due_outbox_messages(self, guild_ids: List[int], limit: int = 200,
+                                exclude_routes: Optional[List[str]] = None) -> List[OutboxMessage]:
+        """
+        Fetch the pending outbox messages of some guilds whose next attempt is
+        due, by priority and then in order.
+        Routes with a message waiting for a retry are skipped entirely, so the
+        next messages of the route are not delivered before it. The routes in
+        `exclude_routes`, still being delivered, are skipped too, so their
+        backlog does not fill the limit and hold back the other routes.
+        """
+        placeholders = ",".join("?" * len(guild_ids))
+        exclude_routes = list(exclude_routes or [])
+        route_placeholders = ",".join("?" * len(exclude_routes))
+        now = time.time()
+        return [
+            OutboxMessage(*row)
+            for row in self.conn.execute(
+                f"""
+                SELECT {OUTBOX_COLUMNS} FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ? AND guild_id IN ({placeholders})
+                AND route NOT IN (SELECT route FROM outbox WHERE status = 'pending' AND next_attempt_at > ?)
+                AND route NOT IN ({route_placeholders})
+                ORDER BY priority, id LIMIT ?
+                """,
+                (now, *guild_ids, now, *exclude_routes, limit)
+            )
+        ]
+
+    def set_sent(self, outbox_message_id: int) -> float:
+        """Mark an outbox message as delivered, returns the delivery time"""
+        sent_at = time.time()
+        self.conn.execute(
+            "UPDATE outbox SET status = 'sent', sent_at = ? WHERE id = ? AND status = 'pending'",
+            (sent_at, outbox_message_id)
+        )
+        self.conn.commit()
+        return sent_at
+
+    def set_retry(self, outbox_message_id: int, attempts: int, next_attempt_at: float, error: str):
+        """Schedule a new attempt of an outbox message"""
+        self.conn.execute(
+            "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ? AND status = 'pending'",
+            (attempts, next_attempt_at, error, outbox_message_id)
+        )
+        self.conn.commit()
+
+    def set_failed(self, outbox_message_id: int, attempts: int, error: str):
+        """Give up on an outbox message"""
+        self.conn.execute(
+            "UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+            (attempts, error, outbox_message_id)
+        )
+        self.conn.commit()
+
+    def get_backlog(self) -> tuple:
+        """(number of pending messages, unix time of the oldest one or None)"""
+        return self.conn.execute(
+            "SELECT COUNT(*), MIN(created_at) FROM outbox WHERE status = 'pending'"
+        ).fetchone()
+
+    def get_status_counts(self) -> dict:
+        """Number of outbox messages by status"""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def delete_delivered(self, before: float):
+        """Delete the messages delivered, superseded or failed before a time"""
+        self.conn.execute("DELETE FROM outbox WHERE status != 'pending' AND created_at < ?", (before,))
+        self.conn.commit()
@@ -1,27 +1,79 @@
-from typing import List, Optional
-from sqlite3 import Connection
+from typing import Dict, List, Optional
+from sqlite3 import Connection, IntegrityError
 from models.player import Player
+from models.base import columns
+
+PLAYER_COLUMNS = columns(Player)
+
+# Maximum members of a team by role, enforced by the player_role_limit trigger
+ROLE_LIMITS = {"captain": 1, "player": 4, "coach": 2}
+
+ROLE_LIMIT_ERRORS = {
+    "captain": "Only one captain can be assigned.",
+    "player": "Only four non-captain players can be assigned.",
+    "coach": "Only two coaches can be assigned.",
+}
+
+def player_conflict(player: Player, error: IntegrityError) -> str:
+    """User facing message of a player insert rejected by a constraint"""
+    message = str(error)
+    if "player.nickname" in message:
+        return f"Player {player.nickname} already exists with this name."
+    if "player.steamid" in message:
+        return f"Player with steamid {player.steamid} already exists."
+    if "player role limit" in message:
+        return "❌ " + ROLE_LIMIT_ERRORS.get(player.role_name, "Role must be \"captain\", \"coach\" or \"player\".")
+    return f"❌ Player {player.nickname} can not be added: {message}"
 
 class PlayerService:
     def __init__(self, conn: Connection):
         self.conn = conn
+        # Players of each guild by steamid, loaded on first use
+        self.steamid_index: Dict[int, Dict[str, Player]] = {}
+
+    def get_steamid_index(self, guild_id: int) -> Dict[str, Player]:
+        """
+        Fetch the players of a guild by steamid, loading them the first time.
+        The index is kept up to date by the changes made through this
+        service, other inserts must invalidate it.
+        """
+        index = self.steamid_index.get(guild_id)
+        if index is None:
+            index = {player.steamid: player for player in self.get_players_by_guild(guild_id)}
+            self.steamid_index[guild_id] = index
+        return index
+
+    def invalidate_steamid_index(self, guild_id: int):
+        """Invalidate the steamid index of a guild, reloaded on its next use"""
+        self.steamid_index.pop(guild_id, None)
 
     def create_player(self, player: Player) -> int:
-        """Insert a new player, returns player ID"""
-        cursor = self.conn.execute(
-            """
-            INSERT INTO player (guild_id, role_name, nickname, steamid, team_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (player.guild_id, player.role_name, player.nickname, player.steamid, player.team_id)
-        )
-        self.conn.commit()
+        """
+        Insert a new player, returns player ID.
+        Raises ValueError with the user facing message if the nickname or the
+        steamid is taken in the guild or the team is full for the role.
+        """
+        try:
+            with self.conn:
+                cursor = self.conn.execute(
+                    """
+                    INSERT INTO player (guild_id, role_name, nickname, steamid, team_id)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (player.guild_id, player.role_name, player.nickname, player.steamid, player.team_id)
+                )
+        except IntegrityError as e:
+            raise ValueError(player_conflict(player, e)) from e
+        index = self.steamid_index.get(player.guild_id)
+        if index is not None:
+            index[player.steamid] = Player(cursor.lastrowid, player.guild_id, player.team_id,
+                                           player.nickname, player.steamid, player.role_name)
         return cursor.lastrowid
 
     def get_player_by_id(self, player_id: int) -> Optional[Player]:
         """Fetch a player by ID"""
         row = self.conn.execute(
-            "SELECT * FROM player WHERE id = ?", 
+            f"SELECT {PLAYER_COLUMNS} FROM player WHERE id = ?", 
             (player_id,)
         ).fetchone()
         return Player(*row) if row else None
@@ -30,13 +82,20 @@ class PlayerService:
         """Fetch all players"""
         return [
             Player(*row) 
-            for row in self.conn.execute("SELECT * FROM player")
+            for row in self.conn.execute(f"SELECT {PLAYER_COLUMNS} FROM player")
+        ]
+
+    def get_players_by_guild(self, guild_id: int) -> List[Player]:
+        """Fetch all players of a guild"""
+        return [
+            Player(*row)
+            for row in self.conn.execute(f"SELECT {PLAYER_COLUMNS} FROM player WHERE guild_id = ?", (guild_id,))
         ]
 
     def get_player_by_nickname(self, nickname: str, guild_id: int) -> List[Player]:
         """Fetch a player by nickname for a guild id"""
         row = self.conn.execute(
-            "SELECT * FROM player WHERE nickname = ? AND guild_id = ?", 
+            f"SELECT {PLAYER_COLUMNS} FROM player WHERE nickname = ? AND guild_id = ?", 
             (nickname, guild_id)
         ).fetchone()
         return Player(*row) if row else None
@@ -44,7 +103,7 @@ class PlayerService:
     def get_player_by_steamid(self, steamid: str, guild_id: int) -> List[Player]:
         """Fetch a player by steamid for a guild id"""
         row = self.conn.execute(
-            "SELECT * FROM player WHERE steamid = ? AND guild_id = ?", 
+            f"SELECT {PLAYER_COLUMNS} FROM player WHERE steamid = ? AND guild_id = ?", 
             (steamid, guild_id)
         ).fetchone()
         return Player(*row) if row else None    
@@ -54,7 +113,7 @@ class PlayerService:
         return [
             Player(*row) 
             for row in self.conn.execute(
-            "SELECT * FROM player WHERE team_id = ?", 
+            f"SELECT {PLAYER_COLUMNS} FROM player WHERE team_id = ?", 
             (team_id,)
             )
         ]
@@ -64,13 +123,42 @@ class PlayerService:
         return [
             Player(*row) 
             for row in self.conn.execute(
-            "SELECT * FROM player WHERE team_id = ? AND role_name = ?", 
+            f"SELECT {PLAYER_COLUMNS} FROM player WHERE team_id = ? AND role_name = ?", 
             (team_id, role_name)
             )
         ]
     
+    def get_players_by_team_ids(self, team_ids: List[int]) -> List[Player]:
+        """Fetch all players of several teams in a single query"""
+        if len(team_ids) == 0:
+            return []
+        placeholders = ", ".join("?" for _ in team_ids)
+        return [
+            Player(*row) 
+            for row in self.conn.execute(
+            f"SELECT {PLAYER_COLUMNS} FROM player WHERE team_id IN ({placeholders})", 
+            tuple(team_ids)
+            )
+        ]
+    
+    def get_player_conflicts(self) -> List[tuple]:
+        """
+        Fetch the players removed by the roster constraints migration for
+        repeating the steamid of an earlier player: (id, guild_id, team_id,
+        nickname, steamid, role_name, kept_player_id)
+        """
+        return self.conn.execute(
+            """
+            SELECT id, guild_id, team_id, nickname, steamid, role_name, kept_player_id
+            FROM player_conflict ORDER BY id
+            """
+        ).fetchall()
+
     def delete_player_by_id(self, id: int):
         """Delete player by id"""
+        player = self.get_player_by_id(id)
+        if player is not None and player.guild_id in self.steamid_index:
+            self.steamid_index[player.guild_id].pop(player.steamid, None)
         cursor = self.conn.execute(
             """
             DELETE FROM player 
@@ -0,0 +1,53 @@
+from typing import List, Optional
+from sqlite3 import Connection
+from models.game import Game
+from models.game_map import GameMap
+from models.team import Team
+from models.outbox_message import OutboxMessage
+from services.game_map_service import GameMapService, write_game_map
+from services.game_service import GameService, write_game
+from services.team_service import TeamService, write_team
+from services.tournament_round_service import write_finished_game
+from services.standing_service import write_map_result, write_game_result
+from services.outbox_service import insert_outbox_messages
+
+class ResultService:
+    """
+    Writes a map result with everything it changes in a single transaction,
+    so a failure leaves the game, the round, the standings and the team
+    records as they were. The caches of the services owning those rows are
+    refreshed once it is committed.
+    """
+    def __init__(self, conn: Connection, game_service: GameService, team_service: TeamService,
+                 game_map_service: GameMapService):
+        self.conn = conn
+        self.game_service = game_service
+        self.team_service = team_service
+        self.game_map_service = game_map_service
+
+    def record_result(self, game_map: GameMap, winner_id: int, loser_id: int, swiss: bool,
+                      round_difference: int = 0, outbox: Optional[List[OutboxMessage]] = None,
+                      game: Optional[Game] = None, teams: Optional[List[Team]] = None):
+        """
+        Write the winner of a game map and, for swiss games, the map to the
+        standings. With `game`, the map finished it: the winner of the game,
+        the finished games of its round, the game result in the standings
+        and the updated `teams` are written too.
+        """
+        with self.conn:
+            write_game_map(self.conn, game_map)
+            if swiss:
+                write_map_result(self.conn, game_map.guild_id, winner_id, loser_id, round_difference)
+            if game is not None:
+                write_game(self.conn, game)
+                write_finished_game(self.conn, game.guild_id, game.round_number)
+                if swiss:
+                    write_game_result(self.conn, game.guild_id, winner_id, loser_id)
+                for team in teams or []:
+                    write_team(self.conn, team)
+            insert_outbox_messages(self.conn, outbox)
+        self.game_map_service.invalidate_game(game_map.game_id)
+        if game is not None:
+            self.game_service.refresh_game(game)
+            for team in teams or []:
+                self.team_service.refresh_team(team)
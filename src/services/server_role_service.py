@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.server_role import ServerRole
+from models.base import columns
+
+SERVER_ROLE_COLUMNS = columns(ServerRole)
 
 class ServerRoleService:
     def __init__(self, conn: Connection):
@@ -18,10 +21,30 @@ class ServerRoleService:
         self.conn.commit()
         return cursor.lastrowid
 
+    def upsert_server_roles(self, server_roles: List[ServerRole]):
+        """Insert or update the role IDs of several server_roles by name in a single transaction"""
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO server_role (guild_id, role_name, role_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT (guild_id, role_name) DO UPDATE SET role_id = excluded.role_id
+                """,
+                [(server_role.guild_id, server_role.role_name, server_role.role_id) for server_role in server_roles]
+            )
+
+    def delete_server_roles_by_name(self, guild_id: int, server_role_names: List[str]):
+        """Delete several server_roles of a guild by name in a single transaction"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM server_role WHERE guild_id = ? AND role_name = ?",
+                [(guild_id, server_role_name) for server_role_name in server_role_names]
+            )
+
     def get_server_role_by_id(self, server_role_id: int) -> Optional[ServerRole]:
         """Fetch a server_role by ID"""
         row = self.conn.execute(
-            "SELECT * FROM server_role WHERE id = ?", 
+            f"SELECT {SERVER_ROLE_COLUMNS} FROM server_role WHERE id = ?", 
             (server_role_id,)
         ).fetchone()
         return ServerRole(*row) if row else None
@@ -29,7 +52,7 @@ class ServerRoleService:
     def get_server_role_by_name(self, server_role_name: str, guild_id: int) -> Optional[ServerRole]:
         """Fetch a server_role by Name for a guild"""
         row = self.conn.execute(
-            "SELECT * FROM server_role WHERE role_name = ? AND guild_id = ?", 
+            f"SELECT {SERVER_ROLE_COLUMNS} FROM server_role WHERE role_name = ? AND guild_id = ?", 
             (server_role_name, guild_id)
         ).fetchone()
         return ServerRole(*row) if row else None
@@ -38,7 +61,7 @@ class ServerRoleService:
         """Fetch all server_roles for a guild"""
         return [
             ServerRole(*row) 
-            for row in self.conn.execute("SELECT * FROM server_role WHERE guild_id = ?",
+            for row in self.conn.execute(f"SELECT {SERVER_ROLE_COLUMNS} FROM server_role WHERE guild_id = ?",
                                           (guild_id,))
         ]
     
@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.setting import Setting
+from models.base import columns
+
+SETTING_COLUMNS = columns(Setting)
 
 class SettingService:
     def __init__(self, conn: Connection):
@@ -21,7 +24,7 @@ class SettingService:
     def get_setting_by_id(self, setting_id: int) -> Optional[Setting]:
         """Fetch a setting by ID"""
         row = self.conn.execute(
-            "SELECT * FROM setting WHERE id = ?", 
+            f"SELECT {SETTING_COLUMNS} FROM setting WHERE id = ?", 
             (setting_id,)
         ).fetchone()
         return Setting(*row) if row else None
@@ -29,7 +32,7 @@ class SettingService:
     def get_setting_by_name(self, setting_key: str, guild_id: int) -> Optional[Setting]:
         """Fetch a setting by Key"""
         row = self.conn.execute(
-            "SELECT * FROM setting WHERE key = ? AND guild_id = ?", 
+            f"SELECT {SETTING_COLUMNS} FROM setting WHERE key = ? AND guild_id = ?", 
             (setting_key, guild_id)
         ).fetchone()
         return Setting(*row) if row else None
@@ -38,7 +41,7 @@ class SettingService:
         """Fetch all settings"""
         return [
             Setting(*row) 
-            for row in self.conn.execute("SELECT * FROM setting WHERE guild_id = ?",
+            for row in self.conn.execute(f"SELECT {SETTING_COLUMNS} FROM setting WHERE guild_id = ?",
                                          (guild_id,))
         ]
     
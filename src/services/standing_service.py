@@ -0,0 +1,124 @@
+from typing import Dict, List
+from sqlite3 import Connection
+from models.standing import Standing
+from models.base import columns
+
+STANDING_COLUMNS = columns(Standing, table="standing", exclude=("team_name",))
+
+def write_map_result(conn: Connection, guild_id: int, winner_id: int, loser_id: int, round_difference: int = 0):
+    """
+    Add a map won by a team to the map and round differences, without
+    committing, so it is written in the transaction of the result
+    """
+    conn.executemany(
+        "INSERT OR IGNORE INTO standing (guild_id, team_id) VALUES (?, ?)",
+        [(guild_id, winner_id), (guild_id, loser_id)]
+    )
+    conn.executemany(
+        """
+        UPDATE standing SET map_difference = map_difference + ?,
+            round_difference = round_difference + ?
+        WHERE team_id = ?
+        """,
+        [(1, round_difference, winner_id), (-1, -round_difference, loser_id)]
+    )
+
+def write_game_result(conn: Connection, guild_id: int, winner_id: int, loser_id: int):
+    """
+    Add a game result to the standings, without committing, so it is
+    written in the transaction of the result.
+    Buchholz is updated incrementally: the opponents of the winner gain
+    one point, the opponents of the loser lose one, and on a first meeting
+    each team adds the record of the other one.
+    """
+    conn.executemany(
+        "INSERT OR IGNORE INTO standing (guild_id, team_id) VALUES (?, ?)",
+        [(guild_id, winner_id), (guild_id, loser_id)]
+    )
+    conn.execute("UPDATE standing SET wins = wins + 1 WHERE team_id = ?", (winner_id,))
+    conn.execute("UPDATE standing SET losses = losses + 1 WHERE team_id = ?", (loser_id,))
+    conn.executemany(
+        """
+        UPDATE standing SET buchholz = buchholz + ?
+        WHERE team_id IN (SELECT opponent_id FROM head_to_head WHERE team_id = ?)
+        """,
+        [(1, winner_id), (-1, loser_id)]
+    )
+    first_meeting = conn.execute(
+        "SELECT 1 FROM head_to_head WHERE team_id = ? AND opponent_id = ?",
+        (winner_id, loser_id)
+    ).fetchone() is None
+    if first_meeting:
+        conn.executemany(
+            """
+            UPDATE standing SET buchholz = buchholz +
+                (SELECT wins - losses FROM standing WHERE team_id = ?)
+            WHERE team_id = ?
+            """,
+            [(loser_id, winner_id), (winner_id, loser_id)]
+        )
+    conn.executemany(
+        """
+        INSERT INTO head_to_head (guild_id, team_id, opponent_id, wins, losses)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (team_id, opponent_id) DO UPDATE SET
+            wins = wins + excluded.wins, losses = losses + excluded.losses
+        """,
+        [(guild_id, winner_id, loser_id, 1, 0), (guild_id, loser_id, winner_id, 0, 1)]
+    )
+
+class StandingService:
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    def create_standing(self, guild_id: int, team_id: int):
+        """Insert an empty standing for a team if it has none"""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO standing (guild_id, team_id) VALUES (?, ?)",
+            (guild_id, team_id)
+        )
+        self.conn.commit()
+
+    def get_standings(self, guild_id: int) -> List[Standing]:
+        """Fetch the standings of a guild ordered by rank"""
+        return [
+            Standing(*row)
+            for row in self.conn.execute(
+                f"""
+                SELECT {STANDING_COLUMNS}, team.name FROM standing
+                JOIN team ON team.id = standing.team_id
+                WHERE standing.guild_id = ?
+                ORDER BY standing.wins DESC, standing.losses ASC, standing.buchholz DESC,
+                    standing.map_difference DESC, standing.round_difference DESC
+                """,
+                (guild_id,)
+            )
+        ]
+
+    def get_head_to_head(self, team_ids: List[int]) -> Dict[int, int]:
+        """
+        Fetch the games won minus the games lost by each team against the
+        other teams of a group, in a single query
+        """
+        placeholders = ", ".join("?" for _ in team_ids)
+        results = {team_id: 0 for team_id in team_ids}
+        for team_id, difference in self.conn.execute(
+            f"""
+            SELECT team_id, SUM(wins - losses) FROM head_to_head
+            WHERE team_id IN ({placeholders}) AND opponent_id IN ({placeholders})
+            GROUP BY team_id
+            """,
+            (*team_ids, *team_ids)
+        ):
+            results[team_id] = difference
+        return results
+
+    def record_map_result(self, guild_id: int, winner_id: int, loser_id: int, round_difference: int = 0):
+        """Add a map won by a team to the map and round differences"""
+        with self.conn:
+            write_map_result(self.conn, guild_id, winner_id, loser_id, round_difference)
+
+    def record_game_result(self, guild_id: int, winner_id: int, loser_id: int):
+        """Add a game result to the standings in a single transaction"""
+        with self.conn:
+            write_game_result(self.conn, guild_id, winner_id, loser_id)
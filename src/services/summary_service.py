@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlite3 import Connection
 from models.summary import Summary
+from models.base import columns
+
+SUMMARY_COLUMNS = columns(Summary)
 
 class SummaryService:
     def __init__(self, conn: Connection):
@@ -22,12 +25,12 @@ class SummaryService:
         """Fetch all summaries"""
         return [
             Summary(*row) 
-            for row in self.conn.execute("SELECT * FROM summary WHERE guild_id = ?", (guild_id,))
+            for row in self.conn.execute(f"SELECT {SUMMARY_COLUMNS} FROM summary WHERE guild_id = ?", (guild_id,))
         ]
 
     def get_summary_by_round_name(self, guild_id: int, round_name: str) -> Optional[Summary]:
         """Fetch all summaries by game id and round_name"""
-        row = self.conn.execute("SELECT * FROM summary WHERE guild_id = ? AND round_name = ?", 
+        row = self.conn.execute(f"SELECT {SUMMARY_COLUMNS} FROM summary WHERE guild_id = ? AND round_name = ?", 
                                 (guild_id, round_name)).fetchone()
         return Summary(*row) if row else None
 
@@ -1,84 +1,195 @@
-from typing import List, Optional
-from sqlite3 import Connection
+from typing import Dict, List, Optional
+from sqlite3 import Connection, IntegrityError
 from models.team import Team
+from models.player import Player
+from models.base import columns
+from services.entity_cache import EntityCache
+
+TEAM_COLUMNS = columns(Team)
+
+def write_team(conn: Connection, team: Team):
+    """Update an existing team without committing, so it is written in the transaction of the caller"""
+    conn.execute(
+        """
+        UPDATE team 
+        SET name = ?, discord_message_id = ?, swiss_wins = ?,
+            swiss_losses = ?, guild_id = ?, is_quarterfinalist = ?,
+            is_semifinalist = ?, is_finalist = ?, is_third_place = ?
+        WHERE id = ?
+        """,
+        (team.name, team.discord_message_id, team.swiss_wins,
+         team.swiss_losses, team.guild_id, team.is_quarterfinalist,
+         team.is_semifinalist, team.is_finalist, team.is_third_place,
+         team.id)
+    )
 
 class TeamService:
-    def __init__(self, conn: Connection):
+    def __init__(self, conn: Connection, cache: Optional[EntityCache] = None):
         self.conn = conn
+        self.cache = cache if cache is not None else EntityCache()
+
+    def _to_team(self, row: tuple) -> Team:
+        """Build a team from a row, refreshing the cached one"""
+        team = Team(*row)
+        self.cache.put(team.id, team, team.guild_id)
+        return team
 
     def create_team(self, team: Team) -> int:
-        """Insert a new team, returns team ID"""
-        cursor = self.conn.execute(
-            """
-            INSERT INTO team (name, discord_message_id, guild_id)
-            VALUES (?, ?, ?)
-            """,
-            (team.name, team.discord_message_id, team.guild_id)
-        )
-        self.conn.commit()
+        """
+        Insert a new team, returns team ID.
+        Raises ValueError with the user facing message if the name is taken in the guild.
+        """
+        try:
+            with self.conn:
+                cursor = self.conn.execute(
+                    """
+                    INSERT INTO team (name, discord_message_id, guild_id)
+                    VALUES (?, ?, ?)
+                    """,
+                    (team.name, team.discord_message_id, team.guild_id)
+                )
+        except IntegrityError as e:
+            raise ValueError(f"Team {team.name} already exists.") from e
         return cursor.lastrowid
 
+    def import_roster(self, guild_id: int, teams: List[Team], players: Dict[str, List[Player]]) -> Dict[str, int]:
+        """
+        Insert new teams with their standings, and the players of new and
+        existing teams by team name, in a single transaction.
+        Returns the team IDs of the guild by name.
+        Raises ValueError if a team or player was created meanwhile, nothing
+        being imported then.
+        """
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO team (name, discord_message_id, guild_id) VALUES (?, ?, ?)",
+                    [(team.name, team.discord_message_id, guild_id) for team in teams]
+                )
+                team_ids = dict(
+                    (name, team_id)
+                    for team_id, name in self.conn.execute("SELECT id, name FROM team WHERE guild_id = ?", (guild_id,))
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO standing (guild_id, team_id) VALUES (?, ?)",
+                    [(guild_id, team_ids[team.name]) for team in teams]
+                )
+                rows = []
+                for team_name, team_players in players.items():
+                    for player in team_players:
+                        player.team_id = team_ids[team_name]
+                        rows.append((guild_id, player.role_name, player.nickname, player.steamid, player.team_id))
+                self.conn.executemany(
+                    "INSERT INTO player (guild_id, role_name, nickname, steamid, team_id) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+        except IntegrityError as e:
+            raise ValueError(f"The roster conflicts with teams or players created meanwhile: {e}") from e
+        return team_ids
+
     def get_team_by_id(self, team_id: int) -> Optional[Team]:
         """Fetch a team by ID"""
+        team = self.cache.get(team_id)
+        if team is not None:
+            return team
         row = self.conn.execute(
-            "SELECT * FROM team WHERE id = ?", 
+            f"SELECT {TEAM_COLUMNS} FROM team WHERE id = ?", 
             (team_id,)
         ).fetchone()
-        return Team(*row) if row else None
+        return self._to_team(row) if row else None
 
     def get_all_teams(self, guild_id: int) -> List[Team]:
         """Fetch all teams"""
         return [
-            Team(*row) 
-            for row in self.conn.execute("SELECT * FROM team WHERE guild_id = ?", (guild_id,))
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ?", (guild_id,))
+        ]
+
+    def get_teams_by_ids(self, team_ids: List[int]) -> List[Team]:
+        """Fetch several teams by ID, querying the not cached ones in a single query"""
+        teams = []
+        missing_ids = []
+        for team_id in team_ids:
+            team = self.cache.get(team_id)
+            if team is None:
+                missing_ids.append(team_id)
+            else:
+                teams.append(team)
+        if len(missing_ids) == 0:
+            return teams
+        placeholders = ", ".join("?" for _ in missing_ids)
+        return teams + [
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE id IN ({placeholders})", tuple(missing_ids))
         ]
 
     def get_team_by_name(self, name: str, guild_id: int) -> Optional[Team]:
         """Fetch a team by name for a guild id"""
         row = self.conn.execute(
-            "SELECT * FROM team WHERE name = ? AND guild_id = ?", 
+            f"SELECT {TEAM_COLUMNS} FROM team WHERE name = ? AND guild_id = ?", 
             (name, guild_id)
         ).fetchone()
-        return Team(*row) if row else None
+        return self._to_team(row) if row else None
     
 
     def get_teams_by_record(self, guild_id: int, wins: int, losses: int) -> List[Team]:
         """Fetch all teams by type"""
         return [
-            Team(*row) 
-            for row in self.conn.execute("SELECT * FROM team WHERE guild_id = ? AND swiss_wins == ? AND swiss_losses = ?", 
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND swiss_wins == ? AND swiss_losses = ?", 
                                         (guild_id, wins, losses))
         ]
 
+    def get_teams_in_swiss(self, guild_id: int, wins: int, losses: int) -> List[Team]:
+        """Fetch the teams neither qualified nor eliminated on the swiss stage"""
+        return [
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND swiss_wins < ? AND swiss_losses < ?", 
+                                        (guild_id, wins, losses))
+        ]
+
+    def count_teams_in_swiss(self, guild_id: int, wins: int, losses: int) -> int:
+        """Count the teams neither qualified nor eliminated on the swiss stage"""
+        return self.conn.execute("SELECT COUNT(*) FROM team WHERE guild_id = ? AND swiss_wins < ? AND swiss_losses < ?", 
+                                 (guild_id, wins, losses)).fetchone()[0]
+
+    def get_teams_qualified(self, guild_id: int, wins: int) -> List[Team]:
+        """Fetch the teams qualified from the swiss stage"""
+        return [
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND swiss_wins >= ?", 
+                                        (guild_id, wins))
+        ]
+
     def get_teams_quarterfinalist(self, guild_id: int, ) -> List[Team]:
         """Fetch all teams by type"""
         return [
-            Team(*row) 
-            for row in self.conn.execute("SELECT * FROM team WHERE guild_id = ? AND is_quarterfinalist == ? ", 
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND is_quarterfinalist == ? ", 
                                         (guild_id, True))
         ]
 
     def get_teams_semifinalist(self, guild_id: int, ) -> List[Team]:
         """Fetch all teams by type"""
         return [
-            Team(*row) 
-            for row in self.conn.execute("SELECT * FROM team WHERE guild_id = ? AND is_semifinalist == ? ", 
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND is_semifinalist == ? ", 
                                         (guild_id, True))
         ]
 
     def get_teams_finalist(self, guild_id: int, ) -> List[Team]:
         """Fetch all teams by type"""
         return [
-            Team(*row) 
-            for row in self.conn.execute("SELECT * FROM team WHERE guild_id = ? AND is_finalist == ? ", 
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND is_finalist == ? ", 
                                         (guild_id, True))
         ]
 
     def get_teams_third_place(self, guild_id: int, ) -> List[Team]:
         """Fetch all teams by type"""
         return [
-            Team(*row) 
-            for row in self.conn.execute("SELECT * FROM team WHERE guild_id = ? AND is_third_place == ? ", 
+            self._to_team(row) 
+            for row in self.conn.execute(f"SELECT {TEAM_COLUMNS} FROM team WHERE guild_id = ? AND is_third_place == ? ", 
                                         (guild_id, True))
         ]
     
@@ -92,21 +203,15 @@ class TeamService:
             (id,)
         )
         self.conn.commit()
+        self.cache.remove(id)
         return
 
     def update_team(self, team: Team):
         """Update an existing team"""
-        self.conn.execute(
-            """
-            UPDATE team 
-            SET name = ?, discord_message_id = ?, swiss_wins = ?,
-                swiss_losses = ?, guild_id = ?, is_quarterfinalist = ?,
-                is_semifinalist = ?, is_finalist = ?, is_third_place = ?
-            WHERE id = ?
-            """,
-            (team.name, team.discord_message_id, team.swiss_wins,
-             team.swiss_losses, team.guild_id, team.is_quarterfinalist,
-             team.is_semifinalist, team.is_finalist, team.is_third_place,
-             team.id)
-        )
+        write_team(self.conn, team)
         self.conn.commit()
+        self.cache.put(team.id, team, team.guild_id)
+
+    def refresh_team(self, team: Team):
+        """Refresh the cached team with one written in the transaction of another service"""
+        self.cache.put(team.id, team, team.guild_id)
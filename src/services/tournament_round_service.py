@@ -0,0 +1,75 @@
+from typing import List, Optional
+from sqlite3 import Connection
+from models.tournament_round import TournamentRound
+from models.base import columns
+
+TOURNAMENT_ROUND_COLUMNS = columns(TournamentRound)
+
+def write_finished_game(conn: Connection, guild_id: int, round_number: int):
+    """Count one more finished game on a round without committing"""
+    conn.execute(
+        """
+        UPDATE tournament_round SET finished_games = finished_games + 1
+        WHERE guild_id = ? AND round_number = ?
+        """,
+        (guild_id, round_number)
+    )
+
+class TournamentRoundService:
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    def create_tournament_round(self, tournament_round: TournamentRound) -> int:
+        """Insert a new tournament_round, returns tournament_round ID"""
+        cursor = self.conn.execute(
+            """
+            INSERT INTO tournament_round (guild_id, round_number, stage, total_games, finished_games)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (tournament_round.guild_id, tournament_round.round_number, tournament_round.stage,
+             tournament_round.total_games, tournament_round.finished_games)
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def get_current_round(self, guild_id: int) -> Optional[TournamentRound]:
+        """Fetch the last round of a guild"""
+        row = self.conn.execute(
+            f"""
+            SELECT {TOURNAMENT_ROUND_COLUMNS} FROM tournament_round WHERE guild_id = ?
+            ORDER BY round_number DESC
+            LIMIT 1
+            """,
+            (guild_id,)
+        ).fetchone()
+        return TournamentRound(*row) if row else None
+
+    def get_all_rounds(self, guild_id: int) -> List[TournamentRound]:
+        """Fetch all rounds of a guild"""
+        return [
+            TournamentRound(*row)
+            for row in self.conn.execute(f"SELECT {TOURNAMENT_ROUND_COLUMNS} FROM tournament_round WHERE guild_id = ? ORDER BY round_number",
+                                         (guild_id,))
+        ]
+
+    def add_finished_game(self, guild_id: int, round_number: int):
+        """Count one more finished game on a round"""
+        write_finished_game(self.conn, guild_id, round_number)
+        self.conn.commit()
+
+    def refresh_round(self, guild_id: int, round_number: int):
+        """Recount the games of a round, deleting it if it has no games left"""
+        self.conn.execute(
+            """
+            UPDATE tournament_round
+            SET total_games = (SELECT COUNT(*) FROM game WHERE guild_id = ? AND round_number = ?),
+                finished_games = (SELECT COUNT(*) FROM game WHERE guild_id = ? AND round_number = ? AND team_winner > 0)
+            WHERE guild_id = ? AND round_number = ?
+            """,
+            (guild_id, round_number, guild_id, round_number, guild_id, round_number)
+        )
+        self.conn.execute(
+            "DELETE FROM tournament_round WHERE guild_id = ? AND round_number = ? AND total_games = 0",
+            (guild_id, round_number)
+        )
+        self.conn.commit()
@@ -0,0 +1,80 @@
+-- Game types and summary round names are no longer a closed list, so the
+-- tournament can be played with any number of teams.
+-- Games now know the round they belong to, and every round keeps its state.
+-- Run in a transaction with foreign keys off by the migration runner.
+
+CREATE TABLE game_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER,
+    team_one_id INTEGER,
+    team_two_id INTEGER,
+    team_winner INTEGER DEFAULT -1,
+    game_type TEXT NOT NULL,
+    game_channel_id INTEGER NOT NULL,
+    admin_game_channel_id INTEGER NOT NULL,
+    voice_channel_team_one_id INTEGER NOT NULL,
+    voice_channel_team_two_id INTEGER NOT NULL,
+    public_game_message_id INTEGER NOT NULL,
+    admin_pick_veto_button_message_id INTEGER NOT NULL,
+    result_button_message_id INTEGER DEFAULT -1,
+    round_number INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (team_one_id) REFERENCES team(id) ON DELETE CASCADE,
+    FOREIGN KEY (team_two_id) REFERENCES team(id) ON DELETE CASCADE
+);
+
+INSERT INTO game_new (id, guild_id, team_one_id, team_two_id, team_winner, game_type,
+    game_channel_id, admin_game_channel_id, voice_channel_team_one_id, voice_channel_team_two_id,
+    public_game_message_id, admin_pick_veto_button_message_id, result_button_message_id, round_number)
+SELECT id, guild_id, team_one_id, team_two_id, team_winner, game_type,
+    game_channel_id, admin_game_channel_id, voice_channel_team_one_id, voice_channel_team_two_id,
+    public_game_message_id, admin_pick_veto_button_message_id, result_button_message_id,
+    CASE
+        WHEN game_type = 'swiss_1' THEN 1
+        WHEN game_type LIKE 'swiss_2%' THEN 2
+        WHEN game_type LIKE 'swiss_3%' THEN 3
+        WHEN game_type LIKE 'swiss_4%' THEN 4
+        WHEN game_type = 'swiss_5' THEN 5
+        WHEN game_type = 'quarterfinal' THEN 6
+        WHEN game_type = 'semifinal' THEN 7
+        ELSE 8
+    END
+FROM game;
+
+DROP TABLE game;
+ALTER TABLE game_new RENAME TO game;
+
+CREATE INDEX IF NOT EXISTS idx_game_guild_round ON game (guild_id, round_number);
+
+CREATE TABLE summary_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    round_name TEXT NOT NULL,
+    message_id INTEGER NOT NULL
+);
+
+INSERT INTO summary_new (id, guild_id, round_name, message_id)
+SELECT id, guild_id, round_name, message_id FROM summary;
+
+DROP TABLE summary;
+ALTER TABLE summary_new RENAME TO summary;
+
+CREATE TABLE IF NOT EXISTS tournament_round (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    round_number INTEGER NOT NULL,
+    stage TEXT CHECK(stage IN ('swiss', 'playoff', 'final')) NOT NULL,
+    total_games INTEGER NOT NULL DEFAULT 0,
+    finished_games INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (guild_id, round_number)
+);
+
+INSERT INTO tournament_round (guild_id, round_number, stage, total_games, finished_games)
+SELECT guild_id, round_number,
+    CASE
+        WHEN round_number <= 5 THEN 'swiss'
+        WHEN round_number = 8 THEN 'final'
+        ELSE 'playoff'
+    END,
+    COUNT(*), SUM(team_winner > 0)
+FROM game
+GROUP BY guild_id, round_number;
@@ -0,0 +1,54 @@
+-- Materialized swiss standings, updated when a result is set.
+CREATE TABLE IF NOT EXISTS standing (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL UNIQUE,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    map_difference INTEGER NOT NULL DEFAULT 0,
+    round_difference INTEGER NOT NULL DEFAULT 0,
+    buchholz INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (team_id) REFERENCES team(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_standing_rank ON standing (guild_id, wins DESC, losses ASC,
+    buchholz DESC, map_difference DESC, round_difference DESC);
+
+CREATE TABLE IF NOT EXISTS head_to_head (
+    guild_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    opponent_id INTEGER NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (team_id, opponent_id),
+    FOREIGN KEY (team_id) REFERENCES team(id) ON DELETE CASCADE,
+    FOREIGN KEY (opponent_id) REFERENCES team(id) ON DELETE CASCADE
+);
+
+-- Backfill from the games already played. Round differences are not stored
+-- for past maps, so they start at 0.
+INSERT OR IGNORE INTO standing (guild_id, team_id, wins, losses)
+SELECT guild_id, id, swiss_wins, swiss_losses FROM team;
+
+INSERT OR IGNORE INTO head_to_head (guild_id, team_id, opponent_id, wins, losses)
+SELECT guild_id, team_id, opponent_id, SUM(won), SUM(1 - won) FROM (
+    SELECT guild_id, team_one_id AS team_id, team_two_id AS opponent_id, team_winner = team_one_id AS won
+    FROM game WHERE team_winner > 0 AND game_type LIKE 'swiss%'
+    UNION ALL
+    SELECT guild_id, team_two_id AS team_id, team_one_id AS opponent_id, team_winner = team_two_id AS won
+    FROM game WHERE team_winner > 0 AND game_type LIKE 'swiss%'
+)
+GROUP BY guild_id, team_id, opponent_id;
+
+UPDATE standing SET map_difference = (
+    SELECT COALESCE(SUM(CASE WHEN game_map.team_id_winner = standing.team_id THEN 1 ELSE -1 END), 0)
+    FROM game_map JOIN game ON game.id = game_map.game_id
+    WHERE game_map.team_id_winner > 0 AND game.game_type LIKE 'swiss%'
+    AND standing.team_id IN (game.team_one_id, game.team_two_id)
+);
+
+UPDATE standing SET buchholz = (
+    SELECT COALESCE(SUM(opponent.wins - opponent.losses), 0)
+    FROM head_to_head JOIN standing AS opponent ON opponent.team_id = head_to_head.opponent_id
+    WHERE head_to_head.team_id = standing.team_id
+);
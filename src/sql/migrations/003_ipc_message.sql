@@ -0,0 +1,10 @@
+-- Events received by the api processes and handled by the bot process
+CREATE TABLE IF NOT EXISTS ipc_message (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_ipc_message_pending ON ipc_message(id) WHERE processed_at IS NULL;
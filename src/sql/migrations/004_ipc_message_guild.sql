@@ -0,0 +1,5 @@
+-- Each bot process only handles the events of the guilds of its shards
+ALTER TABLE ipc_message ADD COLUMN guild_id INTEGER NOT NULL DEFAULT 0;
+
+DROP INDEX IF EXISTS idx_ipc_message_pending;
+CREATE INDEX IF NOT EXISTS idx_ipc_message_pending ON ipc_message(guild_id, id) WHERE processed_at IS NULL;
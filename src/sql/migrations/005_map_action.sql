@@ -0,0 +1,27 @@
+-- Vetoes and picks of a game in a single ordered log. seq is allocated per
+-- game by the insert itself, and the unique constraint is the index used to
+-- read the log in order.
+-- The veto and pick tables are kept, but nothing writes them anymore.
+CREATE TABLE IF NOT EXISTS map_action (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    action TEXT CHECK(action IN ('veto', 'pick')) NOT NULL,
+    team_id INTEGER NOT NULL,
+    map_name TEXT NOT NULL,
+    UNIQUE (game_id, seq),
+    FOREIGN KEY (game_id) REFERENCES game(id) ON DELETE CASCADE
+);
+
+-- Renumber the existing vetoes and picks, as concurrent inserts could have
+-- stored two actions with the same order.
+INSERT INTO map_action (guild_id, game_id, seq, action, team_id, map_name)
+SELECT guild_id, game_id,
+    ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY action_order, action, id),
+    action, team_id, map_name
+FROM (
+    SELECT id, guild_id, game_id, order_veto AS action_order, 'veto' AS action, team_id, map_name FROM veto
+    UNION ALL
+    SELECT id, guild_id, game_id, order_pick, 'pick', team_id, map_name FROM pick
+);
@@ -0,0 +1,20 @@
+-- Discord side effects of the state changes, written in the same transaction
+-- as the change and delivered by the outbox dispatcher of the bot.
+-- Times are unix epoch seconds.
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    route TEXT NOT NULL,
+    coalesce_key TEXT,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT CHECK(status IN ('pending', 'sent', 'superseded', 'failed')) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    sent_at REAL,
+    last_error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (id, next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_outbox_coalesce ON outbox (coalesce_key) WHERE status = 'pending';
@@ -0,0 +1,6 @@
+-- Player facing outbox messages are delivered before the diagnostic ones,
+-- 0 being the highest priority.
+ALTER TABLE outbox ADD COLUMN priority INTEGER NOT NULL DEFAULT 1;
+
+DROP INDEX IF EXISTS idx_outbox_pending;
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (priority, id, next_attempt_at) WHERE status = 'pending';
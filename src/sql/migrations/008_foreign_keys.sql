@@ -0,0 +1,52 @@
+-- Foreign keys are enforced from now on, so deleting games cascades to
+-- their maps, vetoes and picks.
+-- Maps not played yet use -1 as winner and free game servers use -1 as game,
+-- so those two columns can not be foreign keys.
+-- Run in a transaction with foreign keys off by the migration runner.
+
+-- Rows left behind by the games deleted while foreign keys were not enforced
+DELETE FROM game_map WHERE game_id NOT IN (SELECT id FROM game);
+DELETE FROM map_action WHERE game_id NOT IN (SELECT id FROM game);
+DELETE FROM veto WHERE game_id NOT IN (SELECT id FROM game);
+DELETE FROM pick WHERE game_id NOT IN (SELECT id FROM game);
+DELETE FROM player WHERE team_id NOT IN (SELECT id FROM team);
+UPDATE game_server SET is_free = TRUE, game_id = -1 WHERE game_id != -1 AND game_id NOT IN (SELECT id FROM game);
+
+CREATE TABLE game_map_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id INTEGER NOT NULL,
+    team_id_winner INTEGER NOT NULL,
+    guild_id INTEGER NOT NULL,
+    game_number INTEGER NOT NULL,
+    map_name TEXT NOT NULL,
+    FOREIGN KEY (game_id) REFERENCES game(id) ON DELETE CASCADE
+);
+
+INSERT INTO game_map_new (id, game_id, team_id_winner, guild_id, game_number, map_name)
+SELECT id, game_id, team_id_winner, guild_id, game_number, map_name FROM game_map;
+
+DROP TABLE game_map;
+ALTER TABLE game_map_new RENAME TO game_map;
+
+CREATE TABLE game_server_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    ip TEXT NOT NULL UNIQUE,
+    game_port INTEGER NOT NULL DEFAULT 27015,
+    rcon_password TEXT NOT NULL,
+    cstv_port INTEGER NOT NULL DEFAULT 27020,
+    is_free BOOLEAN NOT NULL DEFAULT TRUE,
+    game_id INTEGER NOT NULL DEFAULT -1
+);
+
+INSERT INTO game_server_new (id, guild_id, ip, game_port, rcon_password, cstv_port, is_free, game_id)
+SELECT id, guild_id, ip, game_port, rcon_password, cstv_port, is_free, game_id FROM game_server;
+
+DROP TABLE game_server;
+ALTER TABLE game_server_new RENAME TO game_server;
+
+-- Cascades look the children of a deleted game up by game_id
+CREATE INDEX IF NOT EXISTS idx_game_map_game ON game_map (game_id);
+CREATE INDEX IF NOT EXISTS idx_veto_game ON veto (game_id);
+CREATE INDEX IF NOT EXISTS idx_pick_game ON pick (game_id);
+CREATE INDEX IF NOT EXISTS idx_game_server_game ON game_server (game_id);
@@ -0,0 +1,7 @@
+-- no transaction
+-- VACUUM can not run in a transaction, and can be run again if interrupted.
+-- Free pages are kept in the file until the maintenance releases them with
+-- PRAGMA incremental_vacuum, a few pages at a time.
+-- Changing auto_vacuum on an existing database needs a full VACUUM, once.
+PRAGMA auto_vacuum = INCREMENTAL;
+VACUUM;
@@ -0,0 +1,44 @@
+-- Names and steamids are unique per guild and team roles are limited by the
+-- database, so registrations are a single insert without checking first.
+-- Duplicates could only come from concurrent registrations: the later teams
+-- and players get their id appended to the name, and later players with a
+-- repeated steamid are moved to player_conflict, logged at startup until an
+-- admin adds them back or deletes them.
+UPDATE team SET name = name || '_' || id
+WHERE id NOT IN (SELECT MIN(id) FROM team GROUP BY guild_id, name);
+
+UPDATE player SET nickname = nickname || '_' || id
+WHERE id NOT IN (SELECT MIN(id) FROM player GROUP BY guild_id, nickname);
+
+CREATE TABLE IF NOT EXISTS player_conflict (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    nickname TEXT NOT NULL,
+    steamid TEXT NOT NULL,
+    role_name TEXT NOT NULL,
+    -- Player registered first with the same steamid, kept in the roster
+    kept_player_id INTEGER NOT NULL
+);
+
+INSERT INTO player_conflict (id, guild_id, team_id, nickname, steamid, role_name, kept_player_id)
+SELECT player.id, player.guild_id, player.team_id, player.nickname, player.steamid, player.role_name, kept.id
+FROM player
+JOIN (SELECT MIN(id) AS id, guild_id, steamid FROM player GROUP BY guild_id, steamid) AS kept
+    ON kept.guild_id = player.guild_id AND kept.steamid = player.steamid
+WHERE player.id != kept.id;
+
+DELETE FROM player WHERE id IN (SELECT id FROM player_conflict);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_team_guild_name ON team (guild_id, name);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_player_guild_nickname ON player (guild_id, nickname);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_player_guild_steamid ON player (guild_id, steamid);
+CREATE INDEX IF NOT EXISTS idx_player_team_role ON player (team_id, role_name);
+
+-- One captain, four players and two coaches per team
+CREATE TRIGGER IF NOT EXISTS player_role_limit BEFORE INSERT ON player
+WHEN (SELECT COUNT(*) FROM player WHERE team_id = NEW.team_id AND role_name = NEW.role_name) >=
+    CASE NEW.role_name WHEN 'captain' THEN 1 WHEN 'player' THEN 4 WHEN 'coach' THEN 2 ELSE 0 END
+BEGIN
+    SELECT RAISE(ABORT, 'player role limit');
+END;
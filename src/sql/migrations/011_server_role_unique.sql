@@ -0,0 +1,6 @@
+-- Role IDs are upserted in bulk by name when teams are provisioned, keeping
+-- the latest row of each repeated name.
+DELETE FROM server_role
+WHERE id NOT IN (SELECT MAX(id) FROM server_role GROUP BY guild_id, role_name);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_server_role_guild_name ON server_role (guild_id, role_name);
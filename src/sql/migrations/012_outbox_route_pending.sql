@@ -0,0 +1,2 @@
+-- The outbox dispatcher skips the routes with a message waiting for a retry
+CREATE INDEX IF NOT EXISTS idx_outbox_route_pending ON outbox (route, next_attempt_at) WHERE status = 'pending';
@@ -0,0 +1,10 @@
+-- Events failing to be handled are retried with backoff and kept once given up,
+-- instead of being marked processed and deleted. Times are unix epoch seconds.
+ALTER TABLE ipc_message ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE ipc_message ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0;
+ALTER TABLE ipc_message ADD COLUMN last_error TEXT;
+ALTER TABLE ipc_message ADD COLUMN failed_at TEXT;
+
+DROP INDEX IF EXISTS idx_ipc_message_pending;
+CREATE INDEX IF NOT EXISTS idx_ipc_message_pending ON ipc_message(guild_id, id)
+    WHERE processed_at IS NULL AND failed_at IS NULL;
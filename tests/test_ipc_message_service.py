@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models.ipc_message import IpcMessage
+from services.database import DatabaseManager
+from services.ipc_message_service import IpcMessageService
+
+class IpcMessageRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        database = DatabaseManager(db_path=os.path.join(self.directory.name, "tournament.db"))
+        self.ipc_message_service = IpcMessageService(database.get_connection())
+
+    def tearDown(self):
+        self.ipc_message_service.conn.close()
+        self.directory.cleanup()
+
+    def pending_ids(self) -> list:
+        return [ipc_message.id for ipc_message in self.ipc_message_service.get_pending_ipc_messages(guild_ids=[1])]
+
+    def test_failed_message_is_retried_and_kept(self):
+        failing = self.ipc_message_service.create_ipc_message(IpcMessage(kind="match_log", guild_id=1))
+        handled = self.ipc_message_service.create_ipc_message(IpcMessage(kind="match_log", guild_id=1))
+        self.ipc_message_service.set_retry(failing, attempts=1, next_attempt_at=time.time() + 60, error="503")
+        self.ipc_message_service.set_processed(handled)
+        self.ipc_message_service.delete_processed()
+        self.assertEqual(self.pending_ids(), [])
+
+        self.ipc_message_service.set_retry(failing, attempts=1, next_attempt_at=time.time() - 1, error="503")
+        self.assertEqual(self.pending_ids(), [failing])
+
+        self.ipc_message_service.set_failed(failing, attempts=2, error="503")
+        self.ipc_message_service.delete_processed()
+        self.assertEqual(self.pending_ids(), [])
+        row = self.ipc_message_service.conn.execute(
+            "SELECT attempts, last_error, failed_at IS NOT NULL FROM ipc_message WHERE id = ?", (failing,)).fetchone()
+        self.assertEqual(tuple(row), (2, "503", 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from formats.major import MajorFormat
+from models.tournament_round import TournamentRound
+
+class PlayoffStagesTest(unittest.TestCase):
+    def setUp(self):
+        self.tournament_format = MajorFormat(swiss_wins=2)
+
+    def playoff(self, qualified_teams: int) -> list:
+        """(stage, game types) of every playoff round after the swiss stage"""
+        current_round = TournamentRound(round_number=3, stage="swiss", total_games=1, finished_games=1)
+        rounds = []
+        teams = qualified_teams
+        stage = self.tournament_format.next_stage(current_round=current_round, teams_in_swiss=0)
+        # Bounded so a stage that never ends fails instead of hanging
+        while stage is not None and len(rounds) < 5:
+            game_types = [self.tournament_format.playoff_game_type(teams // 2)]
+            total_games = teams // 2
+            if stage == "final":
+                game_types.insert(0, "third_place")
+                total_games += 1
+            rounds.append((stage, game_types))
+            current_round = TournamentRound(round_number=current_round.round_number + 1, stage=stage,
+                                            total_games=total_games, finished_games=total_games)
+            teams //= 2
+            stage = self.tournament_format.next_stage(current_round=current_round, teams_in_swiss=0)
+        return rounds
+
+    def test_two_qualified_teams_play_only_the_final(self):
+        self.assertEqual(self.playoff(2), [("playoff", ["final"])])
+
+    def test_four_qualified_teams_play_semifinals_and_final(self):
+        self.assertEqual(self.playoff(4), [
+            ("playoff", ["semifinal"]),
+            ("final", ["third_place", "final"]),
+        ])
+
+    def test_unfinished_playoff_round_waits(self):
+        current_round = TournamentRound(round_number=4, stage="playoff", total_games=2, finished_games=1)
+        self.assertIsNone(self.tournament_format.next_stage(current_round=current_round, teams_in_swiss=0))
+
+if __name__ == "__main__":
+    unittest.main()
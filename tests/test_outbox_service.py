@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models.outbox_message import OutboxMessage
+from services.database import DatabaseManager
+from services.outbox_service import OutboxService
+
+class OutboxOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        database = DatabaseManager(db_path=os.path.join(self.directory.name, "tournament.db"))
+        self.outbox_service = OutboxService(database.get_connection())
+
+    def tearDown(self):
+        self.outbox_service.conn.close()
+        self.directory.cleanup()
+
+    def send(self, route: str, content: str):
+        self.outbox_service.create_outbox_messages([
+            OutboxMessage(guild_id=1, route=route, payload=f'{{"content": "{content}"}}')
+        ])
+
+    def contents(self) -> list:
+        return [(message.route, message.payload)
+                for message in self.outbox_service.get_due_outbox_messages(guild_ids=[1])]
+
+    def test_retry_holds_back_its_route(self):
+        self.send("channel:1", "first")
+        self.send("channel:1", "second")
+        self.send("channel:2", "other")
+        first = self.outbox_service.get_due_outbox_messages(guild_ids=[1])[0]
+        self.outbox_service.set_retry(first.id, attempts=1, next_attempt_at=time.time() + 60, error="429")
+
+        # The second message of the route waits for the first one
+        self.assertEqual(self.contents(), [("channel:2", '{"content": "other"}')])
+
+        self.outbox_service.conn.execute("UPDATE outbox SET next_attempt_at = ? WHERE id = ?",
+                                         (time.time() - 1, first.id))
+        self.assertEqual(self.contents(), [
+            ("channel:1", '{"content": "first"}'),
+            ("channel:1", '{"content": "second"}'),
+            ("channel:2", '{"content": "other"}'),
+        ])
+
+    def test_busy_route_does_not_fill_the_fetch(self):
+        for i in range(3):
+            self.send("channel:1", f"busy {i}")
+        self.send("channel:2", "other")
+        messages = self.outbox_service.get_due_outbox_messages(guild_ids=[1], limit=2)
+        self.assertEqual({message.route for message in messages}, {"channel:1"})
+
+        # The route being delivered is left out, the other routes fit in the limit
+        messages = self.outbox_service.get_due_outbox_messages(guild_ids=[1], limit=2, exclude_routes=["channel:1"])
+        self.assertEqual([(message.route, message.payload) for message in messages],
+                         [("channel:2", '{"content": "other"}')])
+
+if __name__ == "__main__":
+    unittest.main()